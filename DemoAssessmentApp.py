@@ -1,17 +1,39 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 import base64
 import hashlib
 from datetime import datetime
 import logging
 import sys
+import threading
+import time
+import heapq
+import itertools
+import bisect
+import functools
+import contextlib
+import fcntl
+import importlib
+import multiprocessing
+import zipfile
+import zlib
+import gzip
+from concurrent.futures import ProcessPoolExecutor
+import json
+import re
+import shutil
+import uuid
 import urllib.parse
-from io import BytesIO
-from reportlab.lib.pagesizes import A4
+from io import BytesIO, StringIO
+from reportlab.lib.pagesizes import A4, landscape
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from xml.sax.saxutils import escape as xml_escape
 import warnings
 
 # Suppress all warnings globally
@@ -32,6 +54,74 @@ st.set_page_config(page_title="OMOTEC Mentors Assessment App", layout="wide", in
 CSV_FILE = "assessment_data.csv"
 DEFAULT_DATA_FILE = "EVALUATOR_INPUT.csv"
 EVALUATOR_STORE = "evaluators.csv"
+CHANGE_SEQ_FILE = "change_seq.txt"
+CHANGE_LOG_FILE = "change_log.csv"
+# Lock files guarding the stores and the change counter across server, job worker and CLI processes
+LOCK_FILES = {"store_lock": "stores.lock", "change_lock": f"{CHANGE_SEQ_FILE}.lock", "snapshot_lock": "snapshots.lock"}
+HISTORY_FILE = "assessment_history.csv"
+COMPACTION_INTERVAL_SECONDS = 300
+PARTITION_DIR = "partitions"
+PARTITION_MANIFEST = os.path.join(PARTITION_DIR, "manifest.json")
+UNASSIGNED_BRANCH = "Unassigned"
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_MANIFEST = os.path.join(SNAPSHOT_DIR, "manifest.json")
+SNAPSHOT_KEEP_VERSIONS = 3
+SNAPSHOT_DEBOUNCE_SECONDS = 3
+CERTIFICATE_DIR = "certificates"
+CERTIFICATE_CURSOR = os.path.join(CERTIFICATE_DIR, "cursor.json")
+CERTIFICATE_LOG = os.path.join(CERTIFICATE_DIR, "issued.csv")
+CERTIFICATE_LOG_COLUMNS = ["run_id", "issued_at", "Trainer ID", "Trainer Name", "level", "file"]
+CERTIFICATE_LOGO = "NEW LOGO - OMOTEC.png"
+CERTIFICATE_TEMPLATE_DPI = 300
+CERTIFICATE_LOGO_HEIGHT = 60
+CERTIFICATE_BATCH_SIZE = 50
+CERTIFICATE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+BACKUP_DIR = "backups"
+BACKUP_INDEX = os.path.join(BACKUP_DIR, "index.csv")
+BACKUP_INTERVAL_SECONDS = 300
+BACKUP_DEBOUNCE_SECONDS = 5
+# A line closes a chunk when the low bits of its CRC are zero (about 64 lines per chunk), so edits only touch nearby chunks
+BACKUP_CHUNK_BITS = 6
+BACKUP_MAX_CHUNK_LINES = 512
+BACKUP_INDEX_COLUMNS = ["point_id", "created_at", "reason", "change_seq", "changed_stores", "added_bytes"]
+BACKUP_STORES = [CSV_FILE, DEFAULT_DATA_FILE, EVALUATOR_STORE]
+ARCHIVE_DIR = "archive"
+ARCHIVE_MANIFEST = os.path.join(ARCHIVE_DIR, "manifest.json")
+# Fully qualified trainers whose latest assessment is older than this move to cold storage
+ARCHIVE_AFTER_DAYS = int(os.environ.get("OMOTEC_ARCHIVE_AFTER_DAYS", "365"))
+LIVE_UPDATE_SECONDS = 5
+DRAFT_DIR = "drafts"
+DRAFT_SYNC_SECONDS = 30
+SUBMISSION_DEDUP_SECONDS = 120
+SEARCH_RESULT_LIMIT = 25
+SEARCH_STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "in", "is", "it", "of", "on", "or", "the", "to", "was", "with"}
+LEADERBOARD_SIZE = 10
+ALL_DEPARTMENTS = "All Departments"
+BITMAP_BLANK = "(blank)"
+STATUS_FILTER_MAX_GROUPS = 4
+# An evaluator is flagged when their mean differs from peers' by this many pooled standard deviations
+CALIBRATION_DRIFT_THRESHOLD = 0.8
+CALIBRATION_MIN_SCORES = 10
+JOB_DIR = "jobs"
+JOB_WORKERS = 2
+VALIDATION_CHUNK_ROWS = 5000
+VALIDATION_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+TRAINER_ID_PATTERN = r"^TR\d+$"
+VALIDATION_COLUMNS = ["rule", "severity", "row", "trainer_id", "column", "value", "fix", "message"]
+# Rule -> (severity, description, has a safe automated fix)
+VALIDATION_RULES = {
+    "date_format": ("error", "Dates are written YYYY-MM-DD", True),
+    "level_status": ("error", "A QUALIFIED level has every course cleared and its LEVEL STATUS agrees", True),
+    "score_range": ("error", "Rubric scores lie between 0 and the parameter maximum", True),
+    "orphan_trainer": ("warning", "Assessed trainers exist in EVALUATOR_INPUT.csv", True),
+    "missing_trainer_id": ("error", "Assessment rows have a Trainer ID", False),
+    "trainer_id_format": ("warning", "Trainer IDs follow the TR<number> scheme", False),
+}
+JOB_COLUMNS = ["job_id", "kind", "status", "progress", "message", "submitted_by", "created_at", "updated_at", "result_file"]
+WARM_UP_ASSETS = ["background.jpg", "background1.jpg", "background2.jpg", "NEW LOGO - OMOTEC.png"]
+LIVE_SUBSCRIPTION_TTL_SECONDS = 600
+# "memory" fans out writes made by this server process; "filewatch" also picks up writes from other processes
+CHANGE_BUS_BACKEND = os.environ.get("OMOTEC_CHANGE_BUS", "memory")
 
 # Predefined course options
 COURSE_OPTIONS = [
@@ -41,38 +131,183 @@ COURSE_OPTIONS = [
     "Advanced Programming", "Circuit Design"
 ]
 
-CSV_COLUMNS = [
-    "Trainer ID", "Trainer Name", "Department", "DOJ", "Branch", "Discipline", "Course", "Date of assessment",
-    "Has Knowledge of STEM (5)", "Ability to integrate STEM With related activities (10)",
-    "Discusses Up-to-date information related to STEM (5)", "Provides Course Outline (5)", "Language Fluency (5)",
-    "Preparation with Lesson Plan / Practicals (5)", "Time Based Activity (5)", "Student Engagement Ideas (5)",
-    "Pleasing Look (5)", "Poised & Confident (5)", "Well Modulated Voice (5)",
-    "LEVEL #1 Course :1", "LEVEL #1 Course :2", "LEVEL #1 Course :3", "LEVEL #1 Course :4", "LEVEL #1 Course :5",
-    "LEVEL #1 Course :6", "LEVEL #1 Course :7", "LEVEL #1 Course :8", "LEVEL #1 Course :9", "LEVEL #1 Course :10",
-    "LEVEL #1 TOTAL", "LEVEL #1 AVERAGE", "LEVEL #1 STATUS", "LEVEL #1 Reminder", "LEVEL #1 Score Card Status",
-    "LEVEL #2 Course :1", "LEVEL #2 Course :2", "LEVEL #2 Course :3", "LEVEL #2 Course :4", "LEVEL #2 Course :5",
-    "LEVEL #2 Course :6", "LEVEL #2 Course :7", "LEVEL #2 Course :8", "LEVEL #2 Course :9", "LEVEL #2 Course :10",
-    "LEVEL #2 TOTAL", "LEVEL #2 AVERAGE", "LEVEL #2 STATUS", "LEVEL #2 Reminder", "LEVEL #2 Score Card Status",
-    "LEVEL #3 Course :1", "LEVEL #3 Course :2", "LEVEL #3 Course :3", "LEVEL #3 Course :4", "LEVEL #3 Course :5",
-    "LEVEL #3 Course :6", "LEVEL #3 Course :7", "LEVEL #3 Course :8", "LEVEL #3 Course :9", "LEVEL #3 Course :10",
-    "LEVEL #3 TOTAL", "LEVEL #3 AVERAGE", "LEVEL #3 STATUS", "LEVEL #3 Reminder", "LEVEL #3 Score Card Status",
-    "LEVEL #1", "LEVEL #2", "LEVEL #3", "Evaluator Username", "Evaluator Role", "Manager Referral"
-] + [f"{param} Course :{i}" for param in [
-    "Has Knowledge of STEM (5)", "Ability to integrate STEM With related activities (10)",
-    "Discusses Up-to-date information related to STEM (5)", "Provides Course Outline (5)", "Language Fluency (5)",
-    "Preparation with Lesson Plan / Practicals (5)", "Time Based Activity (5)", "Student Engagement Ideas (5)",
-    "Pleasing Look (5)", "Poised & Confident (5)", "Well Modulated Voice (5)"
-] for i in range(1, 11)] + [
-    f"{level} Course :{i} TOTAL" for level in ["LEVEL #1", "LEVEL #2", "LEVEL #3"] for i in range(1, 11)
-] + [
-    f"{level} Course :{i} AVERAGE" for level in ["LEVEL #1", "LEVEL #2", "LEVEL #3"] for i in range(1, 11)
-] + [
-    f"{level} Course :{i} STATUS" for level in ["LEVEL #1", "LEVEL #2", "LEVEL #3"] for i in range(1, 11)
-] + [
-    f"{level} Course :{i} Remarks" for level in ["LEVEL #1", "LEVEL #2", "LEVEL #3"] for i in range(1, 11)
-]
+# The rubric as data: levels with their course slots and qualification rules, and the scored
+# parameters with their max score, evaluating role and widget key. Column maps are compiled from it below.
+RUBRIC = {
+    "levels": [
+        {"name": "LEVEL #1", "courses": 10, "pass_average": 75.0, "requires_referral": False},
+        {"name": "LEVEL #2", "courses": 10, "pass_average": 75.0, "requires_referral": False},
+        {"name": "LEVEL #3", "courses": 10, "pass_average": 90.0, "requires_referral": True},
+    ],
+    "parameters": [
+        {"column": "Has Knowledge of STEM (5)", "max": 5, "role": "Technical Evaluator", "key": "stem"},
+        {"column": "Ability to integrate STEM With related activities (10)", "max": 10, "role": "Technical Evaluator", "key": "integration"},
+        {"column": "Discusses Up-to-date information related to STEM (5)", "max": 5, "role": "Technical Evaluator", "key": "uptodate"},
+        {"column": "Provides Course Outline (5)", "max": 5, "role": "Technical Evaluator", "key": "outline"},
+        {"column": "Language Fluency (5)", "max": 5, "role": "Technical Evaluator", "key": "language"},
+        {"column": "Preparation with Lesson Plan / Practicals (5)", "max": 5, "role": "Technical Evaluator", "key": "preparation"},
+        {"column": "Time Based Activity (5)", "max": 5, "role": "School Operations Evaluator", "key": "time"},
+        {"column": "Student Engagement Ideas (5)", "max": 5, "role": "School Operations Evaluator", "key": "engagement"},
+        {"column": "Pleasing Look (5)", "max": 5, "role": "School Operations Evaluator", "key": "pleasing"},
+        {"column": "Poised & Confident (5)", "max": 5, "role": "School Operations Evaluator", "key": "poised"},
+        {"column": "Well Modulated Voice (5)", "max": 5, "role": "School Operations Evaluator", "key": "voice"},
+    ],
+}
+
+SCORE_PARAMS = [param["column"] for param in RUBRIC["parameters"]]
+LEVELS = [level["name"] for level in RUBRIC["levels"]]
+MAX_COURSES = max(level["courses"] for level in RUBRIC["levels"])
+COURSE_FIELDS = ["TOTAL", "AVERAGE", "STATUS", "Remarks"]
+
+def _build_csv_columns(rubric):
+    """Store layout derived from the rubric (the order matches the historical hand-written column list)."""
+    columns = ["Trainer ID", "Trainer Name", "Department", "DOJ", "Branch", "Discipline", "Course", "Date of assessment"]
+    columns += SCORE_PARAMS
+    for level in rubric["levels"]:
+        columns += [f"{level['name']} Course :{i}" for i in range(1, level["courses"] + 1)]
+        columns += [f"{level['name']} {field}" for field in ["TOTAL", "AVERAGE", "STATUS", "Reminder", "Score Card Status"]]
+    columns += LEVELS + ["Evaluator Username", "Evaluator Role", "Manager Referral", "Change Seq", "Last Modified"]
+    columns += [f"{param} Course :{i}" for param in SCORE_PARAMS for i in range(1, MAX_COURSES + 1)]
+    for field in COURSE_FIELDS:
+        columns += [f"{level['name']} Course :{i} {field}" for level in rubric["levels"] for i in range(1, level["courses"] + 1)]
+    return columns
+
+CSV_COLUMNS = _build_csv_columns(RUBRIC)
+CSV_COLUMN_INDEX = pd.Index(CSV_COLUMNS)
+
+def compile_rubric(rubric, columns):
+    """Resolve every per-course column name once into arrays of names and integer store positions."""
+    position = {col: i for i, col in enumerate(columns)}
+    params_by_role = {}
+    for param in rubric["parameters"]:
+        params_by_role.setdefault(param["role"], []).append(param)
+    compiled = {"params_by_role": {role: [p["column"] for p in params] for role, params in params_by_role.items()},
+                "inputs_by_role": params_by_role, "levels": {}}
+    for level in rubric["levels"]:
+        slots = range(1, level["courses"] + 1)
+        names = {"course": np.array([f"{level['name']} Course :{i}" for i in slots], dtype=object)}
+        for field in COURSE_FIELDS:
+            names[field.lower()] = np.array([f"{course} {field}" for course in names["course"]], dtype=object)
+        # One (courses x parameters) block of score columns per evaluating role
+        scores = {role: np.array([[f"{p['column']} Course :{i}" for p in params] for i in slots], dtype=object)
+                  for role, params in params_by_role.items()}
+        compiled["levels"][level["name"]] = dict(
+            level,
+            names=names,
+            positions={field: np.array([position[col] for col in cols]) for field, cols in names.items()},
+            score_names=scores,
+            score_positions={role: np.vectorize(position.__getitem__, otypes=[int])(cols) for role, cols in scores.items()},
+        )
+    return compiled
+
+RUBRIC_INDEX = compile_rubric(RUBRIC, CSV_COLUMNS)
+PARAM_MAX_SCORES = {param["column"]: param["max"] for param in RUBRIC["parameters"]}
+
+STATUS_DOMAINS = {
+    "course_status": ["CLEARED", "REDO", "QUALIFIED", "NOT QUALIFIED"],
+    "level": ["QUALIFIED", "NOT QUALIFIED"],
+    "score_card": ["Score Cards has not been sent", "Score Cards has been sent"],
+    "role": ["Technical Evaluator", "School Operations Evaluator"],
+}
+
+def _build_assessment_schema():
+    """Declared load-time dtypes: categories for tiny-domain text, float32 scores, sparse candidates."""
+    schema = {"Evaluator Role": ("category", STATUS_DOMAINS["role"])}
+    for param in SCORE_PARAMS:
+        schema[param] = ("float32", None)
+    for level, compiled in RUBRIC_INDEX["levels"].items():
+        schema[level] = ("category", STATUS_DOMAINS["level"])
+        schema[f"{level} STATUS"] = ("category", STATUS_DOMAINS["course_status"])
+        schema[f"{level} Score Card Status"] = ("category", STATUS_DOMAINS["score_card"])
+        schema[f"{level} TOTAL"] = ("float32", None)
+        schema[f"{level} AVERAGE"] = ("float32", None)
+        names = compiled["names"]
+        schema.update({col: ("category", COURSE_OPTIONS[1:]) for col in names["course"]})
+        schema.update({col: ("category", STATUS_DOMAINS["course_status"]) for col in names["status"]})
+        schema.update({col: ("sparse", None) for col in [*names["total"], *names["average"]]})
+        for score_names in compiled["score_names"].values():
+            schema.update({col: ("sparse", None) for col in score_names.ravel()})
+    return schema
+
+EVALUATOR_COLUMNS = ["username", "password_hash", "full_name", "email", "role", "created_at", "branches", "change_seq", "modified_at"]
+TRAINER_INPUT_COLUMNS = ["Trainer ID", "Trainer Name", "Department", "Branch", "Email"]
+CHANGE_LOG_COLUMNS = ["seq", "changed_at", "store", "record_key", "operation"]
+ASSESSMENT_SCHEMA = _build_assessment_schema()
+REPORT_ROWS_PER_TABLE = 40
+
+# Declared table layouts shared by the PDF and LaTeX report targets (see report.tex / trainer_report.tex)
+REPORT_TEMPLATES = {
+    "evaluators": {
+        "title": "Evaluators",
+        "columns": [("username", "Username", 1), ("full_name", "Full Name", 1.2), ("email", "Email", 2),
+                    ("role", "Role", 1.4), ("created_at", "Created At", 1.3)]
+    },
+    "trainers": {
+        "title": "Trainers",
+        "columns": [("Trainer ID", "Trainer ID", 1), ("Trainer Name", "Trainer Name", 1.5),
+                    ("Branch", "Branch", 1), ("Department", "Department", 1.2)]
+    },
+    "trainer_levels": {
+        "title": "Assessment Details",
+        "columns": [("Date of assessment", "Date of Assessment", 1.3)] + [
+            (f"{level} {field}", f"L{n} {field}", 1) for n, level in enumerate(LEVELS, 1) for field in ["TOTAL", "AVERAGE", "STATUS"]
+        ] + [("Manager Referral", "Manager Referral", 1.3)]
+    },
+    "level_courses": {
+        "title": "Course Details",
+        "columns": [("Course", "Course", 1), ("Name", "Name", 2), ("STATUS", "Status", 1), ("Remarks", "Remarks", 2)]
+    },
+}
+DATE_COLUMNS = ["DOJ", "Date of assessment"]
+SPARSE_DENSITY_THRESHOLD = 0.25
+# One hot-table row per trainer per evaluator (role included so Technical and School Operations rows stay apart)
+ASSESSMENT_KEY_COLUMNS = ["Trainer ID", "Evaluator Username", "Evaluator Role"]
+
+# Per-store (sequence column, timestamp column, key columns) used for change stamping
+CHANGE_TRACKED_STORES = {
+    CSV_FILE: ("Change Seq", "Last Modified", ASSESSMENT_KEY_COLUMNS),
+    DEFAULT_DATA_FILE: ("Change Seq", "Last Modified", ["Trainer ID"]),
+    EVALUATOR_STORE: ("change_seq", "modified_at", ["username"]),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def shared_state():
+    """Locks and listeners shared by every session; Streamlit re-executes module globals on each rerun."""
+    return {
+        "change_lock": threading.Lock(),
+        "store_lock": threading.RLock(),
+        "snapshot_lock": threading.Lock(),
+        "write_listeners": {},
+        "submission_lock": threading.Lock(),
+        "submissions": {},
+        "lock_holds": {},
+        "draft_locks": {},
+        "listener_cursors": {}
+    }
+
+@contextlib.contextmanager
+def shared_lock(name):
+    """Hold shared_state()[name] and an flock on its LOCK_FILES entry, so job workers and the CLI are excluded too.
 
-EVALUATOR_COLUMNS = ["username", "password_hash", "full_name", "email", "role", "created_at"]
+    Re-entrant per thread for the store lock: the file is locked by the outermost holder only.
+    """
+    state = shared_state()
+    with state[name]:
+        holds = state["lock_holds"]
+        if name not in holds:
+            handle = open(LOCK_FILES[name], "a")
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            holds[name] = [handle, 0]
+        holds[name][1] += 1
+        try:
+            yield
+        finally:
+            holds[name][1] -= 1
+            if holds[name][1] == 0:
+                handle = holds.pop(name)[0]
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
 
 def hash_password(password: str) -> str:
     try:
@@ -88,7 +323,7 @@ def verify_password(password: str, stored_hash: str) -> bool:
         logger.error(f"Error verifying password: {str(e)}")
         return False
 
-def load_data():
+def load_data(branches=None):
     try:
         if not os.path.exists(CSV_FILE):
             if os.path.exists(DEFAULT_DATA_FILE):
@@ -96,18 +331,101 @@ def load_data():
             else:
                 df = pd.DataFrame(columns=CSV_COLUMNS)
             df.to_csv(CSV_FILE, index=False)
-        else:
-            df = pd.read_csv(CSV_FILE)
-
-        for col in CSV_COLUMNS:
-            if col not in df.columns:
-                df[col] = ""
-        return df[CSV_COLUMNS]
+        scope = tuple(sorted(branches)) if branches is not None else None
+        # Keyed on the store (and shard manifest) versions, so any write invalidates the parsed frame
+        versions = (store_version(CSV_FILE), store_version(PARTITION_MANIFEST) if scope is not None else None)
+        df = _parse_assessment_store(scope, versions).copy()
+        df.attrs["branch_scope"] = scope
+        df.attrs["data_version"] = versions[0]
+        return df
     except Exception as e:
         logger.error(f"Error loading data: {str(e)}")
         st.error("Failed to load assessment data. Please try again later.")
         return pd.DataFrame(columns=CSV_COLUMNS)
 
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _parse_assessment_store(scope, versions):
+    df = read_partitions(CSV_FILE, scope) if scope is not None else pd.read_csv(CSV_FILE)
+    for col in CSV_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    df = df[CSV_COLUMNS]
+    for col in DATE_COLUMNS:
+        df[col] = normalize_dates(df[col])
+    return apply_assessment_schema(df)
+
+def apply_assessment_schema(df):
+    """Convert the loaded frame to the compact dtypes declared in ASSESSMENT_SCHEMA."""
+    converted = {}
+    for col, (kind, domain) in ASSESSMENT_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if kind == "category":
+            values = values.astype(object).where(values.notna() & (values.astype(str) != ""), np.nan)
+            observed = [v for v in pd.unique(values.dropna()) if v not in domain and v != "No data entered"]
+            converted[col] = pd.Categorical(values, categories=list(domain) + observed + ["No data entered"])
+        else:
+            numeric = pd.to_numeric(values, errors="coerce").astype("float32")
+            if kind == "sparse" and numeric.notna().mean() < SPARSE_DENSITY_THRESHOLD:
+                converted[col] = numeric.astype(pd.SparseDtype("float32", np.nan))
+            else:
+                converted[col] = numeric
+    return df.assign(**converted)
+
+def densify_frame(df):
+    """Expand sparse and categorical columns back to plain dtypes for editing or display."""
+    dense = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.SparseDtype):
+            dense[col] = df[col].sparse.to_dense()
+        elif isinstance(dtype, pd.CategoricalDtype):
+            dense[col] = df[col].astype(object)
+    return df.assign(**dense)
+
+def normalize_dates(values):
+    """Parse the mixed date spellings found in the stores into a datetime64 column."""
+    text = pd.Series(values).astype("string").str.strip()
+    parsed = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    parsed = parsed.fillna(pd.to_datetime(text.str[:19], format="%Y-%m-%d %H:%M:%S", errors="coerce"))
+    parsed = parsed.fillna(pd.to_datetime(text, format="%m/%d/%Y", errors="coerce"))
+    # Rows written with the old "%Y-%m-%Y" format lost their day; keep the month they belong to
+    broken = text.str.extract(r"^(\d{4})-(\d{2})-\1$")
+    month_only = pd.to_datetime(broken[0] + "-" + broken[1] + "-01", format="%Y-%m-%d", errors="coerce")
+    return parsed.fillna(month_only).astype("datetime64[ns]")
+
+def build_date_index(df, column="Date of assessment"):
+    """Sorted (dates, row positions) arrays so date ranges resolve by binary search."""
+    dates = df[column].to_numpy(dtype="datetime64[ns]")
+    positions = np.flatnonzero(~np.isnat(dates))
+    order = np.argsort(dates[positions], kind="stable")
+    return dates[positions][order], positions[order]
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_date_index(_df, data_version, column="Date of assessment"):
+    return build_date_index(_df, column)
+
+def rows_in_date_range(df, date_index, start, end):
+    sorted_dates, positions = date_index
+    lo = np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+    hi = np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1), "ns"), side="left")
+    return df.iloc[np.sort(positions[lo:hi])]
+
+def store_version(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (0, 0)
+
+def date_range_filter(df, key):
+    date_range = st.date_input("Filter by Date of Assessment", value=(), key=key, help="Pick a start and end date")
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        date_index = get_date_index(df, (df.attrs.get("data_version"), df.attrs.get("live_seq"), df.attrs.get("branch_scope"), len(df)))
+        return rows_in_date_range(df, date_index, date_range[0], date_range[1])
+    return df
+
 def generate_new_trainer_id():
     try:
         if os.path.exists(DEFAULT_DATA_FILE):
@@ -129,42 +447,44 @@ def generate_new_trainer_id():
 
 def save_new_trainer_to_input(trainer_id, trainer_name, department, trainer_email=""):
     try:
-        if os.path.exists(DEFAULT_DATA_FILE):
-            df = pd.read_csv(DEFAULT_DATA_FILE)
-        else:
-            df = pd.DataFrame(columns=["Trainer ID", "Trainer Name", "Department", "Branch", "Email"])
+        with shared_lock("store_lock"):
+            if os.path.exists(DEFAULT_DATA_FILE):
+                df = pd.read_csv(DEFAULT_DATA_FILE)
+            else:
+                df = pd.DataFrame(columns=TRAINER_INPUT_COLUMNS)
         
-        if "Trainer ID" not in df.columns:
-            df["Trainer ID"] = ""
-        if "Trainer Name" not in df.columns:
-            df["Trainer Name"] = ""
-        if "Department" not in df.columns:
-            df["Department"] = ""
-        if "Branch" not in df.columns:
-            df["Branch"] = ""
-        if "Email" not in df.columns:
-            df["Email"] = ""
+            if "Trainer ID" not in df.columns:
+                df["Trainer ID"] = ""
+            if "Trainer Name" not in df.columns:
+                df["Trainer Name"] = ""
+            if "Department" not in df.columns:
+                df["Department"] = ""
+            if "Branch" not in df.columns:
+                df["Branch"] = ""
+            if "Email" not in df.columns:
+                df["Email"] = ""
             
-        if trainer_id in df["Trainer ID"].values:
-            idx = df.index[df["Trainer ID"] == trainer_id][0]
-            df.at[idx, "Trainer Name"] = trainer_name
-            df.at[idx, "Department"] = department
-            df.at[idx, "Email"] = trainer_email
-        else:
-            new_entry = {
-                "Trainer ID": trainer_id,
-                "Trainer Name": trainer_name,
-                "Department": department,
-                "Branch": "",
-                "Email": trainer_email
-            }
-            df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
-        df.to_csv(DEFAULT_DATA_FILE, index=False)
+            if trainer_id in df["Trainer ID"].values:
+                idx = df.index[df["Trainer ID"] == trainer_id][0]
+                df.at[idx, "Trainer Name"] = trainer_name
+                df.at[idx, "Department"] = department
+                df.at[idx, "Email"] = trainer_email
+            else:
+                new_entry = {
+                    "Trainer ID": trainer_id,
+                    "Trainer Name": trainer_name,
+                    "Department": department,
+                    "Branch": "",
+                    "Email": trainer_email
+                }
+                df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
+                idx = df.index[-1]
+            save_trainer_inputs(df, [idx])
         return df
     except Exception as e:
         logger.error(f"Error saving new trainer: {str(e)}")
         st.error("Failed to save new trainer information.")
-        return pd.DataFrame(columns=["Trainer ID", "Trainer Name", "Department", "Branch", "Email"])
+        return pd.DataFrame(columns=TRAINER_INPUT_COLUMNS)
 
 def load_evaluators():
     try:
@@ -182,13 +502,2612 @@ def load_evaluators():
         st.error("Failed to load evaluator data.")
         return pd.DataFrame(columns=EVALUATOR_COLUMNS)
 
-def save_evaluators(df):
+def write_store(df, store, **csv_kwargs):
+    """Replace a store file in one step, so no reader or crash ever sees it half written. Caller holds the store lock.
+
+    Returns the store versions (before, after) the write moved between.
+    """
+    tmp_file = f"{store}.tmp"
+    before = store_version(store)
+    df.to_csv(tmp_file, index=False, **csv_kwargs)
+    os.replace(tmp_file, store)
+    cursors = shared_state()["listener_cursors"]
+    if store in cursors and cursors[store][0] == before:
+        # The caller notifies this process's listeners of its own write; catch-up only has to cover other processes
+        cursors[store] = (store_version(store), current_change_seq())
+    return before, store_version(store)
+
+def save_evaluators(df, changed_index=None, deleted_keys=None):
     try:
-        df.to_csv(EVALUATOR_STORE, index=False)
+        with shared_lock("store_lock"):
+            if changed_index:
+                record_changes(df, changed_index, EVALUATOR_STORE)
+            if deleted_keys:
+                record_deletions(EVALUATOR_STORE, deleted_keys)
+            write_store(df, EVALUATOR_STORE)
     except Exception as e:
         logger.error(f"Error saving evaluators: {str(e)}")
         st.error("Failed to save evaluator data.")
 
+def save_trainer_inputs(df, changed_index, deleted_keys=None, **csv_kwargs):
+    with shared_lock("store_lock"):
+        record_changes(df, changed_index, DEFAULT_DATA_FILE)
+        if deleted_keys:
+            record_deletions(DEFAULT_DATA_FILE, deleted_keys)
+        versions = write_store(df, DEFAULT_DATA_FILE, **csv_kwargs)
+    changed_rows = df.loc[[idx for idx in changed_index if idx in df.index]]
+    changed_rows.attrs["store_versions"] = versions
+    notify_write_listeners(DEFAULT_DATA_FILE, changed_rows, deleted_keys or [])
+
+def save_assessment_data(df, changed_index, deleted_keys=None, delete_operation="delete", **csv_kwargs):
+    """Stamp and write the whole assessment store. Callers that read the store first hold shared_lock("store_lock")
+    from that read through this call, so no concurrent write lands in between and is lost.
+
+    `deleted_keys` are the assessment keys of rows this write removes; they are logged as `delete_operation`
+    tombstones and passed to the write listeners.
+    """
+    with shared_lock("store_lock"):
+        record_changes(df, changed_index, CSV_FILE)
+        if deleted_keys:
+            record_deletions(CSV_FILE, deleted_keys, operation=delete_operation)
+        versions = write_store(df, CSV_FILE, **csv_kwargs)
+    changed_rows = df.loc[[idx for idx in changed_index if idx in df.index]]
+    changed_rows.attrs["store_versions"] = versions
+    notify_write_listeners(CSV_FILE, changed_rows, deleted_keys or [])
+
+def register_write_listener(listener):
+    """Register `listener(store, changed_rows, removed_keys)` to be called after every stamped write.
+
+    `removed_keys` are the record keys (key columns joined by "|", as in the change log) of rows the write took
+    out of the store, so indexes can forget them. For this process's own writes `changed_rows.attrs["store_versions"]`
+    holds the store versions (before, after) the write moved between.
+    """
+    shared_state()["write_listeners"][f"{listener.__module__}.{listener.__qualname__}"] = listener
+
+def notify_write_listeners(store, changed_rows, removed_keys=()):
+    removed_keys = [str(key) for key in removed_keys]
+    for listener in list(shared_state()["write_listeners"].values()):
+        try:
+            listener(store, changed_rows, removed_keys)
+        except Exception as e:
+            logger.error(f"Error in write listener {getattr(listener, '__name__', listener)}: {str(e)}")
+
+def notify_external_writes(store):
+    """Pass rows that other processes (the CLI, job workers) wrote to `store` since this process last saw it to the
+    write listeners, from the change log, so in-memory indexes do not go stale. The first call only sets the cursor."""
+    _, _, key_cols = CHANGE_TRACKED_STORES[store]
+    with shared_lock("store_lock"):
+        cursors = shared_state()["listener_cursors"]
+        cursor = cursors.get(store)
+        version = store_version(store)
+        cursors[store] = (version, current_change_seq())
+        if cursor is None or cursor[0] == version:
+            return
+        changes = export_changes(store, since_seq=cursor[1])
+    if changes.empty:
+        return
+    upserted = changes["Change Operation"] == "upsert"
+    removed = changes[~upserted].reindex(columns=key_cols).astype(object).fillna("").astype(str)
+    removed_keys = removed.agg("|".join, axis=1).tolist() if not removed.empty else []
+    notify_write_listeners(store, changes[upserted].drop(columns=["Change Operation"]), removed_keys)
+
+def find_assessment_row(df, trainer_id, evaluator_username, evaluator_role):
+    match = df.index[
+        (df["Trainer ID"].astype(str) == str(trainer_id)) &
+        (df["Evaluator Username"].astype(object).fillna("").astype(str) == str(evaluator_username)) &
+        (df["Evaluator Role"].astype(object).fillna("").astype(str) == str(evaluator_role))
+    ]
+    return match[-1] if len(match) else None
+
+def rubric_block(df, level, field):
+    """One per-course field of a level for every row, read by compiled position when the frame has the store layout."""
+    compiled = RUBRIC_INDEX["levels"][level]
+    if df.columns.equals(CSV_COLUMN_INDEX):
+        return df.iloc[:, compiled["positions"][field]]
+    return df.reindex(columns=compiled["names"][field])
+
+def level_courses_qualified(df, level):
+    return not df.empty and bool(rubric_block(df, level, "status").eq("QUALIFIED").to_numpy().all())
+
+def course_scores(values):
+    values = np.asarray(values)
+    total = values.sum().item()
+    return total, (total / values.size if values.size > 0 else 0.0)
+
+def course_entry_values(level, role, courses):
+    """Per-course store columns of a level for one evaluator role, filled from the form's course dicts."""
+    compiled = RUBRIC_INDEX["levels"][level]
+    names = compiled["names"]
+    params = RUBRIC_INDEX["params_by_role"][role]
+    entry = {}
+    for i, course_key in enumerate(names["course"]):
+        course_data = courses.get(course_key, {})
+        entry[course_key] = course_data.get("name", "")
+        entry[names["total"][i]] = float(course_data.get("total", 0))  # Ensure float type
+        entry[names["average"][i]] = float(course_data.get("average", 0.0))  # Ensure float type
+        entry[names["status"][i]] = course_data.get("status_overall", "REDO")
+        entry[names["remarks"][i]] = course_data.get("remarks", "")
+        scores = [float(course_data.get("params", {}).get(param, 0)) for param in params]  # Ensure float type for numeric params
+        entry.update(zip(compiled["score_names"][role][i], scores))
+    return entry
+
+def submission_token(trainer_id, level, evaluator_username, action, payload):
+    """Identity of a write request: (trainer, level, evaluator, action) key and the hash of the form values."""
+    payload_hash = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    return (str(trainer_id), level, str(evaluator_username), action), payload_hash
+
+def claim_submission(token):
+    """Record `token` as the latest submission for its key. False only when it repeats that latest submission
+    within SUBMISSION_DEDUP_SECONDS, so Save A, Save B, Save A still writes A again."""
+    key, payload_hash = token
+    state = shared_state()
+    now = time.time()
+    with state["submission_lock"]:
+        window = state["submissions"]
+        # Keys are moved to the end when claimed, so dict order is claim order and expiry pops from the front
+        while window and next(iter(window.values()))[1] < now - SUBMISSION_DEDUP_SECONDS:
+            window.pop(next(iter(window)))
+        latest = window.pop(key, None)
+        # A suppressed repeat goes back at the end with its first claim time, so check the age here too
+        if latest is not None and latest[0] == payload_hash and latest[1] >= now - SUBMISSION_DEDUP_SECONDS:
+            window[key] = latest
+            return False
+        window[key] = (payload_hash, now)
+        return True
+
+def release_submission(token):
+    key, payload_hash = token
+    with shared_state()["submission_lock"]:
+        window = shared_state()["submissions"]
+        if window.get(key, (None,))[0] == payload_hash:
+            del window[key]
+
+@contextlib.contextmanager
+def deduplicated_submission(trainer_id, level, evaluator_username, action, payload):
+    """Yield whether this submission is new; a failed write releases its token so a retry goes through."""
+    token = submission_token(trainer_id, level, evaluator_username, action, payload)
+    fresh = claim_submission(token)
+    try:
+        yield fresh
+    except Exception:
+        if fresh:
+            release_submission(token)
+        raise
+
+def current_change_seq():
+    try:
+        if os.path.exists(CHANGE_SEQ_FILE):
+            with open(CHANGE_SEQ_FILE, "r") as f:
+                return int(f.read().strip() or 0)
+    except Exception as e:
+        logger.error(f"Error reading change sequence: {str(e)}")
+    return 0
+
+def _reserve_change_seqs(count):
+    # Caller must hold shared_lock("change_lock"); the counter file is replaced atomically so a crash never rewinds it
+    start = current_change_seq() + 1
+    tmp_file = f"{CHANGE_SEQ_FILE}.tmp"
+    with open(tmp_file, "w") as f:
+        f.write(str(start + count - 1))
+    os.replace(tmp_file, CHANGE_SEQ_FILE)
+    return start
+
+def _append_change_log(seqs, changed_at, store, record_keys, operation):
+    log_df = pd.DataFrame({
+        "seq": seqs,
+        "changed_at": changed_at,
+        "store": store,
+        "record_key": list(record_keys),
+        "operation": operation
+    }, columns=CHANGE_LOG_COLUMNS)
+    log_df.to_csv(CHANGE_LOG_FILE, mode="a", index=False, header=not os.path.exists(CHANGE_LOG_FILE))
+
+def record_changes(df, changed_index, store, operation="upsert"):
+    """Stamp the changed rows of a store frame with fresh change sequence numbers and log them."""
+    seq_col, ts_col, key_cols = CHANGE_TRACKED_STORES[store]
+    changed_index = [idx for idx in dict.fromkeys(changed_index) if idx in df.index]
+    if not changed_index:
+        return df
+    for col in [seq_col, ts_col] + key_cols:
+        if col not in df.columns:
+            df[col] = ""
+    if df[seq_col].dtype != object:
+        df[seq_col] = df[seq_col].astype(object)
+    with shared_lock("change_lock"):
+        start = _reserve_change_seqs(len(changed_index))
+        seqs = list(range(start, start + len(changed_index)))
+        changed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        df.loc[changed_index, seq_col] = seqs
+        df.loc[changed_index, ts_col] = changed_at
+        record_keys = df.loc[changed_index, key_cols].fillna("").astype(str).agg("|".join, axis=1)
+        _append_change_log(seqs, changed_at, store, record_keys, operation)
+    return df
+
+def record_deletions(store, record_keys, operation="delete"):
+    record_keys = [str(key) for key in record_keys]
+    if not record_keys:
+        return
+    with shared_lock("change_lock"):
+        start = _reserve_change_seqs(len(record_keys))
+        seqs = list(range(start, start + len(record_keys)))
+        _append_change_log(seqs, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), store, record_keys, operation)
+
+def _file_slug(value):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", str(value)).strip("_") or UNASSIGNED_BRANCH
+
+def _partition_path(store, branch):
+    return os.path.join(PARTITION_DIR, os.path.splitext(os.path.basename(store))[0], f"{_file_slug(branch)}.csv")
+
+def _load_partition_manifest():
+    try:
+        if os.path.exists(PARTITION_MANIFEST):
+            with open(PARTITION_MANIFEST, "r") as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading partition manifest: {str(e)}")
+    return {}
+
+def _save_partition_manifest(manifest):
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+    tmp_file = f"{PARTITION_MANIFEST}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, PARTITION_MANIFEST)
+
+def _trainer_branch_map():
+    if not os.path.exists(DEFAULT_DATA_FILE):
+        return {}
+    trainers = pd.read_csv(DEFAULT_DATA_FILE, usecols=lambda col: col in ["Trainer ID", "Branch"])
+    if "Branch" not in trainers.columns:
+        return {}
+    trainers = trainers.dropna(subset=["Trainer ID", "Branch"])
+    return dict(zip(trainers["Trainer ID"].astype(str), trainers["Branch"].astype(str)))
+
+def _resolve_branches(df, branch_map):
+    """Branch of each row: its own Branch value, else the trainer's branch from EVALUATOR_INPUT.csv."""
+    own = df["Branch"].astype(object) if "Branch" in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+    own = own.where(own.notna() & (own.astype(str).str.strip() != ""), np.nan)
+    from_trainer = df["Trainer ID"].astype(str).map(branch_map) if "Trainer ID" in df.columns else np.nan
+    return own.fillna(from_trainer).fillna(UNASSIGNED_BRANCH).astype(str)
+
+def partition_key_columns(store):
+    return ASSESSMENT_KEY_COLUMNS if store == CSV_FILE else ["Trainer ID"]
+
+def rebuild_partitions(store):
+    """Split a store into one CSV shard per branch and record the source version they reflect."""
+    with shared_lock("store_lock"):
+        source_version = store_version(store)
+        df = pd.read_csv(store) if os.path.exists(store) else pd.DataFrame(columns=partition_key_columns(store))
+        branch_map = _trainer_branch_map()
+        branches = _resolve_branches(df, branch_map)
+        shard_dir = os.path.dirname(_partition_path(store, UNASSIGNED_BRANCH))
+        os.makedirs(shard_dir, exist_ok=True)
+        for old_shard in os.listdir(shard_dir):
+            os.remove(os.path.join(shard_dir, old_shard))
+        shards = {}
+        for branch, shard in df.groupby(branches, sort=False):
+            shard.to_csv(_partition_path(store, branch), index=False)
+            shards[branch] = _partition_path(store, branch)
+        manifest = _load_partition_manifest()
+        manifest[store] = {"source_version": list(source_version), "branches": shards, "trainer_branches": branch_map}
+        _save_partition_manifest(manifest)
+        logger.info(f"Rebuilt {len(shards)} branch partitions for {store}")
+        return manifest[store]
+
+def read_partitions(store, branches):
+    """Read only the shards for `branches`, rebuilding them first if the store changed underneath."""
+    entry = _load_partition_manifest().get(store)
+    if not entry or tuple(entry["source_version"]) != store_version(store):
+        entry = rebuild_partitions(store)
+    frames = [pd.read_csv(entry["branches"][branch]) for branch in branches
+              if branch in entry["branches"] and os.path.exists(entry["branches"][branch])]
+    if not frames:
+        return pd.DataFrame(columns=pd.read_csv(store, nrows=0).columns)
+    return pd.concat(frames, ignore_index=True)
+
+def sync_partitions(store, changed_rows, removed_keys=()):
+    """Write listener: upsert changed rows into their branch shard instead of re-splitting the store.
+
+    The shards are only patched when they reflect the store as it was just before this write and nothing was
+    written after it; otherwise another process (or a write whose listener has not run yet) changed the store
+    too, and it is re-split.
+    """
+    if store not in (CSV_FILE, DEFAULT_DATA_FILE) or (changed_rows.empty and not removed_keys):
+        return
+    with shared_lock("store_lock"):
+        manifest = _load_partition_manifest()
+        entry = manifest.get(store)
+        if not entry:
+            return
+        current = list(store_version(store))
+        if entry["source_version"] == current:
+            return
+        before, after = changed_rows.attrs.get("store_versions", (None, None))
+        if removed_keys or before is None or entry["source_version"] != list(before) or current != list(after):
+            # Rows left the store (archive, restore), or it changed outside this write; re-split it
+            rebuild_partitions(store)
+            return
+        branch_map = _trainer_branch_map()
+        if store == DEFAULT_DATA_FILE and CSV_FILE in manifest:
+            previous = manifest[CSV_FILE]["trainer_branches"]
+            moved = [tid for tid in changed_rows["Trainer ID"].dropna().astype(str) if previous.get(tid) != branch_map.get(tid)]
+            if moved:
+                # A trainer changed branch; their assessment rows must move shards too
+                rebuild_partitions(CSV_FILE)
+                manifest = _load_partition_manifest()
+            else:
+                manifest[CSV_FILE]["trainer_branches"] = branch_map
+        key_cols = partition_key_columns(store)
+        changed_rows = densify_frame(changed_rows)
+        branches = _resolve_branches(changed_rows, branch_map)
+        for branch, rows in changed_rows.groupby(branches, sort=False):
+            shard_file = _partition_path(store, branch)
+            if os.path.exists(shard_file):
+                shard = pd.read_csv(shard_file)
+                shard_keys = shard.reindex(columns=key_cols).fillna("").astype(str).agg("|".join, axis=1)
+                row_keys = set(rows.reindex(columns=key_cols).fillna("").astype(str).agg("|".join, axis=1))
+                shard = pd.concat([shard[~shard_keys.isin(row_keys)], rows], ignore_index=True)
+            else:
+                os.makedirs(os.path.dirname(shard_file), exist_ok=True)
+                shard = rows
+            shard.to_csv(shard_file, index=False)
+            manifest[store]["branches"][branch] = shard_file
+        manifest[store]["source_version"] = current
+        _save_partition_manifest(manifest)
+
+@st.cache_resource(show_spinner=False)
+def start_partition_sync():
+    register_write_listener(sync_partitions)
+    return True
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _read_trainer_inputs(data_version):
+    return pd.read_csv(DEFAULT_DATA_FILE)
+
+def load_trainer_inputs(branches=None):
+    if not os.path.exists(DEFAULT_DATA_FILE):
+        return None
+    if branches is None:
+        return _read_trainer_inputs(store_version(DEFAULT_DATA_FILE)).copy()
+    return read_partitions(DEFAULT_DATA_FILE, branches)
+
+def known_branches():
+    branches = set(_trainer_branch_map().values())
+    return sorted(branches | {UNASSIGNED_BRANCH})
+
+def session_branch_scope():
+    """Branches the logged-in user may load; None means every branch (admins and unscoped users)."""
+    if st.session_state.get("role") == "Super Administrator":
+        return None
+    evaluators_df = load_evaluators()
+    match = evaluators_df[evaluators_df["username"] == st.session_state.get("logged_user", "")]
+    if match.empty or pd.isna(match.iloc[0]["branches"]):
+        return None
+    branches = [branch.strip() for branch in str(match.iloc[0]["branches"]).split(";") if branch.strip()]
+    return branches or None
+
+def _load_snapshot_manifest():
+    try:
+        if os.path.exists(SNAPSHOT_MANIFEST):
+            with open(SNAPSHOT_MANIFEST, "r") as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading snapshot manifest: {str(e)}")
+    return {"latest": None, "versions": [], "seq": None}
+
+def render_trainer_summary(trainer_rows):
+    compiled = compile_report_template("trainer_levels")
+    summary = format_report_rows(densify_frame(trainer_rows), compiled)
+    summary.columns = compiled["headers"]
+    return summary.to_html(index=False, border=0, classes="trainer-summary", na_rep="")
+
+def publish_viewer_snapshot(rerender_all=False):
+    """Render viewer tables and per-trainer summaries into a new immutable snapshot version.
+
+    Summaries are re-rendered for every trainer with a row changed since the previous version's change seq,
+    read from the published frame itself, so a write that lands while a version is being built is picked up
+    by the next one. The rest are linked from the previous version.
+    """
+    with shared_lock("snapshot_lock"):
+        manifest = _load_snapshot_manifest()
+        version = f"{current_change_seq():010d}-{store_version(CSV_FILE)[0]}-{store_version(DEFAULT_DATA_FILE)[0]}"
+        if version == manifest["latest"]:
+            return version
+        previous_dir = os.path.join(SNAPSHOT_DIR, manifest["latest"]) if manifest["latest"] else None
+        target_dir = os.path.join(SNAPSHOT_DIR, version)
+        staging_dir = f"{target_dir}.tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(os.path.join(staging_dir, "branches"))
+        os.makedirs(os.path.join(staging_dir, "trainers"))
+
+        df = load_data()
+        for branch, frame in df.groupby(_resolve_branches(df, _trainer_branch_map()), sort=False):
+            frame.to_pickle(os.path.join(staging_dir, "branches", f"{_file_slug(branch)}.pkl"))
+        trainers = pd.read_csv(DEFAULT_DATA_FILE) if os.path.exists(DEFAULT_DATA_FILE) else pd.DataFrame(columns=TRAINER_INPUT_COLUMNS)
+        trainers.reindex(columns=["Trainer ID", "Trainer Name", "Department", "Branch"]).drop_duplicates().to_pickle(
+            os.path.join(staging_dir, "trainers.pkl"))
+
+        seqs = pd.to_numeric(densify_frame(df[["Change Seq"]])["Change Seq"], errors="coerce")
+        published_seq = 0 if seqs.isna().all() else int(seqs.max())
+        stale = None
+        if not rerender_all and previous_dir is not None and manifest.get("seq") is not None:
+            stale = set(df.loc[(seqs > manifest["seq"]).to_numpy(), "Trainer ID"].dropna().astype(str))
+        rendered = 0
+        for trainer_id, rows in df.dropna(subset=["Trainer ID"]).groupby(df["Trainer ID"].dropna().astype(str), sort=False):
+            fragment = f"{_file_slug(trainer_id)}.html"
+            previous_fragment = os.path.join(previous_dir, "trainers", fragment) if previous_dir else ""
+            if stale is not None and trainer_id not in stale and os.path.exists(previous_fragment):
+                try:
+                    os.link(previous_fragment, os.path.join(staging_dir, "trainers", fragment))
+                except OSError:
+                    shutil.copy2(previous_fragment, os.path.join(staging_dir, "trainers", fragment))
+                continue
+            with open(os.path.join(staging_dir, "trainers", fragment), "w") as f:
+                f.write(render_trainer_summary(rows))
+            rendered += 1
+
+        os.replace(staging_dir, target_dir)
+        versions = [v for v in manifest["versions"] if v != version] + [version]
+        for old_version in versions[:-SNAPSHOT_KEEP_VERSIONS]:
+            shutil.rmtree(os.path.join(SNAPSHOT_DIR, old_version), ignore_errors=True)
+        manifest = {"latest": version, "versions": versions[-SNAPSHOT_KEEP_VERSIONS:], "seq": published_seq}
+        tmp_file = f"{SNAPSHOT_MANIFEST}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_file, SNAPSHOT_MANIFEST)
+        logger.info(f"Published viewer snapshot {version} ({rendered} trainer summaries rendered)")
+        return version
+
+def _snapshot_loop(wake):
+    rerender_all = True
+    while True:
+        try:
+            publish_viewer_snapshot(rerender_all)
+        except Exception as e:
+            logger.error(f"Error publishing viewer snapshot: {str(e)}")
+        rerender_all = False
+        wake.wait()
+        # Let a burst of writes settle into a single snapshot version
+        time.sleep(SNAPSHOT_DEBOUNCE_SECONDS)
+        wake.clear()
+
+@st.cache_resource(show_spinner=False)
+def start_snapshot_publisher():
+    """One publisher thread per server; writes only wake it, so a burst of saves costs one publish."""
+    wake = threading.Event()
+
+    def _on_write(store, changed_rows, removed_keys):
+        if store in (CSV_FILE, DEFAULT_DATA_FILE):
+            wake.set()
+
+    register_write_listener(_on_write)
+    threading.Thread(target=_snapshot_loop, args=(wake,), name="snapshot-publisher", daemon=True).start()
+    return True
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _read_snapshot_frames(version, branches):
+    branch_dir = os.path.join(SNAPSHOT_DIR, version, "branches")
+    files = sorted(os.listdir(branch_dir)) if branches is None else [f"{_file_slug(b)}.pkl" for b in branches]
+    frames = [pd.read_pickle(os.path.join(branch_dir, name)) for name in files if os.path.exists(os.path.join(branch_dir, name))]
+    df = pd.concat(frames, ignore_index=True) if frames else apply_assessment_schema(pd.DataFrame(columns=CSV_COLUMNS))
+    df.attrs["branch_scope"] = tuple(sorted(branches)) if branches is not None else None
+    df.attrs["data_version"] = version
+    return df
+
+def load_viewer_snapshot(branches=None):
+    """Latest published viewer frame, or None when no snapshot has been published yet."""
+    version = _load_snapshot_manifest()["latest"]
+    if not version or not os.path.isdir(os.path.join(SNAPSHOT_DIR, version)):
+        return None
+    return _read_snapshot_frames(version, tuple(sorted(branches)) if branches is not None else None)
+
+def load_snapshot_trainers():
+    version = _load_snapshot_manifest()["latest"]
+    path = os.path.join(SNAPSHOT_DIR, version, "trainers.pkl") if version else ""
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+    if os.path.exists(DEFAULT_DATA_FILE):
+        return load_trainer_inputs()[["Trainer ID", "Trainer Name", "Department", "Branch"]].drop_duplicates()
+    return None
+
+def load_trainer_summary(trainer_id, version):
+    path = os.path.join(SNAPSHOT_DIR, str(version), "trainers", f"{_file_slug(trainer_id)}.html")
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return f.read()
+    return None
+
+class InProcessChangeBus:
+    """Deliver changed assessment rows to the sessions whose trainer filter they touch."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, session_id, trainer_ids=None, branches=None):
+        with self._lock:
+            subscriber = self._subscribers.setdefault(session_id, {"inbox": []})
+            subscriber["trainer_ids"] = None if trainer_ids is None else {str(tid) for tid in trainer_ids}
+            subscriber["branches"] = None if branches is None else set(branches)
+            subscriber["seen"] = time.time()
+
+    def unsubscribe(self, session_id):
+        with self._lock:
+            self._subscribers.pop(session_id, None)
+
+    def publish(self, store, changed_rows, removed_keys=()):
+        if store != CSV_FILE or changed_rows.empty:
+            return
+        trainer_ids = changed_rows["Trainer ID"].astype(str)
+        branches = None
+        now = time.time()
+        with self._lock:
+            for session_id, subscriber in list(self._subscribers.items()):
+                if now - subscriber["seen"] > LIVE_SUBSCRIPTION_TTL_SECONDS:
+                    del self._subscribers[session_id]
+                    continue
+                if subscriber["trainer_ids"] is not None:
+                    delta = changed_rows[trainer_ids.isin(subscriber["trainer_ids"]).values]
+                elif subscriber["branches"] is not None:
+                    if branches is None:
+                        branches = _resolve_branches(changed_rows, _trainer_branch_map())
+                    delta = changed_rows[branches.isin(subscriber["branches"]).values]
+                else:
+                    delta = changed_rows
+                if not delta.empty:
+                    subscriber["inbox"].append(delta)
+
+    def poll(self, session_id):
+        with self._lock:
+            subscriber = self._subscribers.get(session_id)
+            if subscriber is None:
+                return []
+            subscriber["seen"] = time.time()
+            inbox, subscriber["inbox"] = subscriber["inbox"], []
+            return inbox
+
+class FileWatchChangeBus(InProcessChangeBus):
+    """Change bus fed by watching the change sequence file, so CLI and other processes' writes arrive too."""
+
+    def __init__(self):
+        super().__init__()
+        self._pump_lock = threading.Lock()
+        self._last_seq = current_change_seq()
+
+    def _pump(self):
+        with self._pump_lock:
+            latest_seq = current_change_seq()
+            if latest_seq <= self._last_seq or not os.path.exists(CSV_FILE):
+                return
+            store_df = pd.read_csv(CSV_FILE)
+            seqs = pd.to_numeric(store_df.get("Change Seq", pd.Series(np.nan, index=store_df.index)), errors="coerce")
+            changed_rows = store_df[seqs > self._last_seq]
+            self._last_seq = latest_seq
+        self.publish(CSV_FILE, changed_rows)
+
+    def poll(self, session_id):
+        self._pump()
+        return super().poll(session_id)
+
+@st.cache_resource(show_spinner=False)
+def get_change_bus():
+    if CHANGE_BUS_BACKEND == "filewatch":
+        return FileWatchChangeBus()
+    bus = InProcessChangeBus()
+    register_write_listener(bus.publish)
+    return bus
+
+def assessment_row_keys(df):
+    return df.reindex(columns=ASSESSMENT_KEY_COLUMNS).astype(object).fillna("").astype(str).agg("|".join, axis=1)
+
+def merge_assessment_delta(df, delta):
+    """Upsert delta rows into a frame by assessment key, keeping whichever side has the newer change seq.
+
+    A branch-scoped frame only takes rows of its own branches. attrs["data_version"] stays the store version the
+    frame was loaded from; attrs["live_seq"] is the newest change merged into it.
+    """
+    if df.attrs.get("branch_scope") is not None:
+        delta = delta[_resolve_branches(delta, _trainer_branch_map()).isin(df.attrs["branch_scope"]).to_numpy()]
+    if delta.empty:
+        return df
+    delta = delta.copy()
+    for col in DATE_COLUMNS:
+        if col in delta.columns:
+            delta[col] = normalize_dates(delta[col])
+    base = densify_frame(df)
+    delta = densify_frame(delta)
+    delta_seqs = pd.to_numeric(delta["Change Seq"], errors="coerce").fillna(-1)
+    delta = delta.assign(_seq=delta_seqs).sort_values("_seq", kind="stable")
+    delta_keys = assessment_row_keys(delta)
+    delta = delta[~delta_keys.duplicated(keep="last")]
+    newest = pd.Series(delta["_seq"].values, index=delta_keys[delta.index].values)
+    base_keys = assessment_row_keys(base)
+    base_seqs = pd.to_numeric(base["Change Seq"], errors="coerce").fillna(-1)
+    # Base rows are only replaced when a delta for the same assessment is at least as new
+    replaced = base_keys.map(newest).fillna(-2) >= base_seqs
+    base_newest = base_seqs.groupby(base_keys).max()
+    fresh = delta["_seq"].values >= base_newest.reindex(newest.index).fillna(-2).values
+    merged = pd.concat([base[~replaced.values], delta[fresh]], ignore_index=True)
+    seqs = pd.concat([base_seqs, delta_seqs])
+    merged = merged.reindex(columns=df.columns)
+    merged.attrs = dict(df.attrs)
+    merged.attrs["live_seq"] = int(seqs.max())
+    return merged
+
+def apply_live_deltas(df, section_key):
+    """Overlay the deltas pushed to this session on top of its (possibly older) base frame."""
+    deltas = st.session_state.get(f"live_deltas_{section_key}", [])
+    if not deltas or df.empty or "Change Seq" not in df.columns:
+        return df
+    base_seq = pd.to_numeric(densify_frame(df[["Change Seq"]])["Change Seq"], errors="coerce").max()
+    base_seq = -1 if pd.isna(base_seq) else base_seq
+    # Deltas already contained in the base frame (e.g. a newer snapshot was published) are dropped
+    deltas = [delta for delta in deltas if pd.to_numeric(delta["Change Seq"], errors="coerce").max() > base_seq]
+    st.session_state[f"live_deltas_{section_key}"] = deltas
+    return merge_assessment_delta(df, pd.concat(deltas, ignore_index=True)) if deltas else df
+
+def _poll_live_updates(session_id, section_key, frame, fill_value=None):
+    """Poll this session's inbox and render `frame` with every delta received so far merged in.
+
+    Runs as a fragment: the timer reruns only this function, over the frame passed by the last full run,
+    so an update never reloads the store or re-executes the rest of the page.
+    """
+    deltas = get_change_bus().poll(session_id)
+    if deltas:
+        st.session_state.setdefault(f"live_deltas_{section_key}", []).extend(deltas)
+        st.toast(f"🔔 {sum(len(delta) for delta in deltas)} assessment update(s) received")
+    pending = st.session_state.get(f"live_deltas_{section_key}", [])
+    if pending and "Change Seq" in frame.columns:
+        frame = merge_assessment_delta(frame, pd.concat(pending, ignore_index=True))
+    if not frame.empty:
+        st.markdown("#### Matching Trainer Assessments")
+        table = densify_frame(frame)
+        st.dataframe(table if fill_value is None else table.fillna(fill_value), use_container_width=True)
+
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+_live_updates_fragment = _fragment(run_every=LIVE_UPDATE_SECONDS)(_poll_live_updates) if _fragment else None
+
+def live_updates_panel(section_key, frame, trainer_ids=None, fill_value=None):
+    """Subscribe this session to changes of `trainer_ids` (None = all in the frame's branch scope) and show
+    `frame` as a live table, refreshed by a fragment that polls the session's inbox."""
+    try:
+        session_id = st.session_state.setdefault("live_session_id", uuid.uuid4().hex)
+        get_change_bus().subscribe(session_id, trainer_ids, frame.attrs.get("branch_scope"))
+        if _live_updates_fragment is not None:
+            _live_updates_fragment(session_id, section_key, frame, fill_value)
+        else:
+            st.button("🔄 Check for updates", key=f"check_updates_{section_key}")
+            _poll_live_updates(session_id, section_key, frame, fill_value)
+    except Exception as e:
+        logger.error(f"Error polling live updates: {str(e)}")
+
+def _blank_to_nan(df):
+    return df.replace({"": np.nan, "No data entered": np.nan})
+
+def compact_assessment_data():
+    """Merge duplicate rows per trainer/evaluator into their latest state and move the originals to history."""
+    with shared_lock("store_lock"):
+        if not os.path.exists(CSV_FILE):
+            return 0
+        df = pd.read_csv(CSV_FILE)
+        if df.empty or not all(col in df.columns for col in ASSESSMENT_KEY_COLUMNS):
+            return 0
+        keys = df[ASSESSMENT_KEY_COLUMNS].fillna("").astype(str).agg("|".join, axis=1)
+        duplicated = keys.duplicated(keep=False) & df["Trainer ID"].notna()
+        if not duplicated.any():
+            return 0
+
+        superseded = df[duplicated]
+        # Oldest first so groupby().last() keeps the most recent non-empty value of every column
+        seq = pd.to_numeric(superseded.get("Change Seq", pd.Series(np.nan, index=superseded.index)), errors="coerce").fillna(-1)
+        ordered = superseded.assign(_seq=seq.values, _pos=np.arange(len(df))[duplicated.values], _key=keys[duplicated].values)
+        ordered = ordered.sort_values(["_seq", "_pos"], kind="stable")
+        merged = _blank_to_nan(ordered.drop(columns=["_seq"])).groupby("_key", sort=False).last()
+        merged["_pos"] = ordered.groupby("_key", sort=False)["_pos"].max()
+        merged = merged.reset_index(drop=True)
+
+        kept = df[~duplicated].assign(_pos=np.arange(len(df))[~duplicated.values])
+        compacted = pd.concat([kept, merged], ignore_index=True).sort_values("_pos", kind="stable")
+        compacted = compacted.drop(columns=["_pos"]).reset_index(drop=True)[df.columns]
+
+        history = superseded.assign(**{"Compacted At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+        if os.path.exists(HISTORY_FILE):
+            history = history.reindex(columns=pd.read_csv(HISTORY_FILE, nrows=0).columns)
+        history.to_csv(HISTORY_FILE, mode="a", index=False, header=not os.path.exists(HISTORY_FILE))
+
+        compacted_keys = set(keys[duplicated])
+        new_keys = compacted[ASSESSMENT_KEY_COLUMNS].fillna("").astype(str).agg("|".join, axis=1)
+        record_changes(compacted, compacted.index[new_keys.isin(compacted_keys)].tolist(), CSV_FILE, operation="compact")
+        versions = write_store(compacted, CSV_FILE, float_format='%.2f')
+        logger.info(f"Compacted {len(superseded)} rows into {len(compacted_keys)} records")
+    changed_rows = compacted[new_keys.isin(compacted_keys).values]
+    changed_rows.attrs["store_versions"] = versions
+    notify_write_listeners(CSV_FILE, changed_rows)
+    return len(superseded) - len(compacted_keys)
+
+def load_assessment_history(trainer_id=None):
+    try:
+        if os.path.exists(HISTORY_FILE):
+            history = pd.read_csv(HISTORY_FILE)
+            if trainer_id is not None:
+                history = history[history["Trainer ID"].astype(str) == str(trainer_id)]
+            return history
+    except Exception as e:
+        logger.error(f"Error loading assessment history: {str(e)}")
+    return pd.DataFrame(columns=CSV_COLUMNS + ["Compacted At"])
+
+def _load_archive_manifest():
+    return _read_archive_manifest(store_version(ARCHIVE_MANIFEST))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _read_archive_manifest(manifest_version):
+    try:
+        if os.path.exists(ARCHIVE_MANIFEST):
+            with open(ARCHIVE_MANIFEST, "r") as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading archive manifest: {str(e)}")
+    return {"segments": {}, "trainers": {}}
+
+def _save_archive_manifest(manifest):
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    tmp_file = f"{ARCHIVE_MANIFEST}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, ARCHIVE_MANIFEST)
+
+def closed_trainers(df, cutoff):
+    """Trainers qualified on every level by both evaluator kinds whose latest assessment is before `cutoff`."""
+    if df.empty:
+        return []
+    trainers = df["Trainer ID"].astype(str).to_numpy()
+    flags = pd.DataFrame({level: df[level].astype(str).eq("QUALIFIED").to_numpy() for level in LEVELS})
+    flags["trainer"], flags["kind"] = trainers, df["Evaluator Role"].map(_evaluator_kind).to_numpy()
+    by_kind = flags[flags["kind"] != ""].groupby(["trainer", "kind"])[LEVELS].any().all(axis=1).unstack(fill_value=False)
+    qualified = by_kind.reindex(columns=["technical", "school"], fill_value=False).all(axis=1)
+    last_assessed = normalize_dates(df["Date of assessment"]).groupby(trainers).max()
+    # Undated trainers compare False against the cutoff and stay hot
+    idle = last_assessed < cutoff
+    return sorted(set(qualified.index[qualified]) & set(idle.index[idle]))
+
+def archive_closed_assessments(max_age_days=ARCHIVE_AFTER_DAYS):
+    """Move closed trainers' rows into read-only gzip segments partitioned by assessment month."""
+    with shared_lock("store_lock"):
+        if not os.path.exists(CSV_FILE):
+            return 0
+        df = pd.read_csv(CSV_FILE)
+        trainers = closed_trainers(df, pd.Timestamp.now().normalize() - pd.Timedelta(days=max_age_days))
+        if not trainers:
+            return 0
+        archived = df["Trainer ID"].astype(str).isin(trainers)
+        rows = df[archived]
+        months = normalize_dates(rows["Date of assessment"]).dt.strftime("%Y-%m").fillna("undated")
+        branches = _resolve_branches(rows, _trainer_branch_map())
+        run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        manifest = json.loads(json.dumps(_load_archive_manifest()))
+        # Segments are written once and never modified; a later run adds new segments next to them
+        for month, segment in rows.groupby(months.to_numpy(), sort=True):
+            segment_file = os.path.join(ARCHIVE_DIR, month, f"{run_id}.csv.gz")
+            os.makedirs(os.path.dirname(segment_file), exist_ok=True)
+            segment.to_csv(f"{segment_file}.tmp", index=False, compression="gzip")
+            os.replace(f"{segment_file}.tmp", segment_file)
+            os.chmod(segment_file, 0o444)
+            manifest["segments"][segment_file] = {"month": month, "rows": len(segment), "archived_at": run_id}
+            for trainer_id, trainer_rows in segment.groupby(segment["Trainer ID"].astype(str)):
+                entry = manifest["trainers"].setdefault(trainer_id, {"segments": []})
+                entry.update(name=str(trainer_rows["Trainer Name"].iloc[-1]), branch=branches[trainer_rows.index[-1]])
+                entry["segments"].append(segment_file)
+        # The manifest is published before the hot store shrinks, so a crash in between only duplicates rows
+        _save_archive_manifest(manifest)
+        save_assessment_data(df[~archived], [], deleted_keys=list(dict.fromkeys(assessment_row_keys(rows))),
+                             delete_operation="archive", float_format='%.2f')
+        logger.info(f"Archived {len(rows)} rows of {len(trainers)} closed trainers")
+    return len(rows)
+
+def archived_trainer_ids(branches=None, text=""):
+    """Archived trainers (optionally limited to `branches` and an ID/name substring) straight from the manifest."""
+    text = str(text).lower()
+    return sorted(trainer_id for trainer_id, entry in _load_archive_manifest()["trainers"].items()
+                  if (branches is None or entry.get("branch") in branches)
+                  and (not text or text in trainer_id.lower() or text in str(entry.get("name", "")).lower()))
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _read_archive_segment(segment_file):
+    # Segments are immutable, so the path alone identifies their content
+    return pd.read_csv(segment_file, compression="gzip", dtype={"Trainer ID": str})
+
+def load_archived_assessments(trainer_id):
+    """A trainer's cold-storage rows, reading only the segments the manifest lists for them."""
+    entry = _load_archive_manifest()["trainers"].get(str(trainer_id))
+    frames = [segment[segment["Trainer ID"] == str(trainer_id)]
+              for segment in (_read_archive_segment(path) for path in (entry or {}).get("segments", []) if os.path.exists(path))]
+    if not frames:
+        return pd.DataFrame(columns=CSV_COLUMNS)
+    rows = pd.concat(frames, ignore_index=True).reindex(columns=CSV_COLUMNS)
+    for col in DATE_COLUMNS:
+        rows[col] = normalize_dates(rows[col])
+    return apply_assessment_schema(rows)
+
+def _compaction_loop():
+    last_version = None
+    while True:
+        try:
+            version = store_version(CSV_FILE)
+            if version != last_version:
+                compact_assessment_data()
+                last_version = store_version(CSV_FILE)
+        except Exception as e:
+            logger.error(f"Error compacting assessment data: {str(e)}")
+        time.sleep(COMPACTION_INTERVAL_SECONDS)
+
+@st.cache_resource(show_spinner=False)
+def start_compaction_worker():
+    worker = threading.Thread(target=_compaction_loop, name="assessment-compaction", daemon=True)
+    worker.start()
+    logger.info("Started background compaction worker")
+    return worker
+
+def _chunk_lines(data):
+    """Split file bytes into content-defined chunks on line boundaries."""
+    mask = (1 << BACKUP_CHUNK_BITS) - 1
+    chunks, current = [], []
+    for line in data.splitlines(keepends=True):
+        current.append(line)
+        if (zlib.crc32(line) & mask) == 0 or len(current) >= BACKUP_MAX_CHUNK_LINES:
+            chunks.append(b"".join(current))
+            current = []
+    if current:
+        chunks.append(b"".join(current))
+    return chunks
+
+def _backup_object_path(digest):
+    return os.path.join(BACKUP_DIR, "objects", digest[:2], f"{digest}.gz")
+
+def _store_backup_object(chunk):
+    """Store a chunk under its sha256 unless already present; returns (digest, compressed bytes added)."""
+    digest = hashlib.sha256(chunk).hexdigest()
+    path = _backup_object_path(digest)
+    if os.path.exists(path):
+        return digest, 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    compressed = gzip.compress(chunk)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(compressed)
+    os.replace(f"{path}.tmp", path)
+    return digest, len(compressed)
+
+def _backup_point_path(point_id):
+    return os.path.join(BACKUP_DIR, "points", f"{point_id}.json")
+
+def list_backups():
+    if not os.path.exists(BACKUP_INDEX):
+        return pd.DataFrame(columns=BACKUP_INDEX_COLUMNS)
+    return pd.read_csv(BACKUP_INDEX, dtype={"point_id": str}).sort_values("point_id", ascending=False, ignore_index=True)
+
+def load_backup_point(point_id):
+    with open(_backup_point_path(point_id), "r") as f:
+        return json.load(f)
+
+def take_backup(reason="scheduled"):
+    """Record a restore point of every store as content-addressed compressed chunks; returns its id, or None if nothing changed."""
+    with shared_lock("store_lock"):
+        backups = list_backups()
+        previous = load_backup_point(backups["point_id"].iloc[0])["files"] if not backups.empty else {}
+        files, changed_stores, added_bytes = {}, [], 0
+        for store in BACKUP_STORES:
+            if not os.path.exists(store):
+                continue
+            with open(store, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            if previous.get(store, {}).get("sha256") == digest:
+                files[store] = previous[store]
+                continue
+            chunks = []
+            for chunk in _chunk_lines(data):
+                chunk_digest, written = _store_backup_object(chunk)
+                chunks.append(chunk_digest)
+                added_bytes += written
+            files[store] = {"sha256": digest, "size": len(data), "chunks": chunks}
+            changed_stores.append(store)
+        if not changed_stores and set(files) == set(previous):
+            return None
+        point_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        point = {"point_id": point_id, "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "reason": reason,
+                 "change_seq": current_change_seq(), "files": files}
+        os.makedirs(os.path.dirname(_backup_point_path(point_id)), exist_ok=True)
+        with open(f"{_backup_point_path(point_id)}.tmp", "w") as f:
+            json.dump(point, f)
+        os.replace(f"{_backup_point_path(point_id)}.tmp", _backup_point_path(point_id))
+        row = pd.DataFrame([[point_id, point["created_at"], reason, point["change_seq"], ";".join(changed_stores), added_bytes]],
+                           columns=BACKUP_INDEX_COLUMNS)
+        row.to_csv(BACKUP_INDEX, mode="a", index=False, header=not os.path.exists(BACKUP_INDEX))
+    logger.info(f"Backup {point_id} ({reason}): {', '.join(changed_stores) or 'no store changes'}, {added_bytes} new bytes")
+    return point_id
+
+def read_backup_file(point_id, store):
+    """Reassemble one store's bytes at a restore point, verifying them against the recorded digest."""
+    entry = load_backup_point(point_id)["files"][store]
+    parts = []
+    for digest in entry["chunks"]:
+        with open(_backup_object_path(digest), "rb") as f:
+            parts.append(gzip.decompress(f.read()))
+    data = b"".join(parts)
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise ValueError(f"Backup {point_id} of {store} is corrupt")
+    return data
+
+def restore_backup(point_id, stores=None):
+    """Bring stores back to a restore point as a new stamped write: differing rows are upserted, vanished rows deleted."""
+    point = load_backup_point(point_id)
+    take_backup(reason=f"before restoring {point_id}")
+    restored_counts = {}
+    with shared_lock("store_lock"):
+        for store in point["files"]:
+            if stores is not None and store not in stores:
+                continue
+            restored = pd.read_csv(BytesIO(read_backup_file(point_id, store)))
+            current = pd.read_csv(store) if os.path.exists(store) else pd.DataFrame(columns=restored.columns)
+            seq_col, ts_col, key_cols = CHANGE_TRACKED_STORES[store]
+            content = [col for col in restored.columns if col not in (seq_col, ts_col)]
+            current_rows = set(pd.util.hash_pandas_object(current.reindex(columns=content).astype(str), index=False))
+            restored_rows = pd.util.hash_pandas_object(restored.reindex(columns=content).astype(str), index=False)
+            changed = restored.index[~restored_rows.isin(current_rows).to_numpy()].tolist()
+            restored_keys = set(restored.reindex(columns=key_cols).fillna("").astype(str).agg("|".join, axis=1))
+            current_keys = set(current.reindex(columns=key_cols).fillna("").astype(str).agg("|".join, axis=1))
+            deleted = sorted(current_keys - restored_keys)
+            if store == CSV_FILE:
+                save_assessment_data(restored, changed, deleted_keys=deleted, float_format='%.2f')
+            elif store == DEFAULT_DATA_FILE:
+                save_trainer_inputs(restored, changed, deleted_keys=deleted)
+            else:
+                save_evaluators(restored, changed, deleted)
+            restored_counts[store] = {"upserted": len(changed), "deleted": len(deleted)}
+    logger.info(f"Restored backup {point_id}: {restored_counts}")
+    return restored_counts
+
+def _backup_loop(wake):
+    take_backup("startup")
+    while True:
+        woken = wake.wait(BACKUP_INTERVAL_SECONDS)
+        wake.clear()
+        if woken:
+            # Let a burst of writes settle into a single restore point
+            time.sleep(BACKUP_DEBOUNCE_SECONDS)
+            wake.clear()
+        try:
+            take_backup("write" if woken else "scheduled")
+        except Exception as e:
+            logger.error(f"Error taking backup: {str(e)}")
+
+@st.cache_resource(show_spinner=False)
+def start_backup_worker():
+    wake = threading.Event()
+
+    def _on_write(store, changed_rows, removed_keys):
+        if store in BACKUP_STORES:
+            wake.set()
+
+    register_write_listener(_on_write)
+    worker = threading.Thread(target=_backup_loop, args=(wake,), name="store-backups", daemon=True)
+    worker.start()
+    logger.info("Started backup worker")
+    return worker
+
+def show_backups():
+    restored = st.session_state.pop("backup_restored", None)
+    if restored:
+        st.success("Restored: " + "; ".join(f"{store} ({counts['upserted']} upserted, {counts['deleted']} deleted)" for store, counts in restored.items()))
+    if st.button("Back Up Now", key="backup_now"):
+        point_id = take_backup("manual")
+        st.success(f"Created restore point {point_id}." if point_id else "Nothing changed since the last restore point.")
+    backups = list_backups()
+    if backups.empty:
+        st.info("No restore points yet.")
+        return
+    live_bytes = sum(os.path.getsize(store) for store in BACKUP_STORES if os.path.exists(store))
+    st.caption(f"{len(backups)} restore points using {backups['added_bytes'].sum() / 1024:.0f} KB of compressed chunks "
+               f"(live stores: {live_bytes / 1024:.0f} KB).")
+    st.dataframe(backups, use_container_width=True, hide_index=True)
+    point_id = st.selectbox("Restore point", backups["point_id"].tolist(), key="restore_point",
+                            format_func=lambda pid: f"{pid} · {backups.set_index('point_id').at[pid, 'created_at']} · {backups.set_index('point_id').at[pid, 'reason']}")
+    stores = st.multiselect("Stores to restore", BACKUP_STORES, default=BACKUP_STORES, key="restore_stores")
+    confirmed = st.checkbox("I understand the selected stores will be rolled back to this point", key="restore_confirm")
+    if st.button("Restore", key="restore_backup", disabled=not (confirmed and stores)):
+        try:
+            st.session_state["backup_restored"] = restore_backup(point_id, stores)
+            st.rerun()
+        except Exception as e:
+            logger.error(f"Error restoring backup: {str(e)}")
+            show_error_message("Failed to restore the backup.", "restore_backup_error")
+
+def _evaluator_kind(role):
+    role = str(role).lower()
+    if "technical" in role:
+        return "technical"
+    if "school" in role:
+        return "school"
+    return ""
+
+def _apply_signoffs(index, rows, removed_keys=()):
+    """Fold changed assessment rows into the per trainer/level sign-off index and drop removed rows' sign-offs."""
+    with index["lock"]:
+        for row_key in removed_keys:
+            for level in LEVELS:
+                index["signoffs"].get((row_key.split("|")[0], level), {}).pop(row_key, None)
+        for row_key, (_, row) in zip(assessment_row_keys(rows), rows.iterrows()):
+            trainer_id = row.get("Trainer ID")
+            kind = _evaluator_kind(row.get("Evaluator Role", ""))
+            if pd.isna(trainer_id) or not kind:
+                continue
+            signed_at = row.get("Last Modified")
+            if pd.isna(signed_at) or signed_at == "":
+                signed_at = row.get("Date of assessment")
+            signed_at = str(signed_at) if not pd.isna(signed_at) else ""
+            for level in LEVELS:
+                signoffs = index["signoffs"].setdefault((str(trainer_id), level), {})
+                if row.get(level) == "QUALIFIED":
+                    signoffs[row_key] = (kind, str(row.get("Evaluator Username", "")), signed_at)
+                else:
+                    signoffs.pop(row_key, None)
+
+@st.cache_resource(show_spinner=False)
+def get_signoff_index():
+    index = {"signoffs": {}, "lock": threading.Lock()}
+    _apply_signoffs(index, load_data())
+
+    def _on_write(store, changed_rows, removed_keys):
+        if store == CSV_FILE:
+            _apply_signoffs(index, changed_rows, removed_keys)
+
+    register_write_listener(_on_write)
+    return index
+
+def pending_second_evaluations(index):
+    """Heap of (signed_at, trainer_id, level, missing_kind, first_evaluator) awaiting the other role."""
+    pending = []
+    with index["lock"]:
+        for (trainer_id, level), signoffs in index["signoffs"].items():
+            kinds = {kind for kind, _, _ in signoffs.values()}
+            if len(kinds) == 1:
+                kind, first_evaluator, signed_at = min(signoffs.values(), key=lambda s: s[2])
+                missing = "school" if kind == "technical" else "technical"
+                pending.append((signed_at, trainer_id, level, missing, first_evaluator))
+    heapq.heapify(pending)
+    return pending
+
+def assign_evaluation_queue(pending, evaluators_df):
+    """Hand out pending second evaluations, oldest first, to the least-loaded evaluator of the missing role."""
+    queues = {username: [] for username in evaluators_df["username"].dropna().astype(str)}
+    loads = {"technical": [], "school": []}
+    for _, row in evaluators_df.dropna(subset=["username"]).iterrows():
+        kind = _evaluator_kind(row["role"])
+        for target in ([kind] if kind else ["technical", "school"]):
+            loads[target].append([0, str(row["username"])])
+    pending = list(pending)
+    while pending:
+        signed_at, trainer_id, level, missing, first_evaluator = heapq.heappop(pending)
+        candidates = [entry for entry in loads[missing] if entry[1] != first_evaluator] or loads[missing]
+        if not candidates:
+            continue
+        chosen = min(candidates, key=lambda entry: (entry[0], entry[1]))
+        chosen[0] += 1
+        # Keep every list entry for the same username in step (generic evaluators serve both roles)
+        for entries in loads.values():
+            for entry in entries:
+                if entry[1] == chosen[1]:
+                    entry[0] = chosen[0]
+        queues[chosen[1]].append({
+            "Trainer ID": trainer_id,
+            "Level": level,
+            "Awaiting": "Technical Evaluator" if missing == "technical" else "School Operations Evaluator",
+            "First Sign-off By": first_evaluator,
+            "Signed Off At": signed_at
+        })
+    return queues
+
+def show_my_queue(evaluator_username):
+    try:
+        queues = assign_evaluation_queue(pending_second_evaluations(get_signoff_index()), load_evaluators())
+        my_queue = queues.get(str(evaluator_username), [])
+        with st.expander(f"📥 My Queue ({len(my_queue)} awaiting second sign-off)", expanded=bool(my_queue)):
+            if my_queue:
+                st.dataframe(pd.DataFrame(my_queue), use_container_width=True)
+            else:
+                st.info("No trainers are waiting for your sign-off.")
+    except Exception as e:
+        logger.error(f"Error building evaluator queue: {str(e)}")
+        show_error_message("Unable to load your evaluation queue.", "my_queue_error")
+
+def search_text_columns():
+    """(column, level, field label) of every free-text feedback column: course remarks and level reminders."""
+    columns = []
+    for level, compiled in RUBRIC_INDEX["levels"].items():
+        columns += [(col, level, f"Course :{i}") for i, col in enumerate(compiled["names"]["remarks"], 1)]
+        columns.append((f"{level} Reminder", level, "Reminder"))
+    return columns
+
+def tokenize(text):
+    return [term for term in re.findall(r"[a-z0-9]+", str(text).lower()) if term not in SEARCH_STOPWORDS]
+
+def _drop_row_docs(index, row_key):
+    # Caller holds index["lock"]
+    for doc_id in index["docs_by_row"].pop(row_key, []):
+        doc = index["docs"].pop(doc_id)
+        for term in doc["terms"]:
+            postings = index["postings"][term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del index["postings"][term]
+                index["vocabulary"] = None
+        index["total_length"] -= doc["length"]
+
+def _index_rows(index, rows, removed_keys=()):
+    """Replace the documents of each changed assessment row with its current remarks and reminders."""
+    with index["lock"]:
+        for row_key in removed_keys:
+            _drop_row_docs(index, row_key)
+    if rows.empty:
+        return
+    keys = assessment_row_keys(rows)
+    with index["lock"]:
+        for row_key, (_, row) in zip(keys, rows.iterrows()):
+            _drop_row_docs(index, row_key)
+            doc_ids = []
+            for col, level, field in search_text_columns():
+                text = row.get(col)
+                if pd.isna(text) or str(text).strip() in ("", "No data entered", "0"):
+                    continue
+                terms = tokenize(text)
+                if not terms:
+                    continue
+                doc_id = f"{row_key}|{col}"
+                counts = pd.Series(terms).value_counts().to_dict()
+                index["docs"][doc_id] = {
+                    "Trainer ID": str(row.get("Trainer ID", "")), "Trainer Name": row.get("Trainer Name", ""),
+                    "Evaluator": row.get("Evaluator Username", ""), "Level": level, "Field": field,
+                    "Text": str(text), "terms": counts, "length": len(terms),
+                }
+                for term, count in counts.items():
+                    if term not in index["postings"]:
+                        index["vocabulary"] = None
+                    index["postings"].setdefault(term, {})[doc_id] = count
+                index["total_length"] += len(terms)
+                doc_ids.append(doc_id)
+            if doc_ids:
+                index["docs_by_row"][row_key] = doc_ids
+
+@st.cache_resource(show_spinner=False)
+def get_text_index():
+    """Inverted index term -> {doc: term frequency} over remarks and reminders, kept current by the write listener."""
+    index = {"postings": {}, "docs": {}, "docs_by_row": {}, "total_length": 0, "vocabulary": None, "lock": threading.Lock()}
+    if os.path.exists(CSV_FILE):
+        text_columns = [col for col, _, _ in search_text_columns()]
+        wanted = set(ASSESSMENT_KEY_COLUMNS + ["Trainer Name"] + text_columns)
+        _index_rows(index, pd.read_csv(CSV_FILE, usecols=lambda col: col in wanted, dtype=str))
+
+    def _on_write(store, changed_rows, removed_keys):
+        if store == CSV_FILE:
+            _index_rows(index, changed_rows, removed_keys)
+
+    register_write_listener(_on_write)
+    return index
+
+def search_feedback(query, trainer_ids=None, limit=SEARCH_RESULT_LIMIT, k1=1.2, b=0.75):
+    """BM25-ranked remark/reminder hits; the last query word also matches as a prefix (search as you type)."""
+    terms = tokenize(query)
+    if not terms:
+        return pd.DataFrame(columns=["Score", "Trainer ID", "Trainer Name", "Level", "Field", "Evaluator", "Text"])
+    index = get_text_index()
+    with index["lock"]:
+        if index["vocabulary"] is None:
+            index["vocabulary"] = sorted(index["postings"])
+        vocabulary = index["vocabulary"]
+        start = bisect.bisect_left(vocabulary, terms[-1])
+        prefix_terms = []
+        for term in vocabulary[start:]:
+            if not term.startswith(terms[-1]):
+                break
+            prefix_terms.append(term)
+        doc_count = len(index["docs"]) or 1
+        average_length = index["total_length"] / doc_count
+        scores = {}
+        for term in set(terms[:-1]) | set(prefix_terms):
+            postings = index["postings"].get(term, {})
+            idf = np.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = index["docs"][doc_id]["length"]
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / average_length))
+        allowed = None if trainer_ids is None else {str(tid) for tid in trainer_ids}
+        ranked = heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items()
+                                        if allowed is None or index["docs"][doc_id]["Trainer ID"] in allowed))
+        hits = [{"Score": round(score, 3), **{k: v for k, v in index["docs"][doc_id].items() if k not in ("terms", "length")}}
+                for score, doc_id in ranked]
+    return pd.DataFrame(hits, columns=["Score", "Trainer ID", "Trainer Name", "Level", "Field", "Evaluator", "Text"])
+
+def feedback_search_box(key, trainer_ids=None):
+    query = st.text_input("🔎 Search remarks and reminders", "", key=key, help="Matches words in course remarks and level reminders")
+    if query.strip():
+        started = time.perf_counter()
+        hits = search_feedback(query, trainer_ids)
+        st.caption(f"{len(hits)} matches in {(time.perf_counter() - started) * 1000:.1f} ms")
+        if not hits.empty:
+            st.dataframe(hits, use_container_width=True, hide_index=True)
+
+def _place_ranking(index, trainer_id, level, department):
+    """Re-slot one trainer's level score, the mean over their evaluators' rows. Caller holds index["lock"]."""
+    row_scores = index["row_scores"].get((trainer_id, level), {})
+    score = float(np.mean(list(row_scores.values()))) if row_scores else None
+    placement = index["placement"].get((trainer_id, level))
+    if placement == (department, score):
+        return
+    if placement is not None:
+        for group in (placement[0], ALL_DEPARTMENTS):
+            ranked = index["groups"][(group, level)]
+            del ranked[bisect.bisect_left(ranked, (placement[1], trainer_id))]
+    if score is None:
+        index["placement"].pop((trainer_id, level), None)
+        return
+    for group in (department, ALL_DEPARTMENTS):
+        bisect.insort(index["groups"].setdefault((group, level), []), (score, trainer_id))
+    index["placement"][(trainer_id, level)] = (department, score)
+
+def _apply_rankings(index, rows, removed_keys=()):
+    """Move each changed trainer's level score to its new slot in the department and overall rank lists."""
+    with index["lock"]:
+        for row_key in removed_keys:
+            trainer_id = row_key.split("|")[0]
+            for level in LEVELS:
+                if index["row_scores"].get((trainer_id, level), {}).pop(row_key, None) is not None:
+                    placement = index["placement"].get((trainer_id, level))
+                    _place_ranking(index, trainer_id, level, placement[0] if placement else "Unassigned")
+    if rows.empty:
+        return
+    keys = assessment_row_keys(rows)
+    with index["lock"]:
+        for row_key, (_, row) in zip(keys, rows.iterrows()):
+            trainer_id = row.get("Trainer ID")
+            if pd.isna(trainer_id) or str(trainer_id).strip() == "":
+                continue
+            trainer_id = str(trainer_id)
+            department = row.get("Department")
+            department = str(department) if not pd.isna(department) and str(department).strip() else "Unassigned"
+            for level in LEVELS:
+                average = pd.to_numeric(pd.Series([row.get(f"{level} AVERAGE")]), errors="coerce").iloc[0]
+                row_scores = index["row_scores"].setdefault((trainer_id, level), {})
+                # 0 is the placeholder written for levels an evaluator never scored
+                if pd.isna(average) or average <= 0:
+                    row_scores.pop(row_key, None)
+                else:
+                    row_scores[row_key] = float(average)
+                _place_ranking(index, trainer_id, level, department)
+                if (trainer_id, level) in index["placement"]:
+                    index["names"][trainer_id] = row.get("Trainer Name", "")
+
+@st.cache_resource(show_spinner=False)
+def get_ranking_index():
+    """Per (department, level) score lists kept sorted on write, so top-N and ranks are slices and bisects."""
+    index = {"row_scores": {}, "placement": {}, "groups": {}, "names": {}, "lock": threading.Lock()}
+    _apply_rankings(index, load_data())
+
+    def _on_write(store, changed_rows, removed_keys):
+        if store == CSV_FILE:
+            _apply_rankings(index, changed_rows, removed_keys)
+
+    register_write_listener(_on_write)
+    return index
+
+def leaderboard(level, department=ALL_DEPARTMENTS, size=LEADERBOARD_SIZE):
+    index = get_ranking_index()
+    with index["lock"]:
+        ranked = index["groups"].get((department, level), [])
+        top = ranked[-size:][::-1]
+        return pd.DataFrame([{"Rank": position, "Trainer ID": trainer_id, "Trainer Name": index["names"].get(trainer_id, ""),
+                              "Department": index["placement"][(trainer_id, level)][0], f"{level} AVERAGE": round(score, 2)}
+                             for position, (score, trainer_id) in enumerate(top, 1)])
+
+def trainer_standing(trainer_id, level):
+    """(rank, group size, percentile) of a trainer's level score within its department and overall, or None."""
+    index = get_ranking_index()
+    with index["lock"]:
+        placement = index["placement"].get((str(trainer_id), level))
+        if placement is None:
+            return None
+        department, score = placement
+        standing = {}
+        for group in (department, ALL_DEPARTMENTS):
+            ranked = index["groups"][(group, level)]
+            # Everyone tied with this score shares its rank; percentile = share of trainers at or below it
+            at_or_below = bisect.bisect_right(ranked, (score, chr(0x10FFFF)))
+            standing[group] = (len(ranked) - at_or_below + 1, len(ranked), 100.0 * at_or_below / len(ranked))
+        return standing
+
+def show_trainer_standing(trainer_id):
+    rows = []
+    for level in LEVELS:
+        standing = trainer_standing(trainer_id, level)
+        if standing:
+            for group, (rank, size, percentile) in standing.items():
+                rows.append({"Level": level, "Compared With": group, "Rank": f"{rank} of {size}", "Percentile": f"{percentile:.0f}"})
+    if rows:
+        st.markdown("##### 🏅 Rank and Percentile")
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+def show_leaderboards():
+    index = get_ranking_index()
+    with index["lock"]:
+        departments = sorted({group for group, _ in index["groups"]} - {ALL_DEPARTMENTS})
+    col1, col2 = st.columns(2)
+    level = col1.selectbox("Level", LEVELS, key="leaderboard_level")
+    department = col2.selectbox("Department", [ALL_DEPARTMENTS] + departments, key="leaderboard_department")
+    board = leaderboard(level, department)
+    if board.empty:
+        st.info(f"No scored {level} assessments for {department}.")
+    else:
+        st.dataframe(board, use_container_width=True, hide_index=True)
+
+def status_filter_fields():
+    """Filterable field -> the store columns it indexes; a course STATUS field matches any course of its level."""
+    fields = {"Department": ["Department"], "Branch": ["Branch"], "Evaluator Role": ["Evaluator Role"]}
+    for level, compiled in RUBRIC_INDEX["levels"].items():
+        fields[level] = [level]
+        fields[f"{level} Course STATUS"] = list(compiled["names"]["status"])
+        fields[f"{level} Score Card Status"] = [f"{level} Score Card Status"]
+    return fields
+
+STATUS_FILTER_FIELDS = status_filter_fields()
+
+def _slots_bitmap(slots):
+    """Python int with the given bit positions set."""
+    slots = np.asarray(slots, dtype=np.int64)
+    if slots.size == 0:
+        return 0
+    bits = np.zeros(slots.max() + 1, dtype=bool)
+    bits[slots] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+def _bitmap_slots(bitmap):
+    if not bitmap:
+        return np.empty(0, dtype=np.int64)
+    raw = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+def _clear_bitmap_slots(index, keys):
+    """Drop rows that left the store from the live set and every bitmap. Their slots stay reserved for the key."""
+    with index["lock"]:
+        removed = _slots_bitmap([index["slots"][key] for key in keys if key in index["slots"]])
+        if not removed:
+            return
+        index["live"] &= ~removed
+        for bitmaps in index["bitmaps"].values():
+            for value in list(bitmaps):
+                bitmaps[value] &= ~removed
+                if not bitmaps[value]:
+                    del bitmaps[value]
+
+def _apply_bitmaps(index, rows, fields=None):
+    """Rewrite the changed rows' bits in the per-value bitmaps of `fields` (default all): clear their slots, then
+    set them where the value now holds."""
+    if rows.empty:
+        return
+    keys = assessment_row_keys(rows)
+    live = ~keys.duplicated(keep="last")
+    rows, keys = densify_frame(rows[live.to_numpy()]), keys[live].tolist()
+    rows = rows.assign(Branch=_resolve_branches(rows, _trainer_branch_map()))
+    with index["lock"]:
+        for key in keys:
+            if key not in index["slots"]:
+                index["slots"][key] = len(index["keys"])
+                index["keys"].append(key)
+        slots = np.fromiter((index["slots"][key] for key in keys), dtype=np.int64, count=len(keys))
+        changed = _slots_bitmap(slots)
+        index["live"] |= changed
+        for field, columns in STATUS_FILTER_FIELDS.items():
+            if fields is not None and field not in fields:
+                continue
+            cells = rows.reindex(columns=columns).astype(object)
+            text = cells.where(cells.notna(), "").astype(str).apply(lambda col: col.str.strip())
+            filled = (text != "").to_numpy()
+            text = text.to_numpy()
+            holds = {value: (text == value).any(axis=1) for value in pd.unique(text[filled])}
+            holds[BITMAP_BLANK] = ~filled.any(axis=1)
+            bitmaps = index["bitmaps"][field]
+            for value in set(holds) | set(bitmaps):
+                bitmap = bitmaps.get(value, 0) & ~changed
+                if value in holds:
+                    bitmap |= _slots_bitmap(slots[holds[value]])
+                if bitmap:
+                    bitmaps[value] = bitmap
+                else:
+                    bitmaps.pop(value, None)
+
+@st.cache_resource(show_spinner=False)
+def get_bitmap_index():
+    """Per (field, value) bitmaps over assessment row slots, kept current by the write listener."""
+    index = {"slots": {}, "keys": [], "live": 0, "bitmaps": {field: {} for field in STATUS_FILTER_FIELDS},
+             "lock": threading.Lock()}
+    _apply_bitmaps(index, load_data())
+
+    def _on_write(store, changed_rows, removed_keys):
+        if store == CSV_FILE:
+            _clear_bitmap_slots(index, removed_keys)
+            _apply_bitmaps(index, changed_rows)
+        elif store == DEFAULT_DATA_FILE:
+            # Rows without their own Branch take the trainer's, so a roster edit moves them between Branch bitmaps
+            trainers = set(changed_rows.get("Trainer ID", pd.Series(dtype=object)).dropna().astype(str)) | set(removed_keys)
+            if trainers:
+                assessments = load_data()
+                _apply_bitmaps(index, assessments[assessments["Trainer ID"].astype(str).isin(trainers)], fields=["Branch"])
+
+    register_write_listener(_on_write)
+    return index
+
+def status_filter_counts(branches=None):
+    """field -> {value: matching rows}, counted within the given branches when the caller is branch-scoped."""
+    index = get_bitmap_index()
+    with index["lock"]:
+        scope = None if branches is None else functools.reduce(
+            lambda acc, branch: acc | index["bitmaps"]["Branch"].get(branch, 0), branches, 0)
+        return {field: {value: (bitmap if scope is None else bitmap & scope).bit_count() for value, bitmap in sorted(bitmaps.items())}
+                for field, bitmaps in index["bitmaps"].items()}
+
+def status_filter_query(groups, branches=None):
+    """Row keys matching an OR of AND-groups of (field, values, exclude) conditions, by bitwise operations."""
+    index = get_bitmap_index()
+    with index["lock"]:
+        universe = index["live"]
+        if branches is not None:
+            universe = functools.reduce(lambda acc, branch: acc | index["bitmaps"]["Branch"].get(branch, 0), branches, 0)
+        matched = 0
+        for group in groups:
+            group_bits = universe
+            for field, values, exclude in group:
+                bits = functools.reduce(lambda acc, value: acc | index["bitmaps"][field].get(value, 0), values, 0)
+                group_bits &= ~bits if exclude else bits
+            matched |= group_bits
+        return {index["keys"][slot] for slot in _bitmap_slots(matched)}
+
+def status_filter_builder(key, branches=None):
+    """AND/OR filter form over the indexed status fields; returns the matching row keys, or None without conditions."""
+    counts = status_filter_counts(branches)
+    group_count = int(st.number_input("Condition groups (a row matches if any group matches)", min_value=1,
+                                      max_value=STATUS_FILTER_MAX_GROUPS, value=1, key=f"{key}_groups"))
+    groups = []
+    for g in range(group_count):
+        fields = st.multiselect(f"Group {g + 1}: every condition must hold", list(STATUS_FILTER_FIELDS), key=f"{key}_fields_{g}")
+        conditions = []
+        for field in fields:
+            col1, col2 = st.columns([4, 1])
+            values = col1.multiselect(f"{field} is any of", list(counts[field]), key=f"{key}_values_{g}_{field}",
+                                      format_func=lambda value, field=field: f"{value} ({counts[field][value]})")
+            exclude = col2.checkbox("Exclude", key=f"{key}_exclude_{g}_{field}", help="Match rows whose value is none of these")
+            if values:
+                conditions.append((field, values, exclude))
+        if conditions:
+            groups.append(conditions)
+    if not groups:
+        return None
+    started = time.perf_counter()
+    keys = status_filter_query(groups, branches)
+    st.caption(f"{len(keys)} matching assessment rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return keys
+
+def _score_cells(rows):
+    """Long (evaluator, parameter, row key, column, score) arrays of every entered rubric score in `rows`."""
+    row_keys = assessment_row_keys(rows)
+    # Like find_assessment_row, the last row of a duplicated key is the live one
+    live = ~row_keys.duplicated(keep="last")
+    rows, row_keys = rows[live.to_numpy()], row_keys[live]
+    columns = [f"{param} Course :{i}" for param in SCORE_PARAMS for i in range(1, MAX_COURSES + 1)]
+    params = np.repeat(SCORE_PARAMS, MAX_COURSES)
+    values = rows.reindex(columns=columns).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    # 0 is what Save writes for parameters that were never scored
+    row_pos, col_pos = np.nonzero(~np.isnan(values) & (values > 0))
+    evaluators = rows["Evaluator Username"].astype(object).fillna("").astype(str).to_numpy()
+    return (evaluators[row_pos], params[col_pos], row_keys.to_numpy()[row_pos],
+            np.asarray(columns, dtype=object)[col_pos], values[row_pos, col_pos])
+
+def _new_stats(param):
+    return {"n": 0, "mean": 0.0, "m2": 0.0, "hist": np.zeros(PARAM_MAX_SCORES[param] + 1, dtype=int)}
+
+def _welford_add(stats, value):
+    stats["n"] += 1
+    delta = value - stats["mean"]
+    stats["mean"] += delta / stats["n"]
+    stats["m2"] += delta * (value - stats["mean"])
+    stats["hist"][int(np.clip(round(value), 0, len(stats["hist"]) - 1))] += 1
+
+def _welford_remove(stats, value):
+    stats["hist"][int(np.clip(round(value), 0, len(stats["hist"]) - 1))] -= 1
+    if stats["n"] <= 1:
+        stats.update(n=0, mean=0.0, m2=0.0)
+        return
+    previous_mean = stats["mean"]
+    stats["n"] -= 1
+    stats["mean"] -= (value - previous_mean) / stats["n"]
+    stats["m2"] = max(stats["m2"] - (value - stats["mean"]) * (value - previous_mean), 0.0)
+
+def backfill_calibration(df):
+    """Build per (evaluator, parameter) count/mean/M2/histogram over a whole store in one vectorised pass."""
+    evaluators, params, row_keys, columns, values = _score_cells(df)
+    cells = pd.DataFrame({"evaluator": evaluators, "param": params, "value": values})
+    grouped = cells.groupby(["evaluator", "param"])["value"]
+    summary = grouped.agg(["count", "mean", lambda v: float(((v - v.mean()) ** 2).sum())])
+    summary.columns = ["n", "mean", "m2"]
+    histograms = cells.assign(bin=cells["value"].round().astype(int)).groupby(["evaluator", "param", "bin"]).size()
+    stats = {}
+    for (evaluator, param), row in summary.iterrows():
+        entry = _new_stats(param)
+        entry.update(n=int(row["n"]), mean=float(row["mean"]), m2=float(row["m2"]))
+        stats[(evaluator, param)] = entry
+    for (evaluator, param, score_bin), count in histograms.items():
+        hist = stats[(evaluator, param)]["hist"]
+        hist[int(np.clip(score_bin, 0, len(hist) - 1))] += count
+    return stats, _cells_by_row(evaluators, params, row_keys, columns, values)
+
+def _cells_by_row(evaluators, params, row_keys, columns, values):
+    """row key -> {column: (evaluator, parameter, score)}, so a changed row finds its previous cells directly."""
+    cells = {}
+    for evaluator, param, row_key, column, value in zip(evaluators, params, row_keys, columns, values):
+        cells.setdefault(row_key, {})[column] = (evaluator, param, value)
+    return cells
+
+def _apply_calibration(index, rows, removed_keys=()):
+    """O(1) Welford update per changed score cell: retract the value it replaces, then add the new one."""
+    if rows.empty and not removed_keys:
+        return
+    current = _cells_by_row(*_score_cells(rows)) if not rows.empty else {}
+    with index["lock"]:
+        # A removed row has no current cells, so all of its scores are retracted
+        for row_key in set(assessment_row_keys(rows)) | set(removed_keys):
+            previous = index["cells"].pop(row_key, {})
+            cells = current.get(row_key, {})
+            for column, (evaluator, param, value) in previous.items():
+                if cells.get(column) != (evaluator, param, value):
+                    _welford_remove(index["stats"][(evaluator, param)], value)
+            for column, (evaluator, param, value) in cells.items():
+                if previous.get(column) != (evaluator, param, value):
+                    _welford_add(index["stats"].setdefault((evaluator, param), _new_stats(param)), value)
+            if cells:
+                index["cells"][row_key] = cells
+
+@st.cache_resource(show_spinner=False)
+def get_calibration_index():
+    stats, cells = backfill_calibration(pd.read_csv(CSV_FILE) if os.path.exists(CSV_FILE) else pd.DataFrame(columns=CSV_COLUMNS))
+    index = {"stats": stats, "cells": cells, "lock": threading.Lock()}
+
+    def _on_write(store, changed_rows, removed_keys):
+        if store == CSV_FILE:
+            _apply_calibration(index, changed_rows, removed_keys)
+
+    register_write_listener(_on_write)
+    return index
+
+def calibration_report():
+    """Each evaluator's mean per parameter against the pooled statistics of every other evaluator on it."""
+    index = get_calibration_index()
+    with index["lock"]:
+        stats = {key: dict(value) for key, value in index["stats"].items() if value["n"] > 0}
+    totals = {}
+    for (_, param), entry in stats.items():
+        total = totals.setdefault(param, {"n": 0, "sum": 0.0, "sum_sq": 0.0})
+        total["n"] += entry["n"]
+        total["sum"] += entry["n"] * entry["mean"]
+        total["sum_sq"] += entry["m2"] + entry["n"] * entry["mean"] ** 2
+    rows = []
+    for (evaluator, param), entry in sorted(stats.items()):
+        total = totals[param]
+        peer_n = total["n"] - entry["n"]
+        row = {"Evaluator": evaluator, "Parameter": param, "Scores": entry["n"], "Mean": round(entry["mean"], 2),
+               "Std": round(np.sqrt(entry["m2"] / entry["n"]), 2), "Peer Mean": None, "Effect Size": None, "Flag": ""}
+        if peer_n > 0:
+            peer_mean = (total["sum"] - entry["n"] * entry["mean"]) / peer_n
+            peer_m2 = (total["sum_sq"] - entry["m2"] - entry["n"] * entry["mean"] ** 2) - peer_n * peer_mean ** 2
+            pooled = np.sqrt(max(entry["m2"] + peer_m2, 0.0) / max(entry["n"] + peer_n - 2, 1))
+            effect = (entry["mean"] - peer_mean) / pooled if pooled > 0 else 0.0
+            row.update({"Peer Mean": round(peer_mean, 2), "Effect Size": round(effect, 2)})
+            if min(entry["n"], peer_n) >= CALIBRATION_MIN_SCORES and abs(effect) >= CALIBRATION_DRIFT_THRESHOLD:
+                row["Flag"] = "Lenient" if effect > 0 else "Harsh"
+        rows.append(row)
+    return pd.DataFrame(rows, columns=["Evaluator", "Parameter", "Scores", "Mean", "Std", "Peer Mean", "Effect Size", "Flag"])
+
+def show_calibration():
+    report = calibration_report()
+    if report.empty:
+        st.info("No rubric scores have been recorded yet.")
+        return
+    flagged = report[report["Flag"] != ""]
+    st.caption(f"Flagged when the mean is ≥ {CALIBRATION_DRIFT_THRESHOLD} pooled standard deviations from peers "
+               f"(with at least {CALIBRATION_MIN_SCORES} scores on each side).")
+    if flagged.empty:
+        st.success("No evaluator currently scores out of line with their peers.")
+    else:
+        st.warning(f"{flagged['Evaluator'].nunique()} evaluator(s) drift from their peers on {len(flagged)} parameter(s).")
+        st.dataframe(flagged, use_container_width=True, hide_index=True)
+    with st.expander("All evaluator statistics"):
+        st.dataframe(report, use_container_width=True, hide_index=True)
+    col1, col2 = st.columns(2)
+    evaluator = col1.selectbox("Evaluator", sorted(report["Evaluator"].unique()), key="calibration_evaluator")
+    param = col2.selectbox("Parameter", sorted(report.loc[report["Evaluator"] == evaluator, "Parameter"]), key="calibration_param")
+    index = get_calibration_index()
+    with index["lock"]:
+        hist = index["stats"][(evaluator, param)]["hist"].copy()
+    st.bar_chart(pd.DataFrame({"Scores": hist}, index=pd.Index(range(len(hist)), name="Score")))
+
+def _draft_path(evaluator_username, trainer_id, level):
+    return os.path.join(DRAFT_DIR, _file_slug(evaluator_username), f"{_file_slug(trainer_id)}__{_file_slug(level)}.jsonl")
+
+def _draft_lock(path):
+    """Per-journal lock: appends, compaction and the sync worker's read-to-marker span never interleave."""
+    return shared_state()["draft_locks"].setdefault(path, threading.Lock())
+
+def _append_draft_records(path, records):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _draft_lock(path), open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record, default=str) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_draft(path):
+    """Replay a draft journal into (widget state, course entries pending sync, last synced batch key, end offset).
+
+    A synced marker clears only the entries that start before its `through` byte offset, so entries appended
+    while their batch was being written stay pending. The end offset is where the next record will start.
+    """
+    widgets, entries, synced_key, offset = {}, [], None, 0
+    if not os.path.exists(path):
+        return widgets, {}, synced_key, offset
+    with open(path, "rb") as f:
+        for line in f:
+            start, offset = offset, offset + len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted append
+            if record["type"] == "widget":
+                widgets[record["key"]] = record["value"]
+            elif record["type"] == "entry":
+                entries.append((start, record["fields"]))
+            elif record["type"] == "synced":
+                through = record.get("through", start)
+                entries = [(at, fields) for at, fields in entries if at >= through]
+                synced_key = record["batch_key"]
+    pending = {}
+    for _, fields in entries:
+        pending.update(fields)
+    return widgets, pending, synced_key, offset
+
+def draft_offset(evaluator_username, trainer_id, level):
+    """Current end of a draft journal; entries journaled before it are covered by a save that starts now."""
+    path = _draft_path(evaluator_username, trainer_id, level)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def draft_widget_keys(level, trainer_id, evaluator_role):
+    """Session-state keys of every input on one level's form."""
+    rubric_level = RUBRIC_INDEX["levels"][level]
+    keys = [f"manager_referral_{level}_{trainer_id}"]
+    for i in range(1, rubric_level["courses"] + 1):
+        keys += [f"{prefix}_{level}_{i}_{trainer_id}" for prefix in
+                 ["course_select", "remarks", "status", "prev_status", "course_pass", "attempt", "total", "avg"]]
+        keys += [f"{param['key']}_{level}_{i}_{trainer_id}" for param in RUBRIC_INDEX["inputs_by_role"].get(evaluator_role, [])]
+    return keys
+
+def restore_draft(evaluator_username, trainer_id, level):
+    """Seed an empty form from the evaluator's durable draft, once per session, before its widgets render."""
+    restored_key = f"draft_restored_{level}_{trainer_id}"
+    if not trainer_id or st.session_state.get(restored_key):
+        return
+    st.session_state[restored_key] = True
+    widgets, _, _, _ = read_draft(_draft_path(evaluator_username, trainer_id, level))
+    for key, value in widgets.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+    st.session_state[f"draft_journaled_{level}_{trainer_id}"] = dict(widgets)
+    if widgets:
+        st.info(f"📝 Resumed your saved draft for {level}.")
+
+def journal_draft(evaluator_username, trainer_id, level, evaluator_role):
+    """Append the form inputs that changed since the last rerun to the draft journal."""
+    if not trainer_id:
+        return
+    journaled = st.session_state.setdefault(f"draft_journaled_{level}_{trainer_id}", {})
+    records = []
+    for key in draft_widget_keys(level, trainer_id, evaluator_role):
+        if key in st.session_state and journaled.get(key) != st.session_state[key]:
+            journaled[key] = st.session_state[key]
+            records.append({"type": "widget", "key": key, "value": st.session_state[key], "at": datetime.now().isoformat()})
+    if records:
+        _append_draft_records(_draft_path(evaluator_username, trainer_id, level), records)
+
+def queue_draft_entry(evaluator_username, trainer_id, level, fields):
+    """Queue store columns for the next batched sync instead of writing the assessment CSV now."""
+    _append_draft_records(_draft_path(evaluator_username, trainer_id, level),
+                          [{"type": "entry", "fields": fields, "at": datetime.now().isoformat()}])
+
+def mark_draft_synced(evaluator_username, trainer_id, level, through, batch_key="saved"):
+    """Drop pending entries journaled before `through` (already in the store) and compact the journal.
+
+    Entries appended after `through` are kept pending, re-based behind the marker of the compacted journal.
+    """
+    path = _draft_path(evaluator_username, trainer_id, level)
+    with _draft_lock(path):
+        widgets, _, _, _ = read_draft(path)
+        later = []
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                f.seek(through)
+                for line in f:
+                    try:
+                        if json.loads(line)["type"] == "entry":
+                            later.append(line)
+                    except ValueError:
+                        continue
+        tmp_file = f"{path}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_file, "wb") as f:
+            for key, value in widgets.items():
+                f.write((json.dumps({"type": "widget", "key": key, "value": value}, default=str) + "\n").encode())
+            f.write((json.dumps({"type": "synced", "batch_key": batch_key, "through": f.tell()}) + "\n").encode())
+            f.writelines(later)
+        os.replace(tmp_file, path)
+
+def discard_draft(evaluator_username, trainer_id, level):
+    path = _draft_path(evaluator_username, trainer_id, level)
+    with _draft_lock(path):
+        if os.path.exists(path):
+            os.remove(path)
+
+def sync_drafts():
+    """Fold every draft's pending course entries into the assessment store with one write."""
+    paths = sorted(os.path.join(root, name) for root, _, files in os.walk(DRAFT_DIR) for name in files if name.endswith(".jsonl"))
+    with contextlib.ExitStack() as held:
+        # Each journal stays locked from its read until its marker is appended, so no compaction moves the offsets
+        batches = []
+        for path in paths:
+            held.enter_context(_draft_lock(path))
+            _, pending, synced_key, through = read_draft(path)
+            if not pending:
+                continue
+            # Idempotency key of this batch: a re-run after a crash between the write and the marker is a no-op
+            batch_key = hashlib.sha256(json.dumps(pending, sort_keys=True, default=str).encode()).hexdigest()
+            if batch_key != synced_key:
+                batches.append((path, pending, batch_key, through))
+        if not batches:
+            return 0
+        with shared_lock("store_lock"):
+            updated_df = pd.read_csv(CSV_FILE) if os.path.exists(CSV_FILE) else pd.DataFrame(columns=CSV_COLUMNS)
+            changed_index = []
+            for _, pending, _, _ in batches:
+                idx = find_assessment_row(updated_df, pending.get("Trainer ID"), pending.get("Evaluator Username"), pending.get("Evaluator Role"))
+                if idx is not None:
+                    for key, value in pending.items():
+                        updated_df.at[idx, key] = value
+                else:
+                    updated_df = pd.concat([updated_df, pd.DataFrame([pending])], ignore_index=True)
+                    idx = updated_df.index[-1]
+                changed_index.append(idx)
+            save_assessment_data(updated_df, sorted(set(changed_index)))
+        for path, _, batch_key, through in batches:
+            with open(path, "a") as f:
+                f.write(json.dumps({"type": "synced", "batch_key": batch_key, "through": through, "at": datetime.now().isoformat()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+    logger.info(f"Synced {len(batches)} evaluator drafts in one store write")
+    return len(batches)
+
+def _draft_sync_loop():
+    while True:
+        time.sleep(DRAFT_SYNC_SECONDS)
+        try:
+            sync_drafts()
+        except Exception as e:
+            logger.error(f"Error syncing evaluator drafts: {str(e)}")
+
+@st.cache_resource(show_spinner=False)
+def start_draft_sync_worker():
+    worker = threading.Thread(target=_draft_sync_loop, name="draft-sync", daemon=True)
+    worker.start()
+    logger.info("Started evaluator draft sync worker")
+    return worker
+
+def load_change_log():
+    try:
+        if os.path.exists(CHANGE_LOG_FILE):
+            return pd.read_csv(CHANGE_LOG_FILE, dtype={"record_key": str})
+    except Exception as e:
+        logger.error(f"Error loading change log: {str(e)}")
+    return pd.DataFrame(columns=CHANGE_LOG_COLUMNS)
+
+def export_changes(store, since_seq=None, since_time=None):
+    """Return the rows of `store` changed after `since_seq` and/or `since_time`, plus delete and archive tombstones."""
+    seq_col, ts_col, key_cols = CHANGE_TRACKED_STORES[store]
+    store_df = pd.read_csv(store) if os.path.exists(store) else pd.DataFrame(columns=key_cols)
+    mask = pd.Series(True, index=store_df.index)
+    if since_seq is not None:
+        mask &= pd.to_numeric(store_df.get(seq_col, pd.Series(np.nan, index=store_df.index)), errors="coerce").fillna(0) > since_seq
+    if since_time is not None:
+        mask &= pd.to_datetime(store_df.get(ts_col, pd.Series(np.nan, index=store_df.index)), errors="coerce") > pd.Timestamp(since_time)
+    changed = store_df[mask].copy()
+    changed["Change Operation"] = "upsert"
+    if seq_col not in changed.columns:
+        changed[seq_col] = np.nan
+    deleted = change_tombstones(store, since_seq, since_time)
+    if not deleted.empty:
+        changed = pd.concat([changed, deleted], ignore_index=True)
+    changed[seq_col] = pd.to_numeric(changed[seq_col], errors="coerce").astype("Int64")
+    return changed.sort_values(seq_col).reset_index(drop=True)
+
+def change_tombstones(store, since_seq=None, since_time=None):
+    """Tombstones of rows removed from `store` (deleted, or moved to cold storage by the archive) from the change
+    log, split back into the store's key columns. "Change Operation" says which."""
+    seq_col, ts_col, key_cols = CHANGE_TRACKED_STORES[store]
+    log_df = load_change_log()
+    tombstones = log_df[(log_df["store"] == store) & log_df["operation"].isin(["delete", "archive"])]
+    if since_seq is not None:
+        tombstones = tombstones[tombstones["seq"] > since_seq]
+    if since_time is not None:
+        tombstones = tombstones[pd.to_datetime(tombstones["changed_at"], errors="coerce") > pd.Timestamp(since_time)]
+    if tombstones.empty:
+        return pd.DataFrame(columns=key_cols + [seq_col, ts_col, "Change Operation"])
+    deleted = tombstones["record_key"].str.split("|", expand=True)
+    deleted.columns = key_cols[:deleted.shape[1]]
+    deleted[seq_col] = tombstones["seq"].values
+    deleted[ts_col] = tombstones["changed_at"].values
+    deleted["Change Operation"] = tombstones["operation"].values
+    return deleted.reset_index(drop=True)
+
+@functools.lru_cache(maxsize=None)
+def compile_report_template(name):
+    template = REPORT_TEMPLATES[name]
+    weights = [weight for _, _, weight in template["columns"]]
+    return {
+        "title": template["title"],
+        "columns": [col for col, _, _ in template["columns"]],
+        "headers": [header for _, header, _ in template["columns"]],
+        "width_fractions": [weight / sum(weights) for weight in weights],
+        "latex_spec": " ".join("l" for _ in weights),
+        "style": TableStyle([
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0FA753")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("LINEBELOW", (0, 0), (-1, 0), 0.75, colors.black),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f0f2f6")]),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]),
+    }
+
+def format_report_rows(df, compiled):
+    """Format a frame column-by-column into the template's string cells."""
+    frame = df.reindex(columns=compiled["columns"])
+    cells = {}
+    for col in compiled["columns"]:
+        values = frame[col]
+        if isinstance(values.dtype, pd.SparseDtype):
+            values = values.sparse.to_dense()
+        if pd.api.types.is_datetime64_any_dtype(values):
+            cells[col] = values.dt.strftime("%Y-%m-%d").fillna("")
+        else:
+            cells[col] = values.astype(object).where(values.notna(), "").astype(str)
+    return pd.DataFrame(cells, index=frame.index, columns=compiled["columns"])
+
+def build_pdf_report(title, subtitle, sections, pagesize=A4):
+    """Render (template name, frame) sections as paginated platypus tables and return the PDF bytes."""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=pagesize, leftMargin=36, rightMargin=36, topMargin=36, bottomMargin=36)
+    styles = getSampleStyleSheet()
+    # Paragraph text is parsed as markup, so names containing & or < must be escaped
+    story = [Paragraph(xml_escape(title), styles["Title"]), Paragraph(xml_escape(subtitle), styles["Normal"]), Spacer(1, 12)]
+    for name, df, heading in sections:
+        compiled = compile_report_template(name)
+        col_widths = [fraction * doc.width for fraction in compiled["width_fractions"]]
+        story.append(Paragraph(xml_escape(heading or compiled["title"]), styles["Heading2"]))
+        # Fixed-size chunks keep table layout linear instead of re-splitting one huge table per page,
+        # and each chunk is formatted on its own so no full-size string copy of the frame is built
+        for start in range(0, max(len(df), 1), REPORT_ROWS_PER_TABLE):
+            chunk = format_report_rows(df.iloc[start:start + REPORT_ROWS_PER_TABLE], compiled).to_numpy().tolist()
+            table = Table([compiled["headers"]] + chunk, colWidths=col_widths, repeatRows=1)
+            table.setStyle(compiled["style"])
+            story.append(table)
+        story.append(Spacer(1, 12))
+    doc.build(story)
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    return pdf_data
+
+LATEX_ESCAPES = {"\\": r"\textbackslash{}", "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_",
+                 "{": r"\{", "}": r"\}", "~": r"\textasciitilde{}", "^": r"\textasciicircum{}"}
+
+def _latex_escape(values):
+    # One pass, so the braces of \textbackslash{} are not escaped again by a later replacement
+    return values.str.replace(r"[\\&%$#_{}~^]", lambda match: LATEX_ESCAPES[match.group(0)], regex=True)
+
+def write_latex_report(out, title, subtitle, sections, chunk_size=1000):
+    """Stream (template name, frame) sections into `out` using the longtable layout of report.tex."""
+    out.write("\\documentclass{article}\n\\usepackage[utf8]{inputenc}\n\\usepackage{geometry}\n"
+              "\\geometry{a4paper, margin=1in}\n\\usepackage{longtable}\n\\usepackage{booktabs}\n\n"
+              "\\begin{document}\n\n")
+    title, subtitle = _latex_escape(pd.Series([title, subtitle]))
+    out.write(f"\\section*{{{title}}}\n\\subsection*{{{subtitle}}}\n\n")
+    for name, df, heading in sections:
+        compiled = compile_report_template(name)
+        headers = _latex_escape(pd.Series(compiled["headers"]))
+        heading = _latex_escape(pd.Series([heading or compiled["title"]])).iloc[0]
+        out.write(f"\\subsubsection*{{{heading}}}\n\\begin{{longtable}}{{{compiled['latex_spec']}}}\n")
+        out.write("\\toprule\n" + " & ".join(headers) + " \\\\\n\\midrule\n")
+        for start in range(0, len(df), chunk_size):
+            rows = format_report_rows(df.iloc[start:start + chunk_size], compiled).apply(_latex_escape)
+            out.write("\n".join(rows.agg(" & ".join, axis=1) + " \\\\") + "\n")
+        out.write("\\bottomrule\n\\end{longtable}\n\n")
+    out.write("\\end{document}\n")
+
+def level_course_frame(record, level):
+    names = RUBRIC_INDEX["levels"][level]["names"]
+    return pd.DataFrame({
+        "Course": names["course"],
+        "Name": [record.get(col, "") for col in names["course"]],
+        "STATUS": [record.get(col, "") for col in names["status"]],
+        "Remarks": [record.get(col, "") for col in names["remarks"]],
+    })
+
+def build_trainer_report_sections(trainer_report):
+    sections = [("trainer_levels", trainer_report, None)]
+    if not trainer_report.empty:
+        latest = trainer_report.iloc[-1]
+        for level in LEVELS:
+            sections.append(("level_courses", level_course_frame(latest, level), f"{level} Courses"))
+    return sections
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def render_admin_report(evaluators_version, trainers_version):
+    """PDF and LaTeX bytes of the evaluator/trainer report, rendered once per store version.
+
+    The bytes are reused until a store changes, so the subtitle gives the time of the data, not of the render.
+    """
+    report_sections = build_admin_report_sections(load_evaluators())
+    report_subtitle = admin_report_subtitle(evaluators_version, trainers_version)
+    pdf_data = build_pdf_report("Evaluator and Trainer Report", report_subtitle, report_sections)
+    latex_buffer = StringIO()
+    write_latex_report(latex_buffer, "Evaluator and Trainer Report", report_subtitle, report_sections)
+    return pdf_data, latex_buffer.getvalue()
+
+def admin_report_subtitle(evaluators_version=None, trainers_version=None):
+    """Subtitle dating the admin report by the latest change to the evaluator and trainer stores, for every path
+    that renders it (cached download, background job, CLI)."""
+    versions = [evaluators_version or store_version(EVALUATOR_STORE), trainers_version or store_version(DEFAULT_DATA_FILE)]
+    # store_version is (mtime_ns, size); (0, 0) for a missing store
+    modified_ns = max(version[0] for version in versions)
+    data_time = datetime.fromtimestamp(modified_ns / 1e9) if modified_ns else datetime.now()
+    return f"Data as of: {data_time.strftime('%d-%m-%Y %I:%M %p IST')}"
+
+def build_admin_report_sections(evaluators_df):
+    trainers_df = pd.read_csv(DEFAULT_DATA_FILE) if os.path.exists(DEFAULT_DATA_FILE) else pd.DataFrame(columns=TRAINER_INPUT_COLUMNS)
+    return [("evaluators", evaluators_df, None), ("trainers", trainers_df, None)]
+
+class JobCancelled(Exception):
+    pass
+
+def _job_path(job_id, name="job.json"):
+    return os.path.join(JOB_DIR, job_id, name)
+
+def _write_job(job):
+    job["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    os.makedirs(os.path.dirname(_job_path(job["job_id"])), exist_ok=True)
+    tmp_file = _job_path(job["job_id"], "job.json.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(job, f, default=str)
+    os.replace(tmp_file, _job_path(job["job_id"]))
+
+def load_job(job_id):
+    with open(_job_path(job_id), "r") as f:
+        return json.load(f)
+
+def load_jobs():
+    """The job table: one JSON record per job directory, newest first."""
+    records = []
+    if os.path.isdir(JOB_DIR):
+        for job_id in os.listdir(JOB_DIR):
+            try:
+                records.append(load_job(job_id))
+            except (OSError, ValueError):
+                continue  # a job directory still being created
+    jobs = pd.DataFrame(records, columns=JOB_COLUMNS + ["params", "seq_before"])
+    return jobs.sort_values("created_at", ascending=False, kind="stable").reset_index(drop=True)
+
+def report_job_progress(job_id, fraction, message):
+    """Record progress from inside a running job; raises JobCancelled once a cancel was requested."""
+    if os.path.exists(_job_path(job_id, "cancel")):
+        raise JobCancelled()
+    job = load_job(job_id)
+    job.update(progress=round(float(fraction), 3), message=message)
+    _write_job(job)
+
+def _zip_result(job_id, files):
+    result_file = _job_path(job_id, "result.zip")
+    with zipfile.ZipFile(result_file, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return result_file
+
+def job_admin_report(job_id, params):
+    report_job_progress(job_id, 0.1, "Collecting evaluators and trainers")
+    report_sections = build_admin_report_sections(load_evaluators())
+    report_subtitle = admin_report_subtitle()
+    report_job_progress(job_id, 0.4, "Rendering PDF")
+    pdf_data = build_pdf_report("Evaluator and Trainer Report", report_subtitle, report_sections)
+    report_job_progress(job_id, 0.8, "Rendering LaTeX")
+    latex_buffer = StringIO()
+    write_latex_report(latex_buffer, "Evaluator and Trainer Report", report_subtitle, report_sections)
+    return _zip_result(job_id, {"evaluators_trainers_report.pdf": pdf_data, "evaluators_trainers_report.tex": latex_buffer.getvalue()})
+
+def job_bulk_export(job_id, params):
+    files = {}
+    stores = [CSV_FILE, DEFAULT_DATA_FILE, EVALUATOR_STORE, CHANGE_LOG_FILE, HISTORY_FILE]
+    for n, store in enumerate(stores):
+        report_job_progress(job_id, n / len(stores), f"Exporting {store}")
+        if os.path.exists(store):
+            store_df = pd.read_csv(store)
+            if store == EVALUATOR_STORE:
+                store_df = store_df.drop(columns=["password_hash"], errors="ignore")
+            files[store] = store_df.to_csv(index=False)
+    return _zip_result(job_id, files)
+
+def score_block_levels(df):
+    """Level each row's `{param} Course :{i}` score block belongs to, or None for rows with no level assessed.
+
+    The store keeps a single score block per row, which Save and Submit overwrite for the level being assessed.
+    Levels open in order, so the block holds the highest level with a course name filled in; the course totals
+    of lower levels were computed from scores that have since been overwritten.
+    """
+    owner = pd.Series(None, index=df.index, dtype=object)
+    for level, compiled in RUBRIC_INDEX["levels"].items():
+        owner[course_names_filled(df, level).any(axis=1)] = level
+    return owner
+
+def course_names_filled(df, level):
+    """Boolean (rows x courses) array: which course slots of `level` have a course name selected."""
+    names = df.reindex(columns=RUBRIC_INDEX["levels"][level]["names"]["course"]).astype(object)
+    text = names.where(names.notna(), "").astype(str).apply(lambda col: col.str.strip())
+    return (~text.isin(["", "No data entered"])).to_numpy()
+
+def recalculate_scores(df, progress=None, courses=None):
+    """Recompute course and level TOTAL/AVERAGE in place from the stored parameter scores, by compiled column position.
+
+    Only the level that owns each row's score block (score_block_levels) is recalculated, and within it only
+    courses that have a name and a non-zero score; everything else is left as stored. The level TOTAL/AVERAGE is
+    only rewritten for a submitted level whose every course is scored. `courses` ({row label: course numbers})
+    limits the pass to those courses of those rows. Values within rounding of the stored figure are not
+    rewritten, so a second pass over its own output changes nothing.
+
+    `df` must have the store layout (CSV_COLUMNS first). Returns the boolean mask of rows that changed.
+    """
+    values = df.iloc[:, :len(CSV_COLUMNS)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    roles = df["Evaluator Role"].astype(object).fillna("").astype(str).to_numpy()
+    owners = score_block_levels(df).to_numpy()
+    selected = np.ones(len(df), dtype=bool)
+    if courses is not None:
+        selected = df.index.isin(list(courses))
+    changed = np.zeros(len(df), dtype=bool)
+    for n, (level, compiled) in enumerate(RUBRIC_INDEX["levels"].items()):
+        if progress:
+            progress(n / len(RUBRIC_INDEX["levels"]), f"Recalculating {level}")
+        positions = compiled["positions"]
+        named = course_names_filled(df, level)
+        submitted = df[level].isin(STATUS_DOMAINS["level"]).to_numpy()
+        for role, score_positions in compiled["score_positions"].items():
+            rows = np.flatnonzero((roles == role) & (owners == level) & selected)
+            if rows.size == 0:
+                continue
+            scores = values[np.ix_(rows, score_positions.ravel())].reshape(rows.size, *score_positions.shape)
+            scored = named[rows] & (np.nan_to_num(scores) > 0).any(axis=2)
+            totals = np.nansum(scores, axis=2)
+            averages = totals / score_positions.shape[1]
+            allowed = scored
+            if courses is not None:
+                wanted = np.zeros_like(scored)
+                for r, label in enumerate(df.index[rows]):
+                    wanted[r, [course - 1 for course in courses[label] if 0 < course <= compiled["courses"]]] = True
+                allowed = scored & wanted
+            for field, recalculated in [("total", totals), ("average", averages)]:
+                current = values[np.ix_(rows, positions[field])]
+                # The store is written with two decimals
+                differs = allowed & ~np.isclose(current, recalculated, rtol=0, atol=0.005)
+                for r, c in zip(*np.nonzero(differs)):
+                    df.iat[rows[r], positions[field][c]] = round(float(recalculated[r, c]), 2)
+                changed[rows] |= differs.any(axis=1)
+            # Level figures follow Submit Evaluation: sum of course totals over (courses x parameters)
+            complete = submitted[rows] & scored.all(axis=1)
+            level_total = totals.sum(axis=1)
+            level_average = level_total / score_positions.size
+            for column, recalculated in [(f"{level} TOTAL", level_total), (f"{level} AVERAGE", level_average)]:
+                col = CSV_COLUMNS.index(column)
+                differs = complete & ~np.isclose(values[rows, col], recalculated, rtol=0, atol=0.005)
+                df.iloc[rows[differs], col] = np.round(recalculated[differs], 2)
+                changed[rows[differs]] = True
+    return changed
+
+def job_recalculate_scores(job_id, params):
+    with shared_lock("store_lock"):
+        df = pd.read_csv(CSV_FILE)
+        df = df.reindex(columns=CSV_COLUMNS + [col for col in df.columns if col not in CSV_COLUMNS])
+        changed = recalculate_scores(df, functools.partial(report_job_progress, job_id))
+        if recalculate_scores(df.copy()).any():
+            raise ValueError("Recalculation is not stable on its own output; nothing was written")
+        report_job_progress(job_id, 0.95, f"Writing {int(changed.sum())} recalculated rows")
+        save_assessment_data(df, df.index[changed].tolist(), float_format='%.2f')
+    return None
+
+def job_rebuild_derived(job_id, params):
+    report_job_progress(job_id, 0.1, "Compacting assessment rows")
+    compact_assessment_data()
+    for n, store in enumerate([CSV_FILE, DEFAULT_DATA_FILE]):
+        report_job_progress(job_id, 0.3 + 0.3 * n, f"Rebuilding branch partitions for {store}")
+        rebuild_partitions(store)
+    report_job_progress(job_id, 0.9, "Publishing viewer snapshot")
+    publish_viewer_snapshot(rerender_all=True)
+    return None
+
+def job_archive_closed(job_id, params):
+    max_age_days = int(params.get("max_age_days", ARCHIVE_AFTER_DAYS))
+    report_job_progress(job_id, 0.1, f"Archiving trainers fully qualified and idle for {max_age_days} days")
+    archived = archive_closed_assessments(max_age_days)
+    report_job_progress(job_id, 0.9, f"Archived {archived} rows")
+    return None
+
+def _load_certificate_cursor():
+    if os.path.exists(CERTIFICATE_CURSOR):
+        with open(CERTIFICATE_CURSOR, "r") as f:
+            return json.load(f).get("seq")
+    return None
+
+def _save_certificate_cursor(seq):
+    os.makedirs(CERTIFICATE_DIR, exist_ok=True)
+    with open(f"{CERTIFICATE_CURSOR}.tmp", "w") as f:
+        json.dump({"seq": int(seq), "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}, f)
+    os.replace(f"{CERTIFICATE_CURSOR}.tmp", CERTIFICATE_CURSOR)
+
+def pending_certificates(since_seq=None):
+    """Trainer-levels marked QUALIFIED whose score cards are not sent yet, among rows changed after `since_seq`.
+
+    Without a cursor (first run) the whole store is scanned. Trainer-levels already in the issue log are skipped,
+    so a row whose sent mark was overwritten does not get a second certificate.
+    """
+    rows = export_changes(CSV_FILE, since_seq=since_seq)
+    rows = rows[rows["Change Operation"] == "upsert"].reindex(columns=CSV_COLUMNS)
+    pending = []
+    for level in LEVELS:
+        status = rows[f"{level} Score Card Status"].astype(object).fillna("")
+        qualified = rows[(rows[level] == "QUALIFIED") & (status != "Score Cards has been sent")]
+        if qualified.empty:
+            continue
+        qualified = qualified.assign(level=level, qualified_on=qualified["Last Modified"].fillna(qualified["Date of assessment"]))
+        pending.append(qualified[["Trainer ID", "Trainer Name", "Department", "Branch", "level", "qualified_on"]])
+    if not pending:
+        return pd.DataFrame(columns=["Trainer ID", "Trainer Name", "Department", "Branch", "level", "qualified_on"])
+    pending = pd.concat(pending, ignore_index=True).astype(object).where(lambda frame: frame.notna(), "")
+    if os.path.exists(CERTIFICATE_LOG):
+        issued = pd.read_csv(CERTIFICATE_LOG, usecols=["Trainer ID", "level"], dtype=str)
+        already = pd.MultiIndex.from_frame(issued)
+        pending = pending[~pd.MultiIndex.from_frame(pending[["Trainer ID", "level"]].astype(str)).isin(already)]
+    # One certificate per trainer-level, however many evaluator rows agree on it
+    return pending.sort_values("qualified_on").drop_duplicates(["Trainer ID", "level"], keep="last").reset_index(drop=True)
+
+@functools.lru_cache(maxsize=1)
+def _certificate_template(logo_version):
+    """Rasterize the logo once per process: flattened onto white at print size and saved as a JPEG that
+    reportlab embeds as-is, instead of decoding and re-compressing the RGBA PNG on every certificate."""
+    from PIL import Image
+    if not os.path.exists(CERTIFICATE_LOGO):
+        return None
+    logo = Image.open(CERTIFICATE_LOGO).convert("RGBA")
+    height = min(int(CERTIFICATE_LOGO_HEIGHT * CERTIFICATE_TEMPLATE_DPI / 72), logo.height)
+    logo = logo.resize((int(logo.width * height / logo.height), height), Image.LANCZOS)
+    flattened = Image.new("RGB", logo.size, "white")
+    flattened.paste(logo, mask=logo)
+    template_file = os.path.join(CERTIFICATE_DIR, "template", f"logo_{logo_version[0]}_{CERTIFICATE_TEMPLATE_DPI}.jpg")
+    if not os.path.exists(template_file):
+        os.makedirs(os.path.dirname(template_file), exist_ok=True)
+        flattened.save(f"{template_file}.{os.getpid()}.tmp", format="JPEG", quality=92)
+        os.replace(f"{template_file}.{os.getpid()}.tmp", template_file)
+    return template_file, CERTIFICATE_LOGO_HEIGHT * logo.width / logo.height
+
+def _render_certificate_batch(records, out_dir):
+    """Render one PDF per (trainer, level) record into `out_dir`; runs in a pool worker. Returns the file paths."""
+    from reportlab import rl_config
+    template = _certificate_template(store_version(CERTIFICATE_LOGO))
+    page_width, page_height = landscape(A4)
+    files = []
+    # Embed the JPEG as a binary stream; without the C accelerator, ASCII85-encoding it dominated render time
+    use_a85, rl_config.useA85 = rl_config.useA85, 0
+    try:
+        for record in records:
+            files.append(_render_certificate(record, out_dir, template, page_width, page_height))
+    finally:
+        rl_config.useA85 = use_a85
+    return files
+
+def _render_certificate(record, out_dir, template, page_width, page_height):
+    file_path = os.path.join(out_dir, f"{_file_slug(record['Trainer ID'])}_{_file_slug(record['level'])}.pdf")
+    pdf = canvas.Canvas(file_path, pagesize=landscape(A4))
+    pdf.setTitle(f"{record['level']} Certificate - {record['Trainer Name']}")
+    pdf.setStrokeColor(colors.HexColor("#0FA753"))
+    for inset, width in [(18, 3), (30, 1)]:
+        pdf.setLineWidth(width)
+        pdf.rect(inset, inset, page_width - 2 * inset, page_height - 2 * inset)
+    if template:
+        logo_file, logo_width = template
+        pdf.drawImage(logo_file, (page_width - logo_width) / 2, page_height - 48 - CERTIFICATE_LOGO_HEIGHT,
+                      width=logo_width, height=CERTIFICATE_LOGO_HEIGHT)
+    pdf.setFillColor(colors.HexColor("#0FA753"))
+    pdf.setFont("Helvetica-Bold", 30)
+    pdf.drawCentredString(page_width / 2, page_height - 170, "Certificate of Qualification")
+    pdf.setFillColor(colors.black)
+    pdf.setFont("Helvetica", 14)
+    pdf.drawCentredString(page_width / 2, page_height - 215, "This is to certify that")
+    pdf.setFont("Helvetica-Bold", 26)
+    pdf.drawCentredString(page_width / 2, page_height - 255, str(record["Trainer Name"]) or str(record["Trainer ID"]))
+    pdf.setFont("Helvetica", 14)
+    pdf.drawCentredString(page_width / 2, page_height - 290, f"({record['Trainer ID']}, {record['Department'] or '-'}, {record['Branch'] or '-'})")
+    pdf.drawCentredString(page_width / 2, page_height - 325, f"has qualified {record['level']} of the OMOTEC trainer assessment")
+    pdf.setFont("Helvetica", 11)
+    pdf.drawString(72, 72, f"Qualified on: {str(record['qualified_on'])[:10] or '-'}")
+    pdf.drawRightString(page_width - 72, 72, f"Issued on: {datetime.now().strftime('%d-%m-%Y')}")
+    pdf.showPage()
+    pdf.save()
+    return file_path
+
+def mark_score_cards_sent(issued):
+    """Set `LEVEL #n Score Card Status` to sent on every row of each issued trainer-level that is still QUALIFIED."""
+    with shared_lock("store_lock"):
+        df = pd.read_csv(CSV_FILE)
+        df = df.reindex(columns=CSV_COLUMNS + [col for col in df.columns if col not in CSV_COLUMNS])
+        trainer_ids = df["Trainer ID"].astype(str)
+        changed = []
+        for level, level_issued in issued.groupby("level"):
+            status_col = f"{level} Score Card Status"
+            rows = df.index[trainer_ids.isin(level_issued["Trainer ID"].astype(str)) & (df[level] == "QUALIFIED")
+                            & (df[status_col].astype(object).fillna("") != "Score Cards has been sent")]
+            if df[status_col].dtype != object:
+                df[status_col] = df[status_col].astype(object)
+            df.loc[rows, status_col] = "Score Cards has been sent"
+            changed += rows.tolist()
+        if changed:
+            save_assessment_data(df, changed, float_format='%.2f')
+    return len(set(changed))
+
+def generate_certificates(workers=CERTIFICATE_WORKERS, batch_size=CERTIFICATE_BATCH_SIZE, progress=None):
+    """Issue certificates for trainer-levels newly QUALIFIED since the last run, in parallel batches.
+
+    Returns (run directory, issued frame). The cursor only advances once the score cards are marked sent.
+    """
+    seq_now = current_change_seq()
+    pending = pending_certificates(_load_certificate_cursor())
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+    out_dir = os.path.join(CERTIFICATE_DIR, run_id)
+    if pending.empty:
+        _save_certificate_cursor(seq_now)
+        return out_dir, pending.assign(file=pd.Series(dtype=object))
+    os.makedirs(out_dir, exist_ok=True)
+    records = pending.to_dict("records")
+    batches = [records[start:start + batch_size] for start in range(0, len(records), batch_size)]
+    files = []
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=multiprocessing.get_context("spawn")) as pool:
+            for n, batch_files in enumerate(pool.map(_worker_module()._render_certificate_batch, batches, [out_dir] * len(batches))):
+                files += batch_files
+                if progress:
+                    progress(0.9 * (n + 1) / len(batches), f"Rendered {len(files)} of {len(records)} certificates")
+    else:
+        for n, batch in enumerate(batches):
+            files += _render_certificate_batch(batch, out_dir)
+            if progress:
+                progress(0.9 * (n + 1) / len(batches), f"Rendered {len(files)} of {len(records)} certificates")
+    issued = pending.assign(file=files)
+    marked = mark_score_cards_sent(issued)
+    log = issued.assign(run_id=run_id, issued_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))[CERTIFICATE_LOG_COLUMNS]
+    log.to_csv(CERTIFICATE_LOG, mode="a", index=False, header=not os.path.exists(CERTIFICATE_LOG))
+    _save_certificate_cursor(seq_now)
+    logger.info(f"Issued {len(issued)} certificates in run {run_id}; marked {marked} rows as sent")
+    return out_dir, issued
+
+def job_certificates(job_id, params):
+    report_job_progress(job_id, 0.05, "Finding newly qualified trainer levels")
+    out_dir, issued = generate_certificates(int(params.get("workers", CERTIFICATE_WORKERS)),
+                                            progress=functools.partial(report_job_progress, job_id))
+    if issued.empty:
+        report_job_progress(job_id, 0.95, "No newly qualified trainer levels")
+        return None
+    report_job_progress(job_id, 0.95, f"Packaging {len(issued)} certificates")
+    files = {}
+    for file_path in issued["file"]:
+        with open(file_path, "rb") as f:
+            files[os.path.basename(file_path)] = f.read()
+    return _zip_result(job_id, files)
+
+def show_certificates():
+    pending = pending_certificates(_load_certificate_cursor())
+    st.caption(f"{len(pending)} newly qualified trainer levels are waiting for certificates.")
+    if not pending.empty:
+        st.dataframe(pending, use_container_width=True, hide_index=True)
+    if st.button("Generate Certificates", key="generate_certificates", disabled=pending.empty):
+        job_id = submit_job("certificates", submitted_by=st.session_state.get("logged_user", ""))
+        st.success(f"Job {job_id} queued. Download the certificates from Background Jobs when it finishes.")
+    if os.path.exists(CERTIFICATE_LOG):
+        issued = pd.read_csv(CERTIFICATE_LOG, dtype={"run_id": str, "Trainer ID": str})
+        st.markdown(f"**Recently issued** ({len(issued)} in total)")
+        st.dataframe(issued.tail(50).iloc[::-1], use_container_width=True, hide_index=True)
+
+# Job kind -> (label, function, writes the assessment store)
+JOB_KINDS = {
+    "admin_report": ("Evaluators/Trainers report (PDF + LaTeX)", job_admin_report, False),
+    "bulk_export": ("Export all stores (ZIP)", job_bulk_export, False),
+    "recalculate_scores": ("Recalculate course and level scores", job_recalculate_scores, True),
+    "rebuild_derived": ("Rebuild partitions, compaction and snapshot", job_rebuild_derived, True),
+    "archive_closed": ("Archive closed trainers to cold storage", job_archive_closed, True),
+    "certificates": ("Certificates for newly qualified trainers (ZIP)", job_certificates, True),
+}
+
+def _execute_job(job_id):
+    """Entry point in the worker process."""
+    job = load_job(job_id)
+    if os.path.exists(_job_path(job_id, "cancel")):
+        job.update(status="cancelled", message="Cancelled before start")
+        _write_job(job)
+        return job_id
+    job.update(status="running", progress=0.0, message="Started", seq_before=current_change_seq())
+    _write_job(job)
+    try:
+        result_file = JOB_KINDS[job["kind"]][1](job_id, job.get("params") or {})
+        job = load_job(job_id)
+        job.update(status="done", progress=1.0, message="Finished", result_file=result_file or "")
+    except JobCancelled:
+        job = load_job(job_id)
+        job.update(status="cancelled", message="Cancelled")
+    except Exception as e:
+        logger.error(f"Error running job {job_id}: {str(e)}")
+        job = load_job(job_id)
+        job.update(status="failed", message=str(e))
+    _write_job(job)
+    return job_id
+
+def _on_job_finished(future):
+    """Runs in the app process: pass rows a job wrote to this process's write listeners."""
+    try:
+        job = load_job(future.result())
+        if job["status"] == "done" and JOB_KINDS[job["kind"]][2]:
+            for store in (CSV_FILE, DEFAULT_DATA_FILE):
+                notify_external_writes(store)
+    except Exception as e:
+        logger.error(f"Error finishing job: {str(e)}")
+
+def _worker_module():
+    # Spawned workers import this file as a module, so work must be submitted through the module object
+    return importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+
+@st.cache_resource(show_spinner=False)
+def get_job_executor():
+    module = _worker_module()
+    executor = ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    # Jobs queued or running when the server last stopped are started again
+    for job_id in load_jobs().query("status in ['queued', 'running']")["job_id"]:
+        executor.submit(module._execute_job, job_id).add_done_callback(_on_job_finished)
+    return executor, module
+
+def submit_job(kind, params=None, submitted_by=""):
+    job_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    _write_job({"job_id": job_id, "kind": kind, "status": "queued", "progress": 0.0, "message": "Queued",
+                "submitted_by": submitted_by, "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "result_file": "", "params": params or {}, "seq_before": None})
+    executor, module = get_job_executor()
+    executor.submit(module._execute_job, job_id).add_done_callback(_on_job_finished)
+    return job_id
+
+def cancel_job(job_id):
+    with open(_job_path(job_id, "cancel"), "w") as f:
+        f.write(datetime.now().isoformat())
+
+def show_jobs_panel():
+    st.markdown("### ⚙️ Background Jobs")
+    kind = st.selectbox("Job", list(JOB_KINDS.keys()), format_func=lambda k: JOB_KINDS[k][0], key="job_kind")
+    if st.button("Start Job", key="start_job"):
+        job_id = submit_job(kind, submitted_by=st.session_state.get("logged_user", ""))
+        st.success(f"Job {job_id} queued. It keeps running if you leave this page.")
+    jobs = load_jobs()
+    if jobs.empty:
+        st.info("No jobs have been run yet.")
+        return
+    for _, job in jobs.head(20).iterrows():
+        with st.container(border=True):
+            cols = st.columns([3, 2, 1])
+            cols[0].markdown(f"**{JOB_KINDS.get(job['kind'], (job['kind'],))[0]}**  \n`{job['job_id']}` · {job['submitted_by'] or '-'} · {job['created_at']}")
+            cols[1].progress(float(job["progress"] or 0.0), text=f"{job['status']}: {job['message']}")
+            if job["status"] in ("queued", "running"):
+                if cols[2].button("Cancel", key=f"cancel_job_{job['job_id']}"):
+                    cancel_job(job["job_id"])
+                    st.rerun()
+            elif job["status"] == "done" and job["result_file"] and os.path.exists(job["result_file"]):
+                with open(job["result_file"], "rb") as f:
+                    cols[2].download_button("Download", f.read(), file_name=f"{job['kind']}_{job['job_id']}.zip",
+                                            mime="application/zip", key=f"download_job_{job['job_id']}")
+    if st.button("🔄 Refresh Jobs", key="refresh_jobs"):
+        st.rerun()
+
+def _validate_chunk(chunk, known_trainers):
+    """Check one slice of the store (read as text) against every rule; runs in a pool worker."""
+    found = []
+    trainer_ids = chunk["Trainer ID"].fillna("").str.strip()
+
+    def add(rule, index, column, values, fixes, message):
+        if len(index):
+            found.append(pd.DataFrame({"rule": rule, "severity": VALIDATION_RULES[rule][0], "row": np.asarray(index),
+                                       "trainer_id": trainer_ids.loc[index].to_numpy(), "column": column,
+                                       "value": values, "fix": fixes, "message": message}))
+
+    for col in DATE_COLUMNS:
+        text = chunk[col].dropna().str.strip()
+        text = text[(text != "") & (text != "No data entered")]
+        bad = text[pd.to_datetime(text, format="%Y-%m-%d", errors="coerce").isna()]
+        # The fix is the reading normalize_dates already gives the value; unreadable dates get none
+        add("date_format", bad.index, col, bad.to_numpy(), normalize_dates(bad).dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+            "Not a valid YYYY-MM-DD date")
+
+    for param, maximum in PARAM_MAX_SCORES.items():
+        columns = [param] + [f"{param} Course :{i}" for i in range(1, MAX_COURSES + 1)]
+        scores = chunk[columns].apply(pd.to_numeric, errors="coerce")
+        bad = scores.where((scores > maximum) | (scores < 0)).stack()
+        add("score_range", bad.index.get_level_values(0), bad.index.get_level_values(1), bad.to_numpy(),
+            bad.clip(0, maximum).to_numpy(), f"Score outside 0-{maximum}")
+
+    for level, compiled in RUBRIC_INDEX["levels"].items():
+        stated_level = chunk[level].fillna("")
+        cleared = chunk[list(compiled["names"]["status"])].isin(["CLEARED", "QUALIFIED"]).all(axis=1)
+        uncleared = (stated_level == "QUALIFIED") & ~cleared
+        add("level_status", chunk.index[uncleared], level, "QUALIFIED", "NOT QUALIFIED",
+            "Level is QUALIFIED but not every course is cleared")
+        # Compared against the level as it will read once the fix above is applied
+        level_after = stated_level.mask(uncleared, "NOT QUALIFIED")
+        status = chunk[f"{level} STATUS"].fillna("")
+        disagree = chunk.index[(status != "") & (level_after != "") & (status != level_after)]
+        add("level_status", disagree, f"{level} STATUS", status[disagree].to_numpy(), level_after[disagree].to_numpy(),
+            f"{level} STATUS disagrees with {level}")
+
+    add("missing_trainer_id", chunk.index[trainer_ids == ""], "Trainer ID", "", None, "Row has no Trainer ID")
+    present = trainer_ids[trainer_ids != ""]
+    odd = present[~present.str.match(TRAINER_ID_PATTERN)]
+    add("trainer_id_format", odd.index, "Trainer ID", odd.to_numpy(), None, "Trainer ID does not follow the TR<number> scheme")
+    orphans = present[~present.isin(known_trainers)]
+    add("orphan_trainer", orphans.index, "Trainer ID", orphans.to_numpy(), chunk.loc[orphans.index, "Trainer Name"].to_numpy(),
+        "Trainer is missing from EVALUATOR_INPUT.csv")
+    return pd.concat(found, ignore_index=True) if found else pd.DataFrame(columns=VALIDATION_COLUMNS)
+
+def validate_store(workers=VALIDATION_WORKERS, chunk_rows=VALIDATION_CHUNK_ROWS):
+    """Check the assessment store in row chunks across a process pool and return the violation report.
+
+    The store is parsed once, in this process, and each chunk is shipped to a worker; at most two chunks per
+    worker are in flight so memory stays bounded by the chunk size.
+    """
+    started = time.perf_counter()
+    if not os.path.exists(CSV_FILE):
+        return pd.DataFrame(columns=VALIDATION_COLUMNS)
+    known = frozenset()
+    if os.path.exists(DEFAULT_DATA_FILE):
+        known = frozenset(pd.read_csv(DEFAULT_DATA_FILE, usecols=["Trainer ID"], dtype=str)["Trainer ID"].dropna().str.strip())
+    chunks = (chunk.reindex(columns=CSV_COLUMNS) for chunk in pd.read_csv(CSV_FILE, dtype=str, chunksize=chunk_rows))
+    head = list(itertools.islice(chunks, 2))
+    chunks = itertools.chain(head, chunks)
+    row_count = chunk_count = 0
+    parts = []
+    if workers > 1 and len(head) > 1:
+        module = _worker_module()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            in_flight = []
+            for chunk in chunks:
+                row_count, chunk_count = row_count + len(chunk), chunk_count + 1
+                in_flight.append(pool.submit(module._validate_chunk, chunk, known))
+                if len(in_flight) >= 2 * workers:
+                    parts.append(in_flight.pop(0).result())
+            parts.extend(future.result() for future in in_flight)
+    else:
+        for chunk in chunks:
+            row_count, chunk_count = row_count + len(chunk), chunk_count + 1
+            parts.append(_validate_chunk(chunk, known))
+    parts = [part for part in parts if not part.empty]
+    report = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=VALIDATION_COLUMNS)
+    logger.info(f"Validated {row_count} rows in {chunk_count} chunks in {time.perf_counter() - started:.2f}s: {len(report)} violations")
+    return report
+
+def _cell_matches(current, reported):
+    if pd.isna(current) or str(current) == "":
+        return pd.isna(reported) or str(reported) == ""
+    if str(current) == str(reported):
+        return True
+    try:
+        return float(current) == float(reported)
+    except (TypeError, ValueError):
+        return False
+
+def apply_validation_fixes(report, rules=None):
+    """Apply the proposed fixes in `report`, skipping cells that changed since it was built. Returns fixes per rule."""
+    fixable = report[report["rule"].map(lambda rule: VALIDATION_RULES[rule][2]).astype(bool) & report["fix"].notna()]
+    if rules is not None:
+        fixable = fixable[fixable["rule"].isin(rules)]
+    applied = {}
+    cell_fixes = fixable[fixable["rule"] != "orphan_trainer"]
+    if not cell_fixes.empty:
+        with shared_lock("store_lock"):
+            df = pd.read_csv(CSV_FILE)
+            df = df.reindex(columns=CSV_COLUMNS + [col for col in df.columns if col not in CSV_COLUMNS])
+            changed, rescored = set(), {}
+            for violation in cell_fixes.itertuples(index=False):
+                row = int(violation.row)
+                if row not in df.index or not _cell_matches(df.at[row, violation.column], violation.value):
+                    continue
+                if violation.rule == "score_range":
+                    df.at[row, violation.column] = float(violation.fix)
+                    # Only the course this score feeds, and its level figures, are recalculated
+                    if " Course :" in violation.column:
+                        rescored.setdefault(row, set()).add(int(violation.column.rsplit(" Course :", 1)[1]))
+                else:
+                    if df[violation.column].dtype != object:
+                        df[violation.column] = df[violation.column].astype(object)
+                    df.at[row, violation.column] = violation.fix
+                changed.add(row)
+                applied[violation.rule] = applied.get(violation.rule, 0) + 1
+            if rescored:
+                changed.update(df.index[recalculate_scores(df, courses=rescored)])
+            if changed:
+                save_assessment_data(df, sorted(changed), float_format='%.2f')
+    orphans = fixable[fixable["rule"] == "orphan_trainer"].drop_duplicates("trainer_id")
+    if not orphans.empty:
+        with shared_lock("store_lock"):
+            inputs = pd.read_csv(DEFAULT_DATA_FILE) if os.path.exists(DEFAULT_DATA_FILE) else pd.DataFrame(columns=TRAINER_INPUT_COLUMNS)
+            orphans = orphans[~orphans["trainer_id"].isin(inputs["Trainer ID"].astype(str))]
+            details = pd.read_csv(CSV_FILE, usecols=["Trainer ID", "Department", "Branch"], dtype=str).drop_duplicates("Trainer ID", keep="last")
+            details = details.set_index("Trainer ID").reindex(orphans["trainer_id"])
+            added = pd.DataFrame({"Trainer ID": orphans["trainer_id"].to_numpy(), "Trainer Name": orphans["fix"].to_numpy(),
+                                  "Department": details["Department"].to_numpy(), "Branch": details["Branch"].to_numpy()})
+            if not added.empty:
+                inputs = pd.concat([inputs, added], ignore_index=True)
+                save_trainer_inputs(inputs, inputs.index[-len(added):].tolist())
+                applied["orphan_trainer"] = len(added)
+    logger.info(f"Applied integrity fixes: {applied}")
+    return applied
+
+def show_integrity_check():
+    fixed = st.session_state.pop("integrity_fixed", None)
+    if fixed is not None:
+        st.success(f"Applied {sum(fixed.values())} fix(es): " + (", ".join(f"{rule} x{count}" for rule, count in fixed.items()) or "nothing to change"))
+    if st.button("Run Integrity Check", key="run_integrity_check"):
+        with st.spinner("Checking the assessment store..."):
+            st.session_state["integrity_report"] = validate_store()
+    report = st.session_state.get("integrity_report")
+    if report is None:
+        st.caption("Checks dates, level statuses, score ranges and trainer IDs across the whole assessment store.")
+        return
+    if report.empty:
+        st.success("No integrity violations found.")
+        return
+    summary = report.groupby(["rule", "severity"]).agg(violations=("row", "size"), fixable=("fix", "count")).reset_index()
+    summary.insert(1, "check", summary["rule"].map(lambda rule: VALIDATION_RULES[rule][1]))
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    with st.expander(f"All {len(report)} violations"):
+        st.dataframe(report, use_container_width=True, hide_index=True)
+    st.download_button("Download Violation Report CSV", report.to_csv(index=False), file_name=f"integrity_report_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                       mime="text/csv", key="download_integrity_report")
+    fixable_rules = [rule for rule in summary.loc[summary["fixable"] > 0, "rule"] if VALIDATION_RULES[rule][2]]
+    if fixable_rules:
+        chosen = st.multiselect("Fixes to apply", fixable_rules, default=fixable_rules,
+                                format_func=lambda rule: f"{rule}: {VALIDATION_RULES[rule][1]}", key="integrity_fix_rules")
+        if st.button("Apply Safe Fixes", key="apply_integrity_fixes", disabled=not chosen):
+            try:
+                st.session_state["integrity_fixed"] = apply_validation_fixes(report, chosen)
+                st.session_state["integrity_report"] = validate_store()
+                st.rerun()
+            except Exception as e:
+                logger.error(f"Error applying integrity fixes: {str(e)}")
+                show_error_message("Failed to apply integrity fixes.", "integrity_fix_error")
+
 def show_error_message(message, key):
     html = f"""
     <div style="position: fixed; bottom: 0; left: 0; width: 100%; background-color: #f8d7da; padding: 10px; text-align: center; z-index: 1000;" id="error_{key}">
@@ -259,6 +3178,8 @@ def evaluator_section(df_main):
             st.warning("Please login to access the evaluator panel.")
             return
 
+        show_my_queue(st.session_state.get("logged_user", ""))
+
         df = df_main.copy()
         if "Trainer ID" not in df.columns:
             show_error_message("❌ 'Trainer ID' column missing in data.", "missing_trainer_id")
@@ -271,23 +3192,7 @@ def evaluator_section(df_main):
         )
         evaluator_username = st.session_state.get("logged_user", "")
 
-        relevant_params = {
-            "Technical Evaluator": [
-                "Has Knowledge of STEM (5)",
-                "Ability to integrate STEM With related activities (10)",
-                "Discusses Up-to-date information related to STEM (5)",
-                "Provides Course Outline (5)",
-                "Language Fluency (5)",
-                "Preparation with Lesson Plan / Practicals (5)"
-            ],
-            "School Operations Evaluator": [
-                "Time Based Activity (5)",
-                "Student Engagement Ideas (5)",
-                "Pleasing Look (5)",
-                "Poised & Confident (5)",
-                "Well Modulated Voice (5)"
-            ]
-        }
+        relevant_params = RUBRIC_INDEX["params_by_role"]
 
         mode = st.radio("Select Trainer ID Mode", ["Enter Existing Trainer ID", "New Trainer Creation ID"])
         trainer_id, trainer_name, department, trainer_email = "", "", "", ""
@@ -295,7 +3200,7 @@ def evaluator_section(df_main):
         if mode.startswith("Enter"):
             try:
                 if os.path.exists(DEFAULT_DATA_FILE):
-                    eval_inputs_df = pd.read_csv(DEFAULT_DATA_FILE).fillna("")
+                    eval_inputs_df = load_trainer_inputs(df_main.attrs.get("branch_scope")).fillna("")
                     if "Trainer ID" not in eval_inputs_df.columns:
                         show_error_message("❌ 'Trainer ID' column missing in EVALUATOR_INPUT.csv.", "missing_trainer_id_csv")
                         return
@@ -338,7 +3243,6 @@ def evaluator_section(df_main):
                         show_error_message("Mandatory fields (Trainer Name, Department, Email) are missing!", "mandatory_fields_missing")
                         return
                     if not trainer_id:
-                        import uuid
                         trainer_id = str(uuid.uuid4())
                     entry = {
                         "Trainer ID": trainer_id,
@@ -346,18 +3250,21 @@ def evaluator_section(df_main):
                         "Department": department,
                         "Email": trainer_email
                     }
-                    if os.path.exists(DEFAULT_DATA_FILE):
-                        eval_inputs_df = pd.read_csv(DEFAULT_DATA_FILE)
-                        if trainer_id in eval_inputs_df["Trainer ID"].values:
-                            idx = eval_inputs_df.index[eval_inputs_df["Trainer ID"] == trainer_id].tolist()[0]
-                            eval_inputs_df.at[idx, "Trainer Name"] = trainer_name
-                            eval_inputs_df.at[idx, "Department"] = department
-                            eval_inputs_df.at[idx, "Email"] = trainer_email
+                    with shared_lock("store_lock"):
+                        if os.path.exists(DEFAULT_DATA_FILE):
+                            eval_inputs_df = pd.read_csv(DEFAULT_DATA_FILE)
+                            if trainer_id in eval_inputs_df["Trainer ID"].values:
+                                idx = eval_inputs_df.index[eval_inputs_df["Trainer ID"] == trainer_id].tolist()[0]
+                                eval_inputs_df.at[idx, "Trainer Name"] = trainer_name
+                                eval_inputs_df.at[idx, "Department"] = department
+                                eval_inputs_df.at[idx, "Email"] = trainer_email
+                            else:
+                                eval_inputs_df = pd.concat([eval_inputs_df, pd.DataFrame([entry])], ignore_index=True)
+                                idx = eval_inputs_df.index[-1]
                         else:
-                            eval_inputs_df = pd.concat([eval_inputs_df, pd.DataFrame([entry])], ignore_index=True)
-                    else:
-                        eval_inputs_df = pd.DataFrame([entry])
-                    eval_inputs_df.to_csv(DEFAULT_DATA_FILE, index=False)
+                            eval_inputs_df = pd.DataFrame([entry])
+                            idx = eval_inputs_df.index[-1]
+                        save_trainer_inputs(eval_inputs_df, [idx])
                     st.success(f"Trainer ID {trainer_id} {'updated' if trainer_id in eval_inputs_df['Trainer ID'].values else 'created'} successfully!")
                     st.rerun()
                 except Exception as e:
@@ -366,12 +3273,12 @@ def evaluator_section(df_main):
                     return
 
         # Display previous assessments
-        past_assessments = df[df["Trainer ID"] == trainer_id] if trainer_id else pd.DataFrame()
+        past_assessments = densify_frame(df[df["Trainer ID"] == trainer_id]) if trainer_id else pd.DataFrame()
         if not past_assessments.empty:
             st.markdown("### 🔁 Previous Assessments")
             st.dataframe(past_assessments, use_container_width=True)
 
-        levels = ["LEVEL #1", "LEVEL #2", "LEVEL #3"]
+        levels = LEVELS
         level_status, submissions, assessment_data = {}, {}, {}
 
         try:
@@ -390,22 +3297,23 @@ def evaluator_section(df_main):
             show_error_message("Unable to process some level statuses, continuing with available data.", "level_status_error")
             return
 
-        level_1_qualified = all(past_assessments[f"LEVEL #1 Course :{i} STATUS"].eq("QUALIFIED").all() for i in range(1, 11)) if not past_assessments.empty and all(f"LEVEL #1 Course :{i} STATUS" in past_assessments.columns for i in range(1, 11)) else False
-        level_2_qualified = all(past_assessments[f"LEVEL #2 Course :{i} STATUS"].eq("QUALIFIED").all() for i in range(1, 11)) if not past_assessments.empty and all(f"LEVEL #2 Course :{i} STATUS" in past_assessments.columns for i in range(1, 11)) else False
+        # Each level opens once every course of the level before it is qualified
+        previous_qualified = {level: level_courses_qualified(past_assessments, previous) for previous, level in zip(levels, levels[1:])}
 
         for level in levels:
+            rubric_level = RUBRIC_INDEX["levels"][level]
+            course_count = rubric_level["courses"]
             level_class = f"level-{level.split('#')[1]}-heading"
             label = f'<div class="{level_class}">🔹 {level} Assessment</div>'
-            if level == "LEVEL #2" and not level_1_qualified:
-                label = f'<div class="{level_class}">🔹 {level} not qualified</div>'
-            elif level == "LEVEL #3" and not level_2_qualified:
+            if not previous_qualified.get(level, True):
                 label = f'<div class="{level_class}">🔹 {level} not qualified</div>'
             st.markdown(label, unsafe_allow_html=True)
 
             with st.expander(f"{level} Assessment"):
                 try:
+                    restore_draft(evaluator_username, trainer_id, level)
                     courses = {}
-                    course_params = {f"Course :{i}": {} for i in range(1, 11)}
+                    course_params = {f"Course :{i}": {} for i in range(1, course_count + 1)}
                     manager_referral = ""
                     status = "NOT QUALIFIED"
 
@@ -414,14 +3322,10 @@ def evaluator_section(df_main):
                     elif level_status.get(level) == "QUALIFIED" and submissions.get(f"{level}_submissions", 0) == 1:
                         st.write(f"{level} qualified by one evaluator. Awaiting second evaluation.")
                     else:
-                        eligible = (
-                            level == "LEVEL #1" or
-                            (level == "LEVEL #2" and level_1_qualified) or
-                            (level == "LEVEL #3" and level_2_qualified)
-                        )
+                        eligible = previous_qualified.get(level, True)
                         if eligible:
                             st.markdown(f"### {level} Courses")
-                            tabs = st.tabs([f"Course :{i}" for i in range(1, 11)])
+                            tabs = st.tabs([f"Course :{i}" for i in range(1, course_count + 1)])
 
                             for i, tab in enumerate(tabs, 1):
                                 with tab:
@@ -433,37 +3337,10 @@ def evaluator_section(df_main):
                                         placeholder="Select course"
                                     )
 
-                                    if evaluator_role == "Technical Evaluator":
-                                        param_has_stem = st.number_input("Has Knowledge of STEM (5)", 0, 5, key=f"stem_{level}_{i}_{trainer_id}")
-                                        param_integration = st.number_input("Ability to integrate STEM With related activities (10)", 0, 10, key=f"integration_{level}_{i}_{trainer_id}")
-                                        param_up_to_date = st.number_input("Discusses Up-to-date information related to STEM (5)", 0, 5, key=f"uptodate_{level}_{i}_{trainer_id}")
-                                        param_outline = st.number_input("Provides Course Outline (5)", 0, 5, key=f"outline_{level}_{i}_{trainer_id}")
-                                        param_language = st.number_input("Language Fluency (5)", 0, 5, key=f"language_{level}_{i}_{trainer_id}")
-                                        param_preparation = st.number_input("Preparation with Lesson Plan / Practicals (5)", 0, 5, key=f"preparation_{level}_{i}_{trainer_id}")
-
-                                        course_params[f"Course :{i}"] = {
-                                            "Has Knowledge of STEM (5)": param_has_stem,
-                                            "Ability to integrate STEM With related activities (10)": param_integration,
-                                            "Discusses Up-to-date information related to STEM (5)": param_up_to_date,
-                                            "Provides Course Outline (5)": param_outline,
-                                            "Language Fluency (5)": param_language,
-                                            "Preparation with Lesson Plan / Practicals (5)": param_preparation
-                                        }
-
-                                    elif evaluator_role == "School Operations Evaluator":
-                                        param_time = st.number_input("Time Based Activity (5)", 0, 5, key=f"time_{level}_{i}_{trainer_id}")
-                                        param_engagement = st.number_input("Student Engagement Ideas (5)", 0, 5, key=f"engagement_{level}_{i}_{trainer_id}")
-                                        param_pleasing = st.number_input("Pleasing Look (5)", 0, 5, key=f"pleasing_{level}_{i}_{trainer_id}")
-                                        param_poised = st.number_input("Poised & Confident (5)", 0, 5, key=f"poised_{level}_{i}_{trainer_id}")
-                                        param_voice = st.number_input("Well Modulated Voice (5)", 0, 5, key=f"voice_{level}_{i}_{trainer_id}")
-
-                                        course_params[f"Course :{i}"] = {
-                                            "Time Based Activity (5)": param_time,
-                                            "Student Engagement Ideas (5)": param_engagement,
-                                            "Pleasing Look (5)": param_pleasing,
-                                            "Poised & Confident (5)": param_poised,
-                                            "Well Modulated Voice (5)": param_voice
-                                        }
+                                    course_params[f"Course :{i}"] = {
+                                        param["column"]: st.number_input(param["column"], 0, param["max"], key=f"{param['key']}_{level}_{i}_{trainer_id}")
+                                        for param in RUBRIC_INDEX["inputs_by_role"].get(evaluator_role, [])
+                                    }
 
                                     if f"attempt_{level}_{i}_{trainer_id}" not in st.session_state:
                                         st.session_state[f"attempt_{level}_{i}_{trainer_id}"] = 1
@@ -472,17 +3349,13 @@ def evaluator_section(df_main):
 
                                     remarks = st.text_area("Remarks", key=f"remarks_{level}_{i}_{trainer_id}")
 
-                                    if evaluator_role == "Technical Evaluator":
+                                    if evaluator_role in relevant_params:
                                         if st.button(f"Calculate Score", key=f"calc_{level}_{i}_{trainer_id}"):
                                             try:
                                                 if not course_select:
                                                     show_error_message("Please select a course name!", "no_course_selected_calc")
                                                     return
-                                                calculated_total = (
-                                                    param_has_stem + param_integration + param_up_to_date +
-                                                    param_outline + param_language + param_preparation
-                                                )
-                                                calculated_avg = calculated_total / 6.0 if 6 > 0 else 0.0
+                                                calculated_total, calculated_avg = course_scores(list(course_params[f"Course :{i}"].values()))
                                                 st.session_state[f"total_{level}_{i}_{trainer_id}"] = calculated_total
                                                 st.session_state[f"avg_{level}_{i}_{trainer_id}"] = calculated_avg
                                                 st.success(f"Calculated Total: {calculated_total}, Average: {calculated_avg:.2f}")
@@ -493,7 +3366,7 @@ def evaluator_section(df_main):
                                                     "Trainer ID": trainer_id,
                                                     "Trainer Name": trainer_name,
                                                     "Department": department,
-                                                    "Date of assessment": datetime.today().date().strftime("%Y-%m-%Y"),
+                                                    "Date of assessment": datetime.today().date().strftime("%Y-%m-%d"),
                                                     "Evaluator Username": evaluator_username,
                                                     "Evaluator Role": evaluator_role,
                                                     f"{course_key}": course_select,
@@ -502,65 +3375,13 @@ def evaluator_section(df_main):
                                                     f"{course_key} STATUS": st.session_state.get(f"status_{level}_{i}_{trainer_id}", "REDO"),
                                                     f"{course_key} Remarks": remarks
                                                 }
-                                                for param, value in course_params[f"Course :{i}"].items():
-                                                    course_entry[f"{param} Course :{i}"] = value
+                                                course_entry.update(zip(rubric_level["score_names"][evaluator_role][i - 1], course_params[f"Course :{i}"].values()))
 
-                                                updated_df = df.copy()
-                                                if trainer_id in updated_df["Trainer ID"].values:
-                                                    idx = updated_df.index[updated_df["Trainer ID"] == trainer_id].tolist()[-1]
-                                                    for key, value in course_entry.items():
-                                                        updated_df.at[idx, key] = value
-                                                else:
-                                                    updated_df = pd.concat([updated_df, pd.DataFrame([course_entry])], ignore_index=True)
-                                                updated_df.to_csv(CSV_FILE, index=False)
-
-                                                st.rerun()
-
-                                            except Exception as e:
-                                                logger.error(f"Error updating data on Calculate Score: {str(e)}")
-                                                show_error_message("Error calculating score, please check inputs!", "calc_score_error")
-                                                return
-                                    elif evaluator_role == "School Operations Evaluator":
-                                        if st.button(f"Calculate Score", key=f"calc_{level}_{i}_{trainer_id}"):
-                                            try:
-                                                if not course_select:
-                                                    show_error_message("Please select a course name!", "no_course_selected_calc")
-                                                    return
-                                                calculated_total = (
-                                                    param_time + param_engagement + param_pleasing +
-                                                    param_poised + param_voice
-                                                )
-                                                calculated_avg = calculated_total / 5.0 if 5 > 0 else 0.0
-                                                st.session_state[f"total_{level}_{i}_{trainer_id}"] = calculated_total
-                                                st.session_state[f"avg_{level}_{i}_{trainer_id}"] = calculated_avg
-                                                st.success(f"Calculated Total: {calculated_total}, Average: {calculated_avg:.2f}")
-
-                                                save_new_trainer_to_input(trainer_id, trainer_name, department, trainer_email)
-
-                                                course_entry = {
-                                                    "Trainer ID": trainer_id,
-                                                    "Trainer Name": trainer_name,
-                                                    "Department": department,
-                                                    "Date of assessment": datetime.today().date().strftime("%Y-%m-%Y"),
-                                                    "Evaluator Username": evaluator_username,
-                                                    "Evaluator Role": evaluator_role,
-                                                    f"{course_key}": course_select,
-                                                    f"{course_key} TOTAL": calculated_total,
-                                                    f"{course_key} AVERAGE": calculated_avg,
-                                                    f"{course_key} STATUS": st.session_state.get(f"status_{level}_{i}_{trainer_id}", "REDO"),
-                                                    f"{course_key} Remarks": remarks
-                                                }
-                                                for param, value in course_params[f"Course :{i}"].items():
-                                                    course_entry[f"{param} Course :{i}"] = value
-
-                                                updated_df = df.copy()
-                                                if trainer_id in updated_df["Trainer ID"].values:
-                                                    idx = updated_df.index[updated_df["Trainer ID"] == trainer_id].tolist()[-1]
-                                                    for key, value in course_entry.items():
-                                                        updated_df.at[idx, key] = value
-                                                else:
-                                                    updated_df = pd.concat([updated_df, pd.DataFrame([course_entry])], ignore_index=True)
-                                                updated_df.to_csv(CSV_FILE, index=False)
+                                                # Journaled now, written to the store by the next batched draft sync
+                                                journal_draft(evaluator_username, trainer_id, level, evaluator_role)
+                                                with deduplicated_submission(trainer_id, level, evaluator_username, "calculate", course_entry) as fresh:
+                                                    if fresh:
+                                                        queue_draft_entry(evaluator_username, trainer_id, level, course_entry)
 
                                                 st.rerun()
 
@@ -603,10 +3424,10 @@ def evaluator_section(df_main):
                                     st.session_state[f"course_passed_{level}_{i}_{trainer_id}"] = course_passed
 
                             # Enhanced: Compute cleared status per course (name selected + passed + min average)
-                            min_avg_threshold = 75.0 if level in ["LEVEL #1", "LEVEL #2"] else 90.0
+                            min_avg_threshold = rubric_level["pass_average"]
                             all_courses_cleared = True
-                            for i in range(1, 11):
-                                course_data = courses.get(f"{level} Course :{i}", {})
+                            for course_key in rubric_level["names"]["course"]:
+                                course_data = courses.get(course_key, {})
                                 course_name = course_data.get("name", "")
                                 course_passed = course_data.get("passed", False)
                                 course_avg = course_data.get("average", 0.0)
@@ -636,25 +3457,28 @@ def evaluator_section(df_main):
                                     index=0,
                                     key=level_status_key
                                 )
-                                st.warning(f"🔒 {level} Status locked to 'NOT QUALIFIED' until all 10 courses are cleared (name selected, passed, and average ≥ {min_avg_threshold}%).")
+                                st.warning(f"🔒 {level} Status locked to 'NOT QUALIFIED' until all {course_count} courses are cleared (name selected, passed, and average ≥ {min_avg_threshold}%).")
 
                             # Progress metrics
                             col1, col2, col3 = st.columns(3)
                             with col1:
-                                st.metric("Courses Filled", sum(1 for i in range(1, 11) if courses.get(f"{level} Course :{i}", {}).get("name")), delta=10 - sum(1 for i in range(1, 11) if courses.get(f"{level} Course :{i}", {}).get("name")))
+                                filled_count = sum(1 for course_key in rubric_level["names"]["course"] if courses.get(course_key, {}).get("name"))
+                                st.metric("Courses Filled", filled_count, delta=course_count - filled_count)
                             with col2:
-                                st.metric("Courses Passed", sum(1 for i in range(1, 11) if st.session_state.get(f"course_passed_{level}_{i}_{trainer_id}", False)), delta=10 - sum(1 for i in range(1, 11) if st.session_state.get(f"course_passed_{level}_{i}_{trainer_id}", False)))
+                                passed_count = sum(1 for i in range(1, course_count + 1) if st.session_state.get(f"course_passed_{level}_{i}_{trainer_id}", False))
+                                st.metric("Courses Passed", passed_count, delta=course_count - passed_count)
                             with col3:
-                                cleared_count = sum(1 for i in range(1, 11) if courses.get(f"{level} Course :{i}", {}).get("average", 0) >= min_avg_threshold)
-                                st.metric("Courses Scored ≥ Threshold", cleared_count, delta=10 - cleared_count)
-                                if cleared_count == 10 and all_courses_cleared:
+                                cleared_count = sum(1 for course_key in rubric_level["names"]["course"] if courses.get(course_key, {}).get("average", 0) >= min_avg_threshold)
+                                st.metric("Courses Scored ≥ Threshold", cleared_count, delta=course_count - cleared_count)
+                                if cleared_count == course_count and all_courses_cleared:
                                     st.success(f"✅ {level} is now eligible for QUALIFIED!")
 
-                            if level == "LEVEL #3":
+                            if rubric_level["requires_referral"]:
                                 manager_referral = st.text_input(
                                     "Manager Referral (Required for Level 3)",
                                     key=f"manager_referral_{level}_{trainer_id}"
                                 )
+                            journal_draft(evaluator_username, trainer_id, level, evaluator_role)
 
                             # Place "Save Assessment in DB" and "Download Assessment CSV Report" side by side
                             col1, col2 = st.columns(2)
@@ -665,74 +3489,74 @@ def evaluator_section(df_main):
                                             "Trainer ID": trainer_id,
                                             "Trainer Name": trainer_name,
                                             "Department": department,
-                                            "Date of assessment": datetime.today().date().strftime("%Y-%m-%Y"),
+                                            "Date of assessment": datetime.today().date().strftime("%Y-%m-%d"),
                                             "Evaluator Username": evaluator_username,
                                             "Evaluator Role": evaluator_role
                                         }
-                                        for i in range(1, 11):
-                                            course_key = f"{level} Course :{i}"
-                                            course_data = courses.get(course_key, {})
-                                            entry[course_key] = course_data.get("name", "")
-                                            entry[f"{course_key} TOTAL"] = float(course_data.get("total", 0))  # Ensure float type
-                                            entry[f"{course_key} AVERAGE"] = float(course_data.get("average", 0.0))  # Ensure float type
-                                            entry[f"{course_key} STATUS"] = course_data.get("status_overall", "REDO")
-                                            entry[f"{course_key} Remarks"] = course_data.get("remarks", "")
-                                            for param in relevant_params[evaluator_role]:
-                                                entry[f"{param} Course :{i}"] = float(course_data.get("params", {}).get(param, 0))  # Ensure float type for numeric params
-
-                                        # Update EVALUATOR_INPUT.csv with all columns
-                                        if os.path.exists(DEFAULT_DATA_FILE):
-                                            eval_inputs_df = pd.read_csv(DEFAULT_DATA_FILE)
-                                            if trainer_id in eval_inputs_df["Trainer ID"].values:
-                                                idx = eval_inputs_df.index[eval_inputs_df["Trainer ID"] == trainer_id].tolist()[0]
-                                                for key, value in entry.items():
-                                                    if key not in eval_inputs_df.columns:
-                                                        eval_inputs_df.insert(eval_inputs_df.columns.get_loc("Date of assessment") + 1, key, "No data entered" if isinstance(value, str) else 0)
-                                                    eval_inputs_df.at[idx, key] = value
+                                        entry.update(course_entry_values(level, evaluator_role, courses))
+                                        with deduplicated_submission(trainer_id, level, evaluator_username, "save", entry) as fresh:
+                                            if not fresh:
+                                                st.info("This assessment was just saved with the same values; nothing new to write.")
                                             else:
-                                                new_row = pd.DataFrame([entry])
-                                                for col in eval_inputs_df.columns:
-                                                    if col not in new_row.columns:
-                                                        new_row[col] = "No data entered" if eval_inputs_df[col].dtype == 'object' else 0
-                                                for col in new_row.columns:
-                                                    if col not in eval_inputs_df.columns:
-                                                        eval_inputs_df.insert(eval_inputs_df.columns.get_loc("Date of assessment") + 1, col, "No data entered" if new_row[col].dtype == 'object' else 0)
-                                                eval_inputs_df = pd.concat([eval_inputs_df, new_row], ignore_index=True)
-                                            eval_inputs_df.to_csv(DEFAULT_DATA_FILE, index=False, float_format='%.2f')  # Ensure consistent float formatting
-                                        else:
-                                            new_df = pd.DataFrame([entry])
-                                            for col in new_df.columns:
-                                                if col not in ["Trainer ID", "Trainer Name", "Department", "Email", "Date of assessment"]:
-                                                    new_df[col] = "No data entered" if new_df[col].dtype == 'object' else 0
-                                            new_df.to_csv(DEFAULT_DATA_FILE, index=False, float_format='%.2f')  # Ensure consistent float formatting
-
-                                        updated_df = df.copy()
-                                        if os.path.exists(CSV_FILE):
-                                            existing_df = pd.read_csv(CSV_FILE)
-                                            match = existing_df[(existing_df["Trainer ID"] == trainer_id) & (existing_df["Department"] == department)]
-                                            if not match.empty:
-                                                idx = match.index[0]
-                                                for key, value in entry.items():
-                                                    if key in existing_df.columns:
-                                                        existing_df.at[idx, key] = value
+                                                synced_through = draft_offset(evaluator_username, trainer_id, level)
+                                                with shared_lock("store_lock"):
+                                                    # Update EVALUATOR_INPUT.csv with all columns
+                                                    if os.path.exists(DEFAULT_DATA_FILE):
+                                                        eval_inputs_df = pd.read_csv(DEFAULT_DATA_FILE)
+                                                        if trainer_id in eval_inputs_df["Trainer ID"].values:
+                                                            idx = eval_inputs_df.index[eval_inputs_df["Trainer ID"] == trainer_id].tolist()[0]
+                                                            for key, value in entry.items():
+                                                                if key not in eval_inputs_df.columns:
+                                                                    eval_inputs_df.insert(eval_inputs_df.columns.get_loc("Date of assessment") + 1, key, "No data entered" if isinstance(value, str) else 0)
+                                                                eval_inputs_df.at[idx, key] = value
+                                                        else:
+                                                            new_row = pd.DataFrame([entry])
+                                                            for col in eval_inputs_df.columns:
+                                                                if col not in new_row.columns:
+                                                                    new_row[col] = "No data entered" if eval_inputs_df[col].dtype == 'object' else 0
+                                                            for col in new_row.columns:
+                                                                if col not in eval_inputs_df.columns:
+                                                                    eval_inputs_df.insert(eval_inputs_df.columns.get_loc("Date of assessment") + 1, col, "No data entered" if new_row[col].dtype == 'object' else 0)
+                                                            eval_inputs_df = pd.concat([eval_inputs_df, new_row], ignore_index=True)
+                                                            idx = eval_inputs_df.index[-1]
+                                                        save_trainer_inputs(eval_inputs_df, [idx], float_format='%.2f')  # Ensure consistent float formatting
                                                     else:
-                                                        existing_df.insert(existing_df.columns.get_loc("Date of assessment") + 1, key, "No data entered" if isinstance(value, str) else 0)
-                                                        existing_df.at[idx, key] = value
-                                                updated_df = existing_df
-                                            else:
-                                                updated_df = pd.concat([existing_df, pd.DataFrame([entry])], ignore_index=True)
-                                                for col in updated_df.columns:
-                                                    if col not in entry:
-                                                        updated_df[col] = "No data entered" if updated_df[col].dtype == 'object' else 0
-                                        else:
-                                            updated_df = pd.DataFrame([entry])
-                                            for col in updated_df.columns:
-                                                if col not in entry:
-                                                    updated_df[col] = "No data entered" if updated_df[col].dtype == 'object' else 0
-                                        updated_df = updated_df.astype({col: float for col in updated_df.select_dtypes(include=['object']).columns if col.endswith('TOTAL') or col.endswith('AVERAGE')})
-                                        updated_df.to_csv(CSV_FILE, index=False, float_format='%.2f')  # Ensure consistent float formatting
-                                        st.success("Assessment saved to DB.")
-                                        st.rerun()
+                                                        new_df = pd.DataFrame([entry])
+                                                        for col in new_df.columns:
+                                                            if col not in ["Trainer ID", "Trainer Name", "Department", "Email", "Date of assessment"]:
+                                                                new_df[col] = "No data entered" if new_df[col].dtype == 'object' else 0
+                                                        save_trainer_inputs(new_df, [new_df.index[-1]], float_format='%.2f')  # Ensure consistent float formatting
+
+                                                    updated_df = df.copy()
+                                                    if os.path.exists(CSV_FILE):
+                                                        existing_df = pd.read_csv(CSV_FILE)
+                                                        idx = find_assessment_row(existing_df, trainer_id, evaluator_username, evaluator_role)
+                                                        if idx is not None:
+                                                            for key, value in entry.items():
+                                                                if key in existing_df.columns:
+                                                                    existing_df.at[idx, key] = value
+                                                                else:
+                                                                    existing_df.insert(existing_df.columns.get_loc("Date of assessment") + 1, key, "No data entered" if isinstance(value, str) else 0)
+                                                                    existing_df.at[idx, key] = value
+                                                            updated_df = existing_df
+                                                        else:
+                                                            updated_df = pd.concat([existing_df, pd.DataFrame([entry])], ignore_index=True)
+                                                            idx = updated_df.index[-1]
+                                                            # Only the appended row needs placeholders; earlier rows keep their values
+                                                            for col in updated_df.columns:
+                                                                if col not in entry:
+                                                                    updated_df.at[idx, col] = "No data entered" if updated_df[col].dtype == 'object' else 0
+                                                    else:
+                                                        updated_df = pd.DataFrame([entry])
+                                                        idx = updated_df.index[-1]
+                                                        for col in updated_df.columns:
+                                                            if col not in entry:
+                                                                updated_df[col] = "No data entered" if updated_df[col].dtype == 'object' else 0
+                                                    updated_df = updated_df.astype({col: float for col in updated_df.select_dtypes(include=['object']).columns if col.endswith('TOTAL') or col.endswith('AVERAGE')})
+                                                    save_assessment_data(updated_df, [idx], float_format='%.2f')  # Ensure consistent float formatting
+                                                mark_draft_synced(evaluator_username, trainer_id, level, synced_through)
+                                                st.success("Assessment saved to DB.")
+                                                st.rerun()
                                     except Exception as e:
                                         logger.error(f"Error saving assessment: {str(e)}")
                                         show_error_message("Failed to save assessment due to an error!", "save_assessment_error")
@@ -798,8 +3622,8 @@ def evaluator_section(df_main):
                                 try:
                                     # Final validation for required fields
                                     missing_fields = []
-                                    for i in range(1, 11):
-                                        course_data = courses.get(f"Course :{i}", {})
+                                    for i, course_key in enumerate(rubric_level["names"]["course"], 1):
+                                        course_data = courses.get(course_key, {})
                                         if not course_data.get("name"):
                                             missing_fields.append(f"Course :{i} name")
                                         for param in relevant_params[evaluator_role]:
@@ -807,84 +3631,80 @@ def evaluator_section(df_main):
                                                 missing_fields.append(f"Course :{i} {param}")
                                         if not course_data.get("remarks"):
                                             missing_fields.append(f"Course :{i} remarks")
-                                    if level == "LEVEL #3" and not manager_referral:
+                                    if rubric_level["requires_referral"] and not manager_referral:
                                         missing_fields.append("Manager Referral")
 
                                     if missing_fields:
                                         show_error_message("Missing required fields: " + ", ".join(missing_fields), "missing_required_fields")
                                         return
 
-                                    if not all_courses_cleared or (level == "LEVEL #3" and not manager_referral):
-                                        show_error_message(f"All 10 courses must be cleared (name, passed, avg ≥ {min_avg_threshold}%) and Manager Referral required for Level 3!", "submit_eval_error")
+                                    if not all_courses_cleared or (rubric_level["requires_referral"] and not manager_referral):
+                                        show_error_message(f"All {course_count} courses must be cleared (name, passed, avg ≥ {min_avg_threshold}%) and Manager Referral required for Level 3!", "submit_eval_error")
                                         return
                                     entry = {
                                         "Trainer ID": trainer_id,
                                         "Trainer Name": trainer_name,
                                         "Department": department,
-                                        "Date of assessment": datetime.today().date().strftime("%Y-%m-%Y"),
+                                        "Date of assessment": datetime.today().date().strftime("%Y-%m-%d"),
                                         "Evaluator Username": evaluator_username,
                                         "Evaluator Role": evaluator_role,
                                         f"{level}": status,
                                         f"{level} Reminder": reminder,
-                                        "Manager Referral": manager_referral if level == "LEVEL #3" else ""
+                                        "Manager Referral": manager_referral if rubric_level["requires_referral"] else ""
                                     }
 
-                                    total_score = 0
                                     param_count = len(relevant_params[evaluator_role])
-                                    for i in range(1, 11):
-                                        course_key = f"{level} Course :{i}"
-                                        course_data = courses.get(course_key, {})
-                                        entry[course_key] = course_data.get("name", "")
-                                        entry[f"{course_key} TOTAL"] = float(course_data.get("total", 0))  # Ensure float type
-                                        entry[f"{course_key} AVERAGE"] = float(course_data.get("average", 0.0))  # Ensure float type
-                                        entry[f"{course_key} STATUS"] = course_data.get("status_overall", "REDO")
-                                        entry[f"{course_key} Remarks"] = course_data.get("remarks", "")
-                                        for param in relevant_params[evaluator_role]:
-                                            entry[f"{param} Course :{i}"] = float(course_data.get("params", {}).get(param, 0))  # Ensure float type for numeric params
-                                        total_score += course_data.get("total", 0)
+                                    entry.update(course_entry_values(level, evaluator_role, courses))
+                                    total_score = np.fromiter((entry[col] for col in rubric_level["names"]["total"]), dtype=float).sum()
                                     entry[f"{level} TOTAL"] = float(total_score)  # Ensure float type
-                                    entry[f"{level} AVERAGE"] = float(total_score / (param_count * 10) if param_count * 10 > 0 else 0.0)  # Ensure float type
+                                    entry[f"{level} AVERAGE"] = float(total_score / (param_count * course_count) if param_count * course_count > 0 else 0.0)  # Ensure float type
 
                                     for lvl in levels:
-                                        all_courses_filled = all(courses.get(f"{lvl} Course :{i}", {}).get("name") and courses.get(f"{lvl} Course :{i}", {}).get("passed") for i in range(1, 11))
-                                        if lvl in ["LEVEL #1", "LEVEL #2"] and entry.get(lvl) == "QUALIFIED" and submissions.get(f"{lvl}_submissions", 0) >= 2:
-                                            if not all_courses_filled or entry.get(f"{lvl} AVERAGE", 0.0) < 75.0:
+                                        lvl_rubric = RUBRIC_INDEX["levels"][lvl]
+                                        all_courses_filled = all(courses.get(course_key, {}).get("name") and courses.get(course_key, {}).get("passed") for course_key in lvl_rubric["names"]["course"])
+                                        if entry.get(lvl) == "QUALIFIED" and submissions.get(f"{lvl}_submissions", 0) >= 2:
+                                            if not all_courses_filled or entry.get(f"{lvl} AVERAGE", 0.0) < lvl_rubric["pass_average"] or (lvl_rubric["requires_referral"] and not entry.get("Manager Referral")):
                                                 entry[lvl] = "NOT QUALIFIED"
-                                                st.warning(f"{lvl} requires 10 completed courses with at least 75% average.")
-                                        if lvl == "LEVEL #3" and entry.get(lvl) == "QUALIFIED" and submissions.get(f"{lvl}_submissions", 0) >= 2:
-                                            if not all_courses_filled or entry.get(f"{lvl} AVERAGE", 0.0) < 90.0 or not entry.get("Manager Referral"):
-                                                entry[lvl] = "NOT QUALIFIED"
-                                                st.warning(f"{lvl} requires 10 completed courses, 90% average, and Manager Referral.")
+                                                referral_note = ", and Manager Referral" if lvl_rubric["requires_referral"] else ""
+                                                st.warning(f"{lvl} requires {lvl_rubric['courses']} completed courses with at least {lvl_rubric['pass_average']:.0f}% average{referral_note}.")
 
                                     if not all_courses_cleared:
                                         entry[f"{level}"] = "NOT QUALIFIED"
                                         st.warning(f"{level} auto-set to NOT QUALIFIED due to incomplete clearance.")
 
-                                    updated_df = df.copy()
-                                    if os.path.exists(CSV_FILE):
-                                        existing_df = pd.read_csv(CSV_FILE)
-                                        match = existing_df[(existing_df["Trainer ID"] == trainer_id) & (existing_df["Department"] == department)]
-                                        if not match.empty:
-                                            idx = match.index[0]
-                                            for key, value in entry.items():
-                                                if key in existing_df.columns:
-                                                    existing_df.at[idx, key] = value
-                                                else:
-                                                    existing_df.insert(existing_df.columns.get_loc("Date of assessment") + 1, key, "No data entered" if isinstance(value, str) else 0)
-                                                    existing_df.at[idx, key] = value
-                                            updated_df = existing_df
+                                    with deduplicated_submission(trainer_id, level, evaluator_username, "submit", entry) as fresh:
+                                        if not fresh:
+                                            st.info("This evaluation was just submitted with the same values; it was not written again.")
                                         else:
-                                            updated_df = pd.concat([existing_df, pd.DataFrame([entry])], ignore_index=True)
-                                            for col in updated_df.columns:
-                                                if col not in entry:
-                                                    updated_df[col] = "No data entered" if updated_df[col].dtype == 'object' else 0
-                                    else:
-                                        updated_df = pd.DataFrame([entry])
-                                        for col in updated_df.columns:
-                                            if col not in entry:
-                                                updated_df[col] = "No data entered" if updated_df[col].dtype == 'object' else 0
-                                    updated_df = updated_df.astype({col: float for col in updated_df.select_dtypes(include=['object']).columns if col.endswith('TOTAL') or col.endswith('AVERAGE')})
-                                    updated_df.to_csv(CSV_FILE, index=False, float_format='%.2f')  # Ensure consistent float formatting
+                                            with shared_lock("store_lock"):
+                                                updated_df = df.copy()
+                                                if os.path.exists(CSV_FILE):
+                                                    existing_df = pd.read_csv(CSV_FILE)
+                                                    idx = find_assessment_row(existing_df, trainer_id, evaluator_username, evaluator_role)
+                                                    if idx is not None:
+                                                        for key, value in entry.items():
+                                                            if key in existing_df.columns:
+                                                                existing_df.at[idx, key] = value
+                                                            else:
+                                                                existing_df.insert(existing_df.columns.get_loc("Date of assessment") + 1, key, "No data entered" if isinstance(value, str) else 0)
+                                                                existing_df.at[idx, key] = value
+                                                        updated_df = existing_df
+                                                    else:
+                                                        updated_df = pd.concat([existing_df, pd.DataFrame([entry])], ignore_index=True)
+                                                        idx = updated_df.index[-1]
+                                                        # Only the appended row needs placeholders; earlier rows keep their values
+                                                        for col in updated_df.columns:
+                                                            if col not in entry:
+                                                                updated_df.at[idx, col] = "No data entered" if updated_df[col].dtype == 'object' else 0
+                                                else:
+                                                    updated_df = pd.DataFrame([entry])
+                                                    idx = updated_df.index[-1]
+                                                    for col in updated_df.columns:
+                                                        if col not in entry:
+                                                            updated_df[col] = "No data entered" if updated_df[col].dtype == 'object' else 0
+                                                updated_df = updated_df.astype({col: float for col in updated_df.select_dtypes(include=['object']).columns if col.endswith('TOTAL') or col.endswith('AVERAGE')})
+                                                save_assessment_data(updated_df, [idx], float_format='%.2f')  # Ensure consistent float formatting
+                                            discard_draft(evaluator_username, trainer_id, level)
 
                                     st.success(f"✅ Assessment Saved for Trainer ID: {trainer_id}")
                                     st.write(f"Level Total: {entry[f'{level} TOTAL']}, Level Average: {entry[f'{level} AVERAGE']:.2f}")
@@ -934,7 +3754,7 @@ def evaluator_section(df_main):
                                                 y -= 20
                                                 pdf.drawString(100, y, f"Reminder: {entry.get(f'{level} Reminder', 'N/A')}")
                                                 y -= 20
-                                                if level == "LEVEL #3":
+                                                if rubric_level["requires_referral"]:
                                                     pdf.drawString(100, y, f"Manager Referral: {entry.get('Manager Referral', 'N/A')}")
                                                     y -= 20
                                                 y -= 20
@@ -942,19 +3762,20 @@ def evaluator_section(df_main):
                                                 pdf.drawString(100, y, "Course Details")
                                                 pdf.setFont("Helvetica", 12)
                                                 y -= 20
-                                                for i in range(1, 11):
-                                                    pdf.drawString(100, y, f"Course :{i}: {entry.get(f'{level} Course :{i}', 'N/A')}")
+                                                names = rubric_level["names"]
+                                                for i, course_key in enumerate(names["course"]):
+                                                    pdf.drawString(100, y, f"Course :{i + 1}: {entry.get(course_key, 'N/A')}")
                                                     y -= 20
-                                                    for param in relevant_params[evaluator_role]:
-                                                        pdf.drawString(120, y, f"{param}: {entry.get(f'{param} Course :{i}', 'N/A')}")
+                                                    for param, score_col in zip(relevant_params[evaluator_role], rubric_level["score_names"][evaluator_role][i]):
+                                                        pdf.drawString(120, y, f"{param}: {entry.get(score_col, 'N/A')}")
                                                         y -= 15
-                                                    pdf.drawString(120, y, f"TOTAL: {entry.get(f'{level} Course :{i} TOTAL', 'N/A')}")
+                                                    pdf.drawString(120, y, f"TOTAL: {entry.get(names['total'][i], 'N/A')}")
                                                     y -= 15
-                                                    pdf.drawString(120, y, f"AVERAGE: {entry.get(f'{level} Course :{i} AVERAGE', 'N/A'):.2f}")
+                                                    pdf.drawString(120, y, f"AVERAGE: {entry.get(names['average'][i], 'N/A'):.2f}")
                                                     y -= 15
-                                                    pdf.drawString(120, y, f"STATUS: {entry.get(f'{level} Course :{i} STATUS', 'N/A')}")
+                                                    pdf.drawString(120, y, f"STATUS: {entry.get(names['status'][i], 'N/A')}")
                                                     y -= 15
-                                                    pdf.drawString(120, y, f"Evaluator Remarks: {entry.get(f'{level} Course :{i} Remarks', 'N/A')}")
+                                                    pdf.drawString(120, y, f"Evaluator Remarks: {entry.get(names['remarks'][i], 'N/A')}")
                                                     y -= 20
                                                     if y < 50:
                                                         pdf.showPage()
@@ -1043,10 +3864,18 @@ def viewer_section(df_main):
                 show_error_message("❌ 'Trainer ID' column missing in data.", "viewer_trainer_id_missing")
             return
 
+        df = apply_live_deltas(df, "viewer")
         st.markdown("### 📋 Trainer Assessments")
         trainer_filter = st.text_input("Filter by Trainer Name or ID", "", help="Press Enter to Apply")
+        # Branch-scoped viewers only see hits for trainers in their own frame
+        scoped_ids = None if df.attrs.get("branch_scope") is None else df["Trainer ID"].dropna().astype(str).unique()
+        feedback_search_box("viewer_feedback_search", scoped_ids)
+        with st.expander("🧮 Status Filters"):
+            status_keys = status_filter_builder("viewer_status_filter", df.attrs.get("branch_scope"))
 
-        filtered = df.copy()
+        filtered = date_range_filter(df, "viewer_date_range").copy()
+        if status_keys is not None:
+            filtered = filtered[assessment_row_keys(filtered).isin(status_keys).to_numpy()]
         if trainer_filter:
             try:
                 mask = filtered["Trainer ID"].astype(str).str.contains(trainer_filter, case=False, na=False) | \
@@ -1059,19 +3888,32 @@ def viewer_section(df_main):
                     show_error_message("Failed to apply trainer filter.", "trainer_filter_error")
                 return
 
-        if not filtered.empty:
-            st.markdown("#### Matching Trainer Assessments")
-            st.dataframe(filtered.fillna("No data entered"), use_container_width=True)
+        live_updates_panel("viewer", filtered, None if len(filtered) == len(df) else filtered["Trainer ID"].dropna().tolist(),
+                           fill_value="No data entered")
 
         trainer_ids = sorted(filtered["Trainer ID"].dropna().unique().tolist())
+        archived_ids = archived_trainer_ids(df.attrs.get("branch_scope"), trainer_filter)
+        trainer_ids = sorted(set(trainer_ids).union(archived_ids))
         selected_trainer = st.selectbox("Select Trainer for Detailed Report", [""] + trainer_ids)
         if selected_trainer:
-            trainer_report = df[df["Trainer ID"] == selected_trainer]
+            trainer_report = densify_frame(df[df["Trainer ID"] == selected_trainer])
+            if selected_trainer in archived_ids:
+                archived_rows = densify_frame(load_archived_assessments(selected_trainer))
+                # Rows in the hot store win over archived copies of the same assessment
+                archived_rows = archived_rows[~assessment_row_keys(archived_rows).isin(set(assessment_row_keys(trainer_report)))]
+                if not archived_rows.empty:
+                    st.caption(f"📦 Includes {len(archived_rows)} archived assessment row(s) from cold storage.")
+                    trainer_report = pd.concat([archived_rows, trainer_report], ignore_index=True)
             if trainer_report.empty:
                 st.info("No data entered for this trainer.")
             else:
                 st.markdown(f"##### Reports for Trainer ID: {selected_trainer}")
                 st.dataframe(trainer_report.fillna("No data entered"))
+                summary_html = load_trainer_summary(selected_trainer, df.attrs.get("data_version"))
+                if summary_html:
+                    with st.expander("Level Summary"):
+                        st.markdown(summary_html, unsafe_allow_html=True)
+                show_trainer_standing(selected_trainer)
 
             col1, col2 = st.columns(2)
             with col1:
@@ -1085,29 +3927,12 @@ def viewer_section(df_main):
                 )
             with col2:
                 try:
-                    buffer = BytesIO()
-                    pdf = canvas.Canvas(buffer, pagesize=A4)
-                    pdf.setFont("Helvetica", 12)
-                    y = 750
-                    pdf.drawString(100, y, f"Trainer Report: {selected_trainer}")
-                    y -= 20
-                    pdf.drawString(100, y, f"Generated on: {datetime.now().strftime('%d-%m-%Y %I:%M %p IST')}")
-                    y -= 30
-                    for level in ["LEVEL #1", "LEVEL #2", "LEVEL #3"]:
-                        pdf.drawString(100, y, f"{level} Assessment")
-                        y -= 20
-                        for i in range(1, 11):
-                            course = trainer_report.iloc[-1].get(f"{level} Course :{i}", "N/A") if not trainer_report.empty else "N/A"
-                            pdf.drawString(100, y, f"Course :{i}: {course}")
-                            y -= 20
-                            if y < 50:
-                                pdf.showPage()
-                                pdf.setFont("Helvetica", 12)
-                                y = 750
-                    pdf.showPage()
-                    pdf.save()
-                    pdf_data = buffer.getvalue()
-                    buffer.close()
+                    pdf_data = build_pdf_report(
+                        f"Trainer Report: {selected_trainer}",
+                        f"Generated on: {datetime.now().strftime('%d-%m-%Y %I:%M %p IST')}",
+                        build_trainer_report_sections(trainer_report),
+                        pagesize=landscape(A4)
+                    )
                     st.download_button(
                         label="Download Trainer PDF",
                         data=pdf_data,
@@ -1124,11 +3949,9 @@ def viewer_section(df_main):
 
         if st.button("View All Trainers", key="view_all_trainers"):
             try:
-                if os.path.exists(DEFAULT_DATA_FILE):
-                    # Reload the latest EVALUATOR_INPUT.csv
-                    all_trainers = pd.read_csv(DEFAULT_DATA_FILE)
-                    # Select relevant columns and remove duplicates
-                    all_trainers = all_trainers[["Trainer ID", "Trainer Name", "Department", "Branch"]].drop_duplicates()
+                # Latest published trainer list (falls back to EVALUATOR_INPUT.csv before the first snapshot)
+                all_trainers = load_snapshot_trainers()
+                if all_trainers is not None:
                     st.markdown("### 🆔 All Trainers")
                     st.dataframe(all_trainers.fillna("No data entered"), use_container_width=True)
                     # Reset popup dismissal flag after successful load
@@ -1180,7 +4003,7 @@ def admin_section(df_main):
         st.markdown("### 🧑‍💻 Existing Evaluators")
         try:
             if not evaluators_df.empty:
-                st.dataframe(evaluators_df[["username", "full_name", "email", "role", "created_at"]], use_container_width=True)
+                st.dataframe(evaluators_df[["username", "full_name", "email", "role", "branches", "created_at"]], use_container_width=True)
             else:
                 st.info("No evaluators found in the system.")
         except Exception as e:
@@ -1189,7 +4012,7 @@ def admin_section(df_main):
                 st.session_state["popup_dismissed_evaluators_list_error"] = True
                 show_error_message("Failed to display evaluators list.", "evaluators_list_error")
             return
-        cols = st.columns([1, 1, 1, 1])
+        cols = st.columns([1, 1, 1, 1, 1])
         if cols[0].button("Add New Evaluator"):
             st.session_state.admin_section = "add_evaluator"
         if cols[1].button("Existing Evaluators"):
@@ -1198,6 +4021,8 @@ def admin_section(df_main):
             st.session_state.admin_section = "edit_evaluator"
         if cols[3].button("Delete Evaluator"):
             st.session_state.admin_section = "delete_evaluator"
+        if cols[4].button("Background Jobs"):
+            st.session_state.admin_section = "jobs"
         section = st.session_state.get("admin_section", "trainer_reports")
         evaluators_df = load_evaluators()
         if section == "add_evaluator":
@@ -1209,6 +4034,7 @@ def admin_section(df_main):
                 full_name = st.text_input("Full Name", key="new_eval_name")
                 email = st.text_input("Email", key="new_eval_email")
                 role_select = st.selectbox("Role", ["Technical Evaluator", "School Operations Evaluator"], key="new_eval_role")
+                branch_scope = st.multiselect("Branch Scope (leave empty for all branches)", known_branches(), key="new_eval_branches")
                 submitted = st.form_submit_button("Add Evaluator")
                 if submitted:
                     try:
@@ -1225,10 +4051,12 @@ def admin_section(df_main):
                                 "full_name": full_name,
                                 "email": email,
                                 "role": role_select,
-                                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                "branches": ";".join(branch_scope)
                             }
-                            evaluators_df = pd.concat([evaluators_df, pd.DataFrame([new_entry])], ignore_index=True)
-                            save_evaluators(evaluators_df)
+                            with shared_lock("store_lock"):
+                                evaluators_df = pd.concat([load_evaluators(), pd.DataFrame([new_entry])], ignore_index=True)
+                                save_evaluators(evaluators_df, changed_index=[evaluators_df.index[-1]])
                             st.success(f"Evaluator '{new_username}' added.")
                             st.session_state.admin_section = "trainer_reports"
                     except Exception as e:
@@ -1239,7 +4067,7 @@ def admin_section(df_main):
         elif section == "existing_evaluators":
             st.markdown("### 🧑‍💻 Existing Evaluators")
             try:
-                st.dataframe(evaluators_df[["username", "full_name", "email", "role", "created_at"]])
+                st.dataframe(evaluators_df[["username", "full_name", "email", "role", "branches", "created_at"]])
                 # Single-click mechanism for Back to Main
                 if st.button("Back to Main", key="back_to_main_existing"):
                     try:
@@ -1269,6 +4097,10 @@ def admin_section(df_main):
                         edit_role = st.selectbox("Role", ["Technical Evaluator", "School Operations Evaluator"],
                                                  index=["Technical Evaluator", "School Operations Evaluator"].index(row.get("role", "Technical Evaluator")),
                                                  key=f"role_{selected_eval}")
+                        current_scope = [] if pd.isna(row.get("branches")) else [b for b in str(row.get("branches")).split(";") if b]
+                        edit_branches = st.multiselect("Branch Scope (leave empty for all branches)",
+                                                       sorted(set(known_branches()) | set(current_scope)),
+                                                       default=current_scope, key=f"branches_{selected_eval}")
                         change_password = st.checkbox("Change Password", key=f"chpass_{selected_eval}")
                         new_pass = ""
                         confirm_pass = ""
@@ -1281,13 +4113,16 @@ def admin_section(df_main):
                                 if change_password and new_pass != confirm_pass:
                                     st.error("Passwords do not match.")
                                 else:
-                                    idx = evaluators_df.index[evaluators_df["username"] == selected_eval][0]
-                                    evaluators_df.at[idx, "full_name"] = edit_full_name
-                                    evaluators_df.at[idx, "email"] = edit_email
-                                    evaluators_df.at[idx, "role"] = edit_role
-                                    if change_password and new_pass:
-                                        evaluators_df.at[idx, "password_hash"] = hash_password(new_pass)
-                                    save_evaluators(evaluators_df)
+                                    with shared_lock("store_lock"):
+                                        evaluators_df = load_evaluators()
+                                        idx = evaluators_df.index[evaluators_df["username"] == selected_eval][0]
+                                        evaluators_df.at[idx, "full_name"] = edit_full_name
+                                        evaluators_df.at[idx, "email"] = edit_email
+                                        evaluators_df.at[idx, "role"] = edit_role
+                                        evaluators_df.at[idx, "branches"] = ";".join(edit_branches)
+                                        if change_password and new_pass:
+                                            evaluators_df.at[idx, "password_hash"] = hash_password(new_pass)
+                                        save_evaluators(evaluators_df, changed_index=[idx])
                                     st.success(f"Evaluator '{selected_eval}' updated.")
                             except Exception as e:
                                 logger.error(f"Error editing evaluator: {str(e)}")
@@ -1316,8 +4151,10 @@ def admin_section(df_main):
             if selected_eval:
                 if st.button(f"Confirm Delete Evaluator '{selected_eval}'"):
                     try:
-                        evaluators_df = evaluators_df[evaluators_df["username"] != selected_eval].reset_index(drop=True)
-                        save_evaluators(evaluators_df)
+                        with shared_lock("store_lock"):
+                            evaluators_df = load_evaluators()
+                            evaluators_df = evaluators_df[evaluators_df["username"] != selected_eval].reset_index(drop=True)
+                            save_evaluators(evaluators_df, deleted_keys=[selected_eval])
                         st.warning(f"Evaluator '{selected_eval}' deleted.")
                     except Exception as e:
                         logger.error(f"Error deleting evaluator: {str(e)}")
@@ -1335,15 +4172,32 @@ def admin_section(df_main):
                     if not st.session_state.get("popup_dismissed_back_to_main_delete_error"):
                         st.session_state["popup_dismissed_back_to_main_delete_error"] = True
                         show_error_message("Failed to navigate to trainer reports.", "back_to_main_delete_error")
+        elif section == "jobs":
+            try:
+                show_jobs_panel()
+            except Exception as e:
+                logger.error(f"Error showing background jobs: {str(e)}")
+                if not st.session_state.get("popup_dismissed_jobs_panel_error"):
+                    st.session_state["popup_dismissed_jobs_panel_error"] = True
+                    show_error_message("Failed to load background jobs.", "jobs_panel_error")
+            if st.button("Back to Main", key="back_to_main_jobs"):
+                st.session_state.admin_section = "trainer_reports"
+                st.rerun()
         else:
             try:
                 if df_main is None or df_main.empty:
                     raise ValueError("Trainer reports data is missing or empty.")
                 st.markdown("---")
                 st.markdown("### 📋 Trainer Reports Overview")
+                df_main = apply_live_deltas(df_main, "admin")
                 trainer_filter = st.text_input("Filter by Trainer Name or ID", "", help="Press Enter to Apply")
+                feedback_search_box("admin_feedback_search")
+                with st.expander("🧮 Status Filters"):
+                    status_keys = status_filter_builder("admin_status_filter")
                
-                filtered = df_main.copy()
+                filtered = date_range_filter(df_main, "admin_date_range").copy()
+                if status_keys is not None:
+                    filtered = filtered[assessment_row_keys(filtered).isin(status_keys).to_numpy()]
                 if trainer_filter:
                     try:
                         mask = filtered["Trainer ID"].astype(str).str.contains(trainer_filter, case=False, na=False) | \
@@ -1355,13 +4209,11 @@ def admin_section(df_main):
                             st.session_state["popup_dismissed_trainer_filter_error"] = True
                             show_error_message("Failed to apply trainer filter.", "trainer_filter_error")
                         return
-                if not filtered.empty:
-                    st.markdown("#### Matching Trainer Assessments")
-                    st.dataframe(filtered)
+                live_updates_panel("admin", filtered, None if len(filtered) == len(df_main) else filtered["Trainer ID"].dropna().tolist())
                 trainer_ids = sorted(filtered["Trainer ID"].dropna().unique().tolist())
                 selected_trainer = st.selectbox("Select Trainer for Detailed Report", [""] + trainer_ids)
                 if selected_trainer:
-                    trainer_reports = df_main[df_main["Trainer ID"] == selected_trainer]
+                    trainer_reports = densify_frame(df_main[df_main["Trainer ID"] == selected_trainer])
                     st.markdown(f"##### Reports for Trainer ID: {selected_trainer}")
                     st.dataframe(trainer_reports)
                     col1, col2, col3 = st.columns(3)
@@ -1385,46 +4237,7 @@ def admin_section(df_main):
                         )
                     with col3:
                         try:
-                            buffer = BytesIO()
-                            pdf = canvas.Canvas(buffer, pagesize=A4)
-                            pdf.setFont("Helvetica", 12)
-                            y = 750
-                            pdf.drawString(100, y, "Evaluator and Trainer Report")
-                            y -= 20
-                            pdf.drawString(100, y, f"Generated on: {datetime.now().strftime('%d-%m-%Y %I:%M %p IST')}")
-                            y -= 30
-                            pdf.drawString(100, y, "Evaluators")
-                            y -= 20
-                            pdf.setFillColor(colors.black)
-                            pdf.drawString(100, y, "Username Full Name Email Role Created At")
-                            y -= 20
-                            for _, row in evaluators_df.iterrows():
-                                text = f"{row['username']} {row['full_name']} {row['email']} {row['role']} {row['created_at']}"
-                                pdf.drawString(100, y, text)
-                                y -= 20
-                                if y < 50:
-                                    pdf.showPage()
-                                    pdf.setFont("Helvetica", 12)
-                                    y = 750
-                            y -= 20
-                            pdf.drawString(100, y, "Trainers")
-                            y -= 20
-                            pdf.drawString(100, y, "Trainer ID Trainer Name Branch Department")
-                            y -= 20
-                            if os.path.exists(DEFAULT_DATA_FILE):
-                                trainers_df = pd.read_csv(DEFAULT_DATA_FILE)
-                                for _, row in trainers_df.iterrows():
-                                    text = f"{row['Trainer ID']} {row['Trainer Name']} {row.get('Branch', '')} {row.get('Department', '')}"
-                                    pdf.drawString(100, y, text)
-                                    y -= 20
-                                    if y < 50:
-                                        pdf.showPage()
-                                        pdf.setFont("Helvetica", 12)
-                                        y = 750
-                            pdf.showPage()
-                            pdf.save()
-                            pdf_data = buffer.getvalue()
-                            buffer.close()
+                            pdf_data, latex_data = render_admin_report(store_version(EVALUATOR_STORE), store_version(DEFAULT_DATA_FILE))
                             st.download_button(
                                 label="Download Evaluators/Trainers PDF",
                                 data=pdf_data,
@@ -1432,6 +4245,13 @@ def admin_section(df_main):
                                 mime="application/pdf",
                                 key="download_button_admin_pdf"
                             )
+                            st.download_button(
+                                label="Download Evaluators/Trainers LaTeX",
+                                data=latex_data,
+                                file_name="evaluators_trainers_report.tex",
+                                mime="application/x-tex",
+                                key="download_button_admin_tex"
+                            )
                         except Exception as e:
                             logger.error(f"Error generating PDF: {str(e)}")
                             if not st.session_state.get("popup_dismissed_pdf_report_error"):
@@ -1476,6 +4296,56 @@ def admin_section(df_main):
             mime="text/csv",
             key="download_evaluators_csv"
         )
+        with st.expander("🏆 Leaderboards"):
+            try:
+                show_leaderboards()
+            except Exception as e:
+                logger.error(f"Error showing leaderboards: {str(e)}")
+                show_error_message("Failed to load leaderboards.", "leaderboards_error")
+        with st.expander("🎓 Certificates"):
+            try:
+                show_certificates()
+            except Exception as e:
+                logger.error(f"Error showing certificates: {str(e)}")
+                show_error_message("Failed to load certificates.", "certificates_error")
+        with st.expander("💾 Backups & Restore"):
+            try:
+                show_backups()
+            except Exception as e:
+                logger.error(f"Error showing backups: {str(e)}")
+                show_error_message("Failed to load backups.", "backups_error")
+        with st.expander("🩺 Data Integrity"):
+            try:
+                show_integrity_check()
+            except Exception as e:
+                logger.error(f"Error running integrity check: {str(e)}")
+                show_error_message("Failed to run the integrity check.", "integrity_check_error")
+        with st.expander("🎯 Evaluator Calibration"):
+            try:
+                show_calibration()
+            except Exception as e:
+                logger.error(f"Error showing evaluator calibration: {str(e)}")
+                show_error_message("Failed to load evaluator calibration.", "calibration_error")
+        with st.expander("📤 Delta Export for BI"):
+            try:
+                st.caption(f"Current change sequence: {current_change_seq()}")
+                export_store = st.selectbox("Data Store", list(CHANGE_TRACKED_STORES.keys()), key="delta_export_store")
+                since_seq = st.number_input("Changed after sequence", min_value=0, value=0, step=1, key="delta_export_seq")
+                since_time = st.text_input("Changed after timestamp (YYYY-MM-DD HH:MM:SS, optional)", "", key="delta_export_time")
+                delta_df = export_changes(export_store, since_seq=int(since_seq), since_time=since_time.strip() or None)
+                st.write(f"{len(delta_df)} changed rows")
+                st.download_button(
+                    label="Download Delta CSV",
+                    data=delta_df.to_csv(index=False),
+                    file_name=f"delta_{os.path.splitext(export_store)[0]}_{int(since_seq)}.csv",
+                    mime="text/csv",
+                    key="download_delta_csv"
+                )
+            except Exception as e:
+                logger.error(f"Error exporting changes: {str(e)}")
+                if not st.session_state.get("popup_dismissed_delta_export_error"):
+                    st.session_state["popup_dismissed_delta_export_error"] = True
+                    show_error_message("Failed to export changes. Check the timestamp format.", "delta_export_error")
         if st.button("Logout", key="admin_logout"):
             try:
                 for key in ["logged_in", "role", "logged_user"]:
@@ -1518,10 +4388,14 @@ def admin_section(df_main):
             </script>
             """, unsafe_allow_html=True)
                     
+@st.cache_resource(show_spinner=False)
+def encode_asset(path, data_version):
+    with open(path, "rb") as asset:
+        return base64.b64encode(asset.read()).decode()
+
 def set_background(image_file):
     try:
-        with open(image_file, "rb") as image:
-            img_bytes = base64.b64encode(image.read()).decode()
+        img_bytes = encode_asset(image_file, store_version(image_file))
         page_bg_img = f"""
         <style>
         .stApp {{
@@ -1537,6 +4411,39 @@ def set_background(image_file):
         logger.error(f"Error setting background: {str(e)}")
         st.error("Failed to set background image.")
 
+def _warm_date_index():
+    df = load_data()
+    return get_date_index(df, (df.attrs.get("data_version"), df.attrs.get("live_seq"), df.attrs.get("branch_scope"), len(df)))
+
+def _warm_up_caches():
+    """Load, index and render everything the first requests after a restart would otherwise pay for."""
+    started = time.perf_counter()
+    steps = [
+        ("assessment store", load_data),
+        ("date index", _warm_date_index),
+        ("trainer store", load_trainer_inputs),
+        ("evaluator store", load_evaluators),
+        ("sign-off index", get_signoff_index),
+        ("status bitmaps", get_bitmap_index),
+        ("viewer snapshot", lambda: load_viewer_snapshot() if _load_snapshot_manifest()["latest"] else publish_viewer_snapshot()),
+        ("assets", lambda: [encode_asset(path, store_version(path)) for path in WARM_UP_ASSETS if os.path.exists(path)]),
+        ("admin report", lambda: render_admin_report(store_version(EVALUATOR_STORE), store_version(DEFAULT_DATA_FILE))),
+    ]
+    for name, step in steps:
+        step_started = time.perf_counter()
+        try:
+            step()
+            logger.info(f"Warmed {name} in {time.perf_counter() - step_started:.2f}s")
+        except Exception as e:
+            logger.error(f"Error warming {name}: {str(e)}")
+    logger.info(f"Cache warm-up finished in {time.perf_counter() - started:.2f}s")
+
+@st.cache_resource(show_spinner=False)
+def start_cache_warm_up():
+    worker = threading.Thread(target=_warm_up_caches, name="cache-warm-up", daemon=True)
+    worker.start()
+    return worker
+
 def login_ui():
     try:
         st.sidebar.title("🔐 Login Panel")
@@ -1579,11 +4486,22 @@ def login_ui():
 
 def main():
     try:
+        # Writes by the CLI or other server processes reach this process's indexes here
+        for store in (CSV_FILE, DEFAULT_DATA_FILE):
+            notify_external_writes(store)
+        start_cache_warm_up()
         if "logged_in" not in st.session_state or not st.session_state.get("logged_in"):
             login_ui()
         else:
-            df_main = load_data()
+            start_compaction_worker()
+            start_partition_sync()
+            start_snapshot_publisher()
+            start_draft_sync_worker()
+            start_backup_worker()
             role = st.session_state.get("role", "")
+            df_main = load_viewer_snapshot(session_branch_scope()) if role == "Viewer" else None
+            if df_main is None:
+                df_main = load_data(session_branch_scope())
             if role == "Evaluator":
                 evaluator_section(df_main)
             elif role == "Viewer":
@@ -0,0 +1,259 @@
+"""Read-only JSON API over the assessment stores, for integrations that poll trainer qualification states.
+
+    python assessment_api.py [--host 127.0.0.1] [--port 8502] [--data-dir DIR]
+
+    GET /api/trainers                                 roster (filters: branch, department, q)
+    GET /api/trainers/<trainer_id>/levels             level status per evaluator row, archived rows included
+    GET /api/trainers/<trainer_id>/levels/<n>/courses course scores of LEVEL #<n>; per-parameter `scores` only
+                                                      for the level a row's scores were saved under, else null
+
+List responses take ?page=1&per_page=100 (at most 500) and ?fields=a,b to choose item fields. Every response
+carries an ETag built from the change sequence and the store file versions, so a poll with If-None-Match is
+answered 304 from a few stat() calls without reading any CSV. Set OMOTEC_API_TOKEN to require
+"Authorization: Bearer <token>".
+"""
+import argparse
+import functools
+import hashlib
+import json
+import logging
+import os
+import sys
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, APP_DIR)
+
+import numpy as np
+import pandas as pd
+
+import DemoAssessmentApp as app
+
+logger = logging.getLogger("assessment_api")
+
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 500
+LEVEL_FIELDS = ["level", "Evaluator Username", "Evaluator Role", "status", "TOTAL", "AVERAGE", "Score Card Status",
+                "Reminder", "Date of assessment", "Last Modified", "archived"]
+COURSE_FIELDS = ["level", "Evaluator Username", "Evaluator Role", "course", "Course Name", "TOTAL", "AVERAGE",
+                 "STATUS", "Remarks", "scores", "archived"]
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def current_etag():
+    """Validator for every resource: cheap to compute, and changes with any write to a store the API reads."""
+    versions = [app.store_version(store) for store in (app.CSV_FILE, app.DEFAULT_DATA_FILE, app.ARCHIVE_MANIFEST)]
+    digest = hashlib.sha1(repr(versions).encode()).hexdigest()[:16]
+    return f'"{app.current_change_seq()}-{digest}"'
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in [candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates]
+
+
+@functools.lru_cache(maxsize=2)
+def _roster(version):
+    if not os.path.exists(app.DEFAULT_DATA_FILE):
+        return pd.DataFrame(columns=app.TRAINER_INPUT_COLUMNS)
+    roster = pd.read_csv(app.DEFAULT_DATA_FILE, dtype=str).reindex(columns=app.TRAINER_INPUT_COLUMNS)
+    return roster.dropna(subset=["Trainer ID"]).drop_duplicates("Trainer ID", keep="last").reset_index(drop=True)
+
+
+@functools.lru_cache(maxsize=2)
+def _assessments(version):
+    """The parsed store load_data serves for this version, plus Trainer ID -> row positions."""
+    df = app._parse_assessment_store(None, (version, None))
+    return df, df.groupby(df["Trainer ID"].astype(str), sort=False).indices
+
+
+def trainer_rows(trainer_id):
+    """Hot rows of one trainer followed by any cold-storage rows, with an `archived` flag."""
+    df, positions = _assessments(app.store_version(app.CSV_FILE))
+    hot = df.iloc[positions.get(str(trainer_id), [])].assign(archived=False)
+    cold = app.load_archived_assessments(trainer_id).assign(archived=True)
+    rows = pd.concat([hot, cold], ignore_index=True) if not cold.empty else hot
+    if rows.empty and str(trainer_id) not in set(_roster(app.store_version(app.DEFAULT_DATA_FILE))["Trainer ID"]):
+        raise ApiError(404, f"Unknown trainer {trainer_id}")
+    return app.densify_frame(rows)
+
+
+def _json_value(value):
+    if isinstance(value, (np.floating, float)):
+        return None if np.isnan(value) else round(float(value), 2)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if value is None or value is pd.NaT or (isinstance(value, str) and value == "") or pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def list_trainers(query):
+    roster = _roster(app.store_version(app.DEFAULT_DATA_FILE))
+    if query.get("branch"):
+        roster = roster[roster["Branch"] == query["branch"]]
+    if query.get("department"):
+        roster = roster[roster["Department"] == query["department"]]
+    if query.get("q"):
+        text = query["q"].lower()
+        roster = roster[roster["Trainer ID"].str.lower().str.contains(text, regex=False)
+                        | roster["Trainer Name"].fillna("").str.lower().str.contains(text, regex=False)]
+    return app.TRAINER_INPUT_COLUMNS, roster
+
+
+def trainer_levels(trainer_id):
+    rows = trainer_rows(trainer_id)
+    items = []
+    for level in app.LEVELS:
+        items.append(pd.DataFrame({
+            "level": level,
+            "Evaluator Username": rows["Evaluator Username"],
+            "Evaluator Role": rows["Evaluator Role"],
+            "status": rows[level],
+            "TOTAL": rows[f"{level} TOTAL"],
+            "AVERAGE": rows[f"{level} AVERAGE"],
+            "Score Card Status": rows[f"{level} Score Card Status"],
+            "Reminder": rows[f"{level} Reminder"],
+            "Date of assessment": rows["Date of assessment"],
+            "Last Modified": rows["Last Modified"],
+            "archived": rows["archived"],
+        }))
+    return LEVEL_FIELDS, pd.concat(items, ignore_index=True).astype(object)
+
+
+def level_courses(trainer_id, level_number):
+    level = f"LEVEL #{level_number}"
+    if level not in app.RUBRIC_INDEX["levels"]:
+        raise ApiError(404, f"Unknown level {level_number}")
+    compiled = app.RUBRIC_INDEX["levels"][level]
+    rows = trainer_rows(trainer_id)
+    # A row stores one score block, holding the scores of the level it was last saved under; other levels
+    # only keep their course totals, so their scores are reported as null rather than borrowed from that block
+    owners = app.score_block_levels(rows).tolist()
+    items = []
+    for record, owner in zip(rows.to_dict("records"), owners):
+        score_names = compiled["score_names"].get(str(record["Evaluator Role"])) if owner == level else None
+        for i, course in enumerate(compiled["names"]["course"]):
+            scores = None
+            if score_names is not None:
+                scores = {col.rsplit(" Course :", 1)[0]: _json_value(record.get(col)) for col in score_names[i]}
+            items.append({
+                "level": level, "Evaluator Username": record["Evaluator Username"], "Evaluator Role": record["Evaluator Role"],
+                "course": i + 1, "Course Name": record.get(course), "TOTAL": record.get(compiled["names"]["total"][i]),
+                "AVERAGE": record.get(compiled["names"]["average"][i]), "STATUS": record.get(compiled["names"]["status"][i]),
+                "Remarks": record.get(compiled["names"]["remarks"][i]), "scores": scores, "archived": record["archived"],
+            })
+    return COURSE_FIELDS, pd.DataFrame(items, columns=COURSE_FIELDS).astype(object)
+
+
+def paginate(fields, frame, query, path):
+    """Slice one page of `frame` and render only the requested fields of it."""
+    try:
+        page = int(query.get("page", 1))
+        per_page = min(int(query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+    except ValueError:
+        raise ApiError(400, "page and per_page must be integers")
+    if page < 1 or per_page < 1:
+        raise ApiError(400, "page and per_page must be positive")
+    selected = [field.strip() for field in query["fields"].split(",")] if query.get("fields") else fields
+    unknown = [field for field in selected if field not in fields]
+    if unknown:
+        raise ApiError(400, f"Unknown fields: {', '.join(unknown)}; available: {', '.join(fields)}")
+    window = frame.iloc[(page - 1) * per_page:page * per_page]
+    data = [{field: _json_value(value) if not isinstance(value, dict) else value for field, value in zip(selected, values)}
+            for values in window[selected].itertuples(index=False, name=None)]
+    body = {"data": data, "page": page, "per_page": per_page, "total": len(frame), "next": None}
+    if page * per_page < len(frame):
+        body["next"] = f"{path}?{urllib.parse.urlencode(dict(query, page=page + 1, per_page=per_page))}"
+    return body
+
+
+def route(path, query):
+    parts = [urllib.parse.unquote(part) for part in path.strip("/").split("/")]
+    if parts[:2] != ["api", "trainers"]:
+        raise ApiError(404, "Not found")
+    if len(parts) == 2:
+        return paginate(*list_trainers(query), query, path)
+    if len(parts) == 4 and parts[3] == "levels":
+        return paginate(*trainer_levels(parts[2]), query, path)
+    if len(parts) == 6 and parts[3] == "levels" and parts[5] == "courses":
+        return paginate(*level_courses(parts[2], parts[4]), query, path)
+    raise ApiError(404, "Not found")
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "OmotecAssessmentAPI/1.0"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        token = os.environ.get("OMOTEC_API_TOKEN")
+        if token and self.headers.get("Authorization") != f"Bearer {token}":
+            return self._send_json(401, {"error": "Missing or invalid bearer token"})
+        etag = current_etag()
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            return self._send(304, b"", etag)
+        try:
+            body = route(url.path, dict(urllib.parse.parse_qsl(url.query)))
+            self._send_json(200, body, etag)
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            logger.error(f"Error serving {self.path}: {str(e)}")
+            self._send_json(500, {"error": "Internal error"})
+
+    def do_POST(self):
+        self._send_json(405, {"error": "This API is read-only"})
+
+    do_PUT = do_PATCH = do_DELETE = do_POST
+
+    def _send_json(self, status, body, etag=None):
+        self._send(status, json.dumps(body, default=str).encode(), etag, "application/json")
+
+    def _send(self, status, payload, etag=None, content_type=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read-only JSON API over the OMOTEC assessment stores.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--data-dir", default=APP_DIR, help="directory holding the CSV stores")
+    args = parser.parse_args(argv)
+    os.chdir(args.data_dir)
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    logger.info(f"Serving the assessment API on http://{args.host}:{args.port}/api/trainers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
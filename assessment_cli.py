@@ -0,0 +1,323 @@
+"""Command-line entry point for batch operations on the assessment stores.
+
+    python assessment_cli.py recompute [--workers N] [--chunk-rows N] [--dry-run]
+    python assessment_cli.py export --output-dir DIR [--store FILE ...] [--since-seq N] [--since-time TS]
+    python assessment_cli.py report --output-dir DIR [--format pdf|tex ...]
+    python assessment_cli.py validate [--fix | --fix-rule RULE ...] [--workers N] [--output report.csv]
+    python assessment_cli.py reminder [--outbox DIR | --send --smtp-host HOST] [--kind trainers|signoffs ...]
+
+Runs against the CSV stores in --data-dir (default: this directory), reading them in row chunks so
+memory stays bounded by --chunk-rows rather than the store size. Suitable for cron: exit codes are
+0 success, 1 the command found problems (violations, failed sends), 2 the command itself failed.
+"""
+import argparse
+import concurrent.futures
+import itertools
+import logging
+import multiprocessing
+import os
+import smtplib
+import sys
+import threading
+import time
+from datetime import datetime
+from email.message import EmailMessage
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, APP_DIR)
+
+import numpy as np
+import pandas as pd
+
+import DemoAssessmentApp as app
+
+logger = logging.getLogger("assessment_cli")
+
+EXPORT_STORES = [app.CSV_FILE, app.DEFAULT_DATA_FILE, app.EVALUATOR_STORE, app.CHANGE_LOG_FILE, app.HISTORY_FILE]
+
+
+def _store_columns():
+    """Store layout for chunked rewrites: the rubric columns first, then any extra columns found in the file."""
+    header = pd.read_csv(app.CSV_FILE, nrows=0).columns
+    return app.CSV_COLUMNS + [col for col in header if col not in app.CSV_COLUMNS]
+
+
+def _recompute_chunk(chunk, columns):
+    """Recalculate one chunk read by the parent; runs in a pool worker."""
+    chunk = chunk.reindex(columns=columns)
+    changed = app.recalculate_scores(chunk)
+    if app.recalculate_scores(chunk.copy()).any():
+        raise ValueError(f"Recalculation is not stable on rows {chunk.index[0]}-{chunk.index[-1]}")
+    return chunk, changed
+
+
+def _recomputed_chunks(workers, chunk_rows, columns):
+    """Yield recalculated chunks in store order. The store is read once, in the parent, and the chunks are
+    shipped to the workers with at most two per worker in flight."""
+    chunks = pd.read_csv(app.CSV_FILE, chunksize=chunk_rows)
+    if workers <= 1:
+        for chunk in chunks:
+            yield _recompute_chunk(chunk, columns)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = [pool.submit(_recompute_chunk, chunk, columns) for chunk in itertools.islice(chunks, 2 * workers)]
+        while in_flight:
+            result = in_flight.pop(0).result()
+            next_chunk = next(chunks, None)
+            if next_chunk is not None:
+                in_flight.append(pool.submit(_recompute_chunk, next_chunk, columns))
+            yield result
+
+
+def cmd_recompute(args):
+    """Recalculate course and level TOTAL/AVERAGE, rewriting the store chunk by chunk into a temporary file.
+
+    Holds the cross-process store lock throughout, so the app cannot write rows that the replace would drop.
+    """
+    columns = _store_columns()
+    tmp_file = f"{app.CSV_FILE}.recompute.tmp"
+    rows = changed_rows = 0
+    updates = []
+    with app.shared_lock("store_lock"):
+        try:
+            for chunk, changed in _recomputed_chunks(args.workers, args.chunk_rows, columns):
+                changed_index = chunk.index[changed].tolist()
+                if not args.dry_run:
+                    app.record_changes(chunk, changed_index, app.CSV_FILE)
+                    chunk.to_csv(tmp_file, mode="w" if rows == 0 else "a", header=rows == 0, index=False, float_format="%.2f")
+                    updates.append(chunk.loc[changed_index])
+                rows += len(chunk)
+                changed_rows += len(changed_index)
+            if not args.dry_run and rows:
+                os.replace(tmp_file, app.CSV_FILE)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    if changed_rows and not args.dry_run:
+        # The change log already carries the new seqs to other processes; this reaches listeners in this one
+        app.notify_write_listeners(app.CSV_FILE, pd.concat(updates))
+    print(f"Recalculated {rows} rows: {changed_rows} {'would change' if args.dry_run else 'changed'}")
+    return 0
+
+
+def _export_chunks(store, since_seq, since_time, chunk_rows):
+    """Yield the rows of `store` to export, filtered to changes after the cursor when one is given."""
+    delta = since_seq is not None or since_time is not None
+    seq_col, ts_col, _ = app.CHANGE_TRACKED_STORES.get(store, (None, None, None))
+    for chunk in pd.read_csv(store, chunksize=chunk_rows):
+        if store == app.EVALUATOR_STORE:
+            chunk = chunk.drop(columns=["password_hash"], errors="ignore")
+        if delta:
+            mask = pd.Series(True, index=chunk.index)
+            # A store written before change tracking has no seq/timestamp column; every row then predates the cursor
+            if since_seq is not None:
+                mask &= pd.to_numeric(chunk.get(seq_col, pd.Series(np.nan, index=chunk.index)), errors="coerce").fillna(0) > since_seq
+            if since_time is not None:
+                mask &= pd.to_datetime(chunk.get(ts_col, pd.Series(np.nan, index=chunk.index)), errors="coerce") > pd.Timestamp(since_time)
+            chunk = chunk[mask].assign(**{"Change Operation": "upsert"})
+        yield chunk
+    if delta:
+        yield app.change_tombstones(store, since_seq, since_time)
+
+
+def cmd_export(args):
+    stores = args.store or EXPORT_STORES
+    delta = args.since_seq is not None or args.since_time is not None
+    untracked = [store for store in stores if store not in app.CHANGE_TRACKED_STORES]
+    if delta and untracked:
+        print(f"--since-seq/--since-time only apply to change-tracked stores, not {', '.join(untracked)}")
+        return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+    for store in stores:
+        if not os.path.exists(store):
+            print(f"Skipped {store}: not found")
+            continue
+        out_file = os.path.join(args.output_dir, os.path.basename(store))
+        written, header = 0, True
+        for chunk in _export_chunks(store, args.since_seq, args.since_time, args.chunk_rows):
+            if chunk.empty:
+                continue
+            chunk.to_csv(out_file, mode="w" if header else "a", header=header, index=False)
+            written += len(chunk)
+            header = False
+        if header:
+            pd.DataFrame(columns=pd.read_csv(store, nrows=0).columns).to_csv(out_file, index=False)
+        print(f"Exported {written} rows of {store} to {out_file}")
+    return 0
+
+
+def cmd_report(args):
+    os.makedirs(args.output_dir, exist_ok=True)
+    sections = app.build_admin_report_sections(app.load_evaluators())
+    subtitle = app.admin_report_subtitle()
+    formats = args.format or ["pdf", "tex"]
+    if "pdf" in formats:
+        out_file = os.path.join(args.output_dir, "evaluators_trainers_report.pdf")
+        with open(out_file, "wb") as f:
+            f.write(app.build_pdf_report("Evaluator and Trainer Report", subtitle, sections))
+        print(f"Wrote {out_file}")
+    if "tex" in formats:
+        out_file = os.path.join(args.output_dir, "evaluators_trainers_report.tex")
+        with open(out_file, "w") as f:
+            app.write_latex_report(f, "Evaluator and Trainer Report", subtitle, sections, chunk_size=args.chunk_rows)
+        print(f"Wrote {out_file}")
+    return 0
+
+
+def cmd_validate(args):
+    report = app.validate_store(workers=args.workers, chunk_rows=args.chunk_rows)
+    if args.fix or args.fix_rule:
+        applied = app.apply_validation_fixes(report, args.fix_rule or None)
+        print(f"Applied fixes: {applied or 'none'}")
+        report = app.validate_store(workers=args.workers, chunk_rows=args.chunk_rows)
+    if args.output:
+        report.to_csv(args.output, index=False)
+        print(f"Wrote {len(report)} violations to {args.output}")
+    if report.empty:
+        print("No integrity violations found.")
+        return 0
+    summary = report.groupby(["rule", "severity"]).agg(violations=("row", "size"), fixable=("fix", "count"))
+    print(summary.to_string())
+    return 1 if (report["severity"] == "error").any() else 0
+
+
+def trainer_reminders(chunk_rows):
+    """Reminder text evaluators left on levels the trainer has not qualified yet, addressed to the trainer."""
+    emails = {}
+    if os.path.exists(app.DEFAULT_DATA_FILE):
+        trainers = pd.read_csv(app.DEFAULT_DATA_FILE, usecols=lambda col: col in ("Trainer ID", "Email"), dtype=str)
+        emails = trainers.dropna().drop_duplicates("Trainer ID", keep="last").set_index("Trainer ID")["Email"].to_dict()
+    columns = ["Trainer ID", "Trainer Name", "Evaluator Username"] + app.LEVELS + [f"{level} Reminder" for level in app.LEVELS]
+    reminders = []
+    for chunk in pd.read_csv(app.CSV_FILE, usecols=lambda col: col in columns, dtype=str, chunksize=chunk_rows):
+        chunk = chunk.reindex(columns=columns)
+        for level in app.LEVELS:
+            text = chunk[f"{level} Reminder"].fillna("").str.strip()
+            due = chunk[(text != "") & (chunk[level] != "QUALIFIED")]
+            for row, reminder in zip(due.itertuples(index=False), text[due.index]):
+                reminders.append({"to": emails.get(row[0], ""), "subject": f"Reminder for {level}",
+                                  "body": f"Dear {row[1]},\n\n{reminder}\n\n- {row[2]}", "about": f"{row[0]} {level}"})
+    return reminders
+
+
+def signoff_reminders(chunk_rows):
+    """Second sign-offs waiting on an evaluator, one message per evaluator listing their queue."""
+    index = {"signoffs": {}, "lock": threading.Lock()}
+    columns = app.ASSESSMENT_KEY_COLUMNS + ["Last Modified", "Date of assessment"] + app.LEVELS
+    for chunk in pd.read_csv(app.CSV_FILE, usecols=lambda col: col in columns, dtype=str, chunksize=chunk_rows):
+        app._apply_signoffs(index, chunk)
+    evaluators = app.load_evaluators()
+    emails = evaluators.dropna(subset=["username"]).set_index("username")["email"].fillna("").to_dict()
+    reminders = []
+    for username, queue in app.assign_evaluation_queue(app.pending_second_evaluations(index), evaluators).items():
+        if queue:
+            lines = [f"- {item['Trainer ID']} {item['Level']} (first sign-off by {item['First Sign-off By']} on {item['Signed Off At']})" for item in queue]
+            reminders.append({"to": str(emails.get(username, "")), "subject": f"{len(queue)} trainer levels await your sign-off",
+                              "body": "The following trainer levels are waiting for your evaluation:\n\n" + "\n".join(lines),
+                              "about": username})
+    return reminders
+
+
+def cmd_reminder(args):
+    kinds = args.kind or ["trainers", "signoffs"]
+    reminders = []
+    if "trainers" in kinds:
+        reminders += trainer_reminders(args.chunk_rows)
+    if "signoffs" in kinds:
+        reminders += signoff_reminders(args.chunk_rows)
+    unaddressed = [reminder["about"] for reminder in reminders if not reminder["to"]]
+    if unaddressed:
+        print(f"{len(unaddressed)} reminders have no email on file: {', '.join(unaddressed[:10])}{' ...' if len(unaddressed) > 10 else ''}")
+    messages = []
+    for reminder in reminders:
+        if reminder["to"]:
+            message = EmailMessage()
+            message["From"], message["To"], message["Subject"] = args.sender, reminder["to"], reminder["subject"]
+            message.set_content(reminder["body"])
+            messages.append(message)
+    if not args.send:
+        os.makedirs(args.outbox, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        for n, message in enumerate(messages):
+            with open(os.path.join(args.outbox, f"{stamp}_{n:05d}.eml"), "wb") as f:
+                f.write(bytes(message))
+        print(f"Wrote {len(messages)} reminder emails to {args.outbox}")
+        return 0
+    failed = 0
+    with smtplib.SMTP(args.smtp_host, args.smtp_port, timeout=30) as smtp:
+        if args.starttls:
+            smtp.starttls()
+        if os.environ.get("OMOTEC_SMTP_USER"):
+            smtp.login(os.environ["OMOTEC_SMTP_USER"], os.environ.get("OMOTEC_SMTP_PASSWORD", ""))
+        for message in messages:
+            try:
+                smtp.send_message(message)
+            except smtplib.SMTPException as e:
+                logger.error(f"Error sending reminder to {message['To']}: {str(e)}")
+                failed += 1
+    print(f"Sent {len(messages) - failed} of {len(messages)} reminder emails")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Batch operations on the OMOTEC assessment stores.")
+    parser.add_argument("--data-dir", default=APP_DIR, help="directory holding the CSV stores")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recompute = commands.add_parser("recompute", help="recalculate course and level totals and averages")
+    recompute.add_argument("--workers", type=int, default=app.VALIDATION_WORKERS)
+    recompute.add_argument("--chunk-rows", type=int, default=app.VALIDATION_CHUNK_ROWS)
+    recompute.add_argument("--dry-run", action="store_true", help="count the rows that would change without writing")
+    recompute.set_defaults(handler=cmd_recompute)
+
+    export = commands.add_parser("export", help="export stores, or only their changes after a cursor, as CSV")
+    export.add_argument("--output-dir", required=True)
+    export.add_argument("--store", action="append", choices=EXPORT_STORES, help="store to export (repeatable, default: all)")
+    export.add_argument("--since-seq", type=int, help="only rows changed after this change sequence, plus tombstones")
+    export.add_argument("--since-time", help="only rows changed after this timestamp (YYYY-MM-DD HH:MM:SS)")
+    export.add_argument("--chunk-rows", type=int, default=app.VALIDATION_CHUNK_ROWS)
+    export.set_defaults(handler=cmd_export)
+
+    report = commands.add_parser("report", help="render the Evaluators/Trainers admin report")
+    report.add_argument("--output-dir", required=True)
+    report.add_argument("--format", action="append", choices=["pdf", "tex"], help="output format (repeatable, default: both)")
+    report.add_argument("--chunk-rows", type=int, default=1000)
+    report.set_defaults(handler=cmd_report)
+
+    validate = commands.add_parser("validate", help="check store integrity, optionally applying safe fixes")
+    validate.add_argument("--workers", type=int, default=app.VALIDATION_WORKERS)
+    validate.add_argument("--chunk-rows", type=int, default=app.VALIDATION_CHUNK_ROWS)
+    validate.add_argument("--fix", action="store_true", help="apply every safe automated fix")
+    validate.add_argument("--fix-rule", action="append", choices=[rule for rule, (_, _, fixable) in app.VALIDATION_RULES.items() if fixable],
+                          help="apply only this rule's fixes (repeatable)")
+    validate.add_argument("--output", help="write the full violation report to this CSV")
+    validate.set_defaults(handler=cmd_validate)
+
+    reminder = commands.add_parser("reminder", help="email level reminders to trainers and sign-off queues to evaluators")
+    reminder.add_argument("--kind", action="append", choices=["trainers", "signoffs"], help="reminders to build (repeatable, default: both)")
+    reminder.add_argument("--outbox", default="outbox", help="write .eml files here instead of sending (default)")
+    reminder.add_argument("--send", action="store_true", help="send through SMTP; login from OMOTEC_SMTP_USER/OMOTEC_SMTP_PASSWORD")
+    reminder.add_argument("--smtp-host", default="localhost")
+    reminder.add_argument("--smtp-port", type=int, default=25)
+    reminder.add_argument("--starttls", action="store_true")
+    reminder.add_argument("--sender", default="assessments@omotec.local")
+    reminder.add_argument("--chunk-rows", type=int, default=app.VALIDATION_CHUNK_ROWS)
+    reminder.set_defaults(handler=cmd_reminder)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    os.chdir(args.data_dir)
+    started = time.perf_counter()
+    try:
+        code = args.handler(args)
+    except Exception as e:
+        logger.error(f"Error running {args.command}: {str(e)}")
+        code = 2
+    print(f"{args.command} finished in {time.perf_counter() - started:.2f}s (exit {code})")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""Headless load test for DemoAssessmentApp.
+
+Drives the real login, evaluator, viewer and admin flows through Streamlit's AppTest from many
+concurrent sessions against a synthetic dataset in a scratch directory, then reports throughput,
+latency percentiles, errors, peak memory and data-integrity violations (lost or duplicated writes).
+
+    python load_test.py --evaluators 30 --viewers 50 --admins 2 --trainers 300 --rounds 2
+"""
+import argparse
+import contextlib
+import logging
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(APP_DIR, "DemoAssessmentApp.py")
+sys.path.insert(0, APP_DIR)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[logging.StreamHandler(sys.stdout)])
+logger = logging.getLogger("load_test")
+
+CREDENTIALS = {
+    "Viewer": ("Viewer", "omotec", "omotec"),
+    "Evaluator": ("Evaluator", "omotec1", "omotec123"),
+    "Admin": ("Super_Administrator", "omotec2", "omotec@123#"),
+}
+EVALUATOR_ROLES = ["Technical Evaluator", "School Operations Evaluator"]
+DEPARTMENTS = ["Coding", "Robotics", "Electronics", "AI", "Mechanical"]
+BRANCHES = ["Juhu", "Andheri", "Powai", "Thane"]
+SEED_EVALUATOR = "loadtest_seed"
+
+
+def build_dataset(workdir, trainers, seed):
+    """Write synthetic EVALUATOR_INPUT.csv / assessment_data.csv (plus the real evaluators.csv) into `workdir`."""
+    import DemoAssessmentApp as app
+
+    rng = np.random.default_rng(seed)
+    ids = [f"LT{i:05d}" for i in range(1, trainers + 1)]
+    trainer_inputs = pd.DataFrame({
+        "Trainer ID": ids,
+        "Trainer Name": [f"Trainer {i}" for i in range(1, trainers + 1)],
+        "Branch": rng.choice(BRANCHES, trainers),
+        "Department": rng.choice(DEPARTMENTS, trainers),
+        "Email": [f"{trainer_id.lower()}@example.com" for trainer_id in ids],
+    })
+    # Keep the real file's column layout; Save inserts new columns relative to "Date of assessment"
+    layout = pd.read_csv(os.path.join(APP_DIR, app.DEFAULT_DATA_FILE), nrows=0).columns
+    trainer_inputs = trainer_inputs.reindex(columns=layout.union(trainer_inputs.columns, sort=False), fill_value="No data entered")
+    trainer_inputs.to_csv(os.path.join(workdir, app.DEFAULT_DATA_FILE), index=False)
+
+    # Half the trainers already carry a finished LEVEL #1 from a seed evaluator, so reads have history to chew on
+    history = pd.DataFrame("No data entered", index=range(trainers // 2), columns=app.CSV_COLUMNS, dtype=object)
+    history["Trainer ID"] = ids[:trainers // 2]
+    history["Trainer Name"] = trainer_inputs["Trainer Name"][:trainers // 2].to_numpy()
+    history["Department"] = trainer_inputs["Department"][:trainers // 2].to_numpy()
+    history["Date of assessment"] = "2025-01-15"
+    history["Evaluator Username"] = SEED_EVALUATOR
+    history["Evaluator Role"] = "Technical Evaluator"
+    level = app.RUBRIC_INDEX["levels"]["LEVEL #1"]
+    history[list(level["names"]["course"])] = rng.choice(app.COURSE_OPTIONS[1:], (len(history), level["courses"]))
+    history[list(level["names"]["status"])] = "QUALIFIED"
+    for param in app.RUBRIC["parameters"]:
+        columns = [f"{param['column']} Course :{i}" for i in range(1, app.MAX_COURSES + 1)]
+        history[columns] = rng.integers(1, param["max"] + 1, (len(history), len(columns)))
+    numeric = [column for column in app.CSV_COLUMNS if column.endswith(("TOTAL", "AVERAGE"))]
+    history[numeric] = 0.0
+    score_names = level["score_names"]["Technical Evaluator"]
+    scores = history[list(score_names.ravel())].to_numpy(dtype=float).reshape(len(history), *score_names.shape)
+    history[list(level["names"]["total"])] = scores.sum(axis=2)
+    history[list(level["names"]["average"])] = scores.mean(axis=2).round(2)
+    history["LEVEL #1"] = "QUALIFIED"
+    history.to_csv(os.path.join(workdir, app.CSV_FILE), index=False)
+
+    shutil.copy(os.path.join(APP_DIR, app.EVALUATOR_STORE), os.path.join(workdir, app.EVALUATOR_STORE))
+    return ids
+
+
+class Recorder:
+    """Thread-safe sink for per-step latencies, errors and the writes each evaluator session expects to persist."""
+
+    def __init__(self, serialize_runs=False):
+        self.lock = threading.Lock()
+        # Without a pinned shared runtime, overlapping AppTest runs tear each other's mock runtime down
+        self.run_lock = threading.Lock() if serialize_runs else contextlib.nullcontext()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(list)
+        self.expected = {}
+
+    def timed_run(self, at, step):
+        with self.run_lock:
+            started = time.perf_counter()
+            try:
+                at.run()
+            except Exception as e:
+                self.error(step, f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                with self.lock:
+                    self.latencies[step].append(elapsed)
+        for exception in at.exception:
+            self.error(step, exception.value)
+        for error in at.error:
+            self.error(step, error.value)
+        return at
+
+    def error(self, step, message):
+        with self.lock:
+            self.errors[step].append(str(message))
+
+    def expect(self, key, values):
+        with self.lock:
+            self.expected[key] = values
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """Give every session one process-wide mock Runtime and script bytecode cache, as a real server would.
+
+    AppTest installs a fresh mock Runtime for each run and clears it when the run ends, so runs in
+    parallel threads would tear it down under one another. It also recompiles the app on every run,
+    which both inflates latency and trips CPython's non-thread-safe ast.parse under concurrency.
+
+    These are Streamlit internals. If the installed version lacks any of them, nothing is patched and
+    the context yields False, telling the caller to serialize runs instead. Patches are undone on exit.
+    """
+    from unittest.mock import MagicMock
+
+    try:
+        from streamlit import config
+        from streamlit.components.v2.component_manager import BidiComponentManager
+        from streamlit.runtime import Runtime
+        from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+        from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+        from streamlit.runtime.media_file_manager import MediaFileManager
+        from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    except ImportError as e:
+        logger.warning(f"Cannot share one runtime across sessions ({e}); script runs will be serialized")
+        yield False
+        return
+    patched = [(Runtime, "instance"), (Runtime, "exists"), (ScriptCache, "get_bytecode")]
+    if not all(name in vars(owner) for owner, name in patched):
+        logger.warning("Streamlit runtime internals changed; script runs will be serialized")
+        yield False
+        return
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    originals = [(owner, name, vars(owner)[name]) for owner, name in patched]
+    app_test_option = config.get_option("global.appTest")
+    shared_scripts, get_bytecode = ScriptCache(), ScriptCache.get_bytecode
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    ScriptCache.get_bytecode = lambda self, script_path: get_bytecode(shared_scripts, script_path)
+    # AppTest patches this option per run and restores it afterwards; set it for good so overlapping runs agree
+    config.set_option("global.appTest", True)
+    try:
+        yield True
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+        config.set_option("global.appTest", app_test_option)
+
+
+def new_session(timeout):
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP_FILE, default_timeout=timeout)
+
+
+def by_label(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"no widget labelled {label!r} on the page")
+
+
+def login(at, recorder, role):
+    radio_role, username, password = CREDENTIALS[role]
+    recorder.timed_run(at, f"{role.lower()}:open")
+    by_label(at.radio, "Select Role").set_value(radio_role)
+    at.text_input(key="username_input").input(username)
+    at.text_input(key="password_input").input(password)
+    by_label(at.button, "🔓 Login").click()
+    recorder.timed_run(at, f"{role.lower()}:login")
+    if "logged_in" not in at.session_state or not at.session_state["logged_in"]:
+        raise RuntimeError(f"{role} login did not stick")
+
+
+def evaluator_session(session_no, trainer_ids, rounds, recorder, timeout, seed):
+    """Score one course of LEVEL #1 for each owned trainer and Save it, remembering what should be on disk."""
+    import DemoAssessmentApp as app
+
+    rng = random.Random(seed + session_no)
+    evaluator_role = EVALUATOR_ROLES[session_no % len(EVALUATOR_ROLES)]
+    level = "LEVEL #1"
+    at = new_session(timeout)
+    login(at, recorder, "Evaluator")
+    at.selectbox(key="evaluator_role").set_value(evaluator_role)
+    recorder.timed_run(at, "evaluator:role")
+    for round_no in range(rounds):
+        for trainer_id in trainer_ids:
+            by_label(at.selectbox, "Select Existing Trainer ID").set_value(trainer_id)
+            recorder.timed_run(at, "evaluator:select_trainer")
+            course = rng.randint(1, app.RUBRIC_INDEX["levels"][level]["courses"])
+            course_name = rng.choice(app.COURSE_OPTIONS[1:])
+            at.selectbox(key=f"course_select_{level}_{course}_{trainer_id}").set_value(course_name)
+            scores = {}
+            for param in app.RUBRIC_INDEX["inputs_by_role"][evaluator_role]:
+                scores[f"{param['column']} Course :{course}"] = rng.randint(1, param["max"])
+                at.number_input(key=f"{param['key']}_{level}_{course}_{trainer_id}").set_value(scores[f"{param['column']} Course :{course}"])
+            at.button(key=f"save_{level}_{trainer_id}").click()
+            recorder.timed_run(at, "evaluator:save")
+            scores[f"{level} Course :{course}"] = course_name
+            recorder.expect((trainer_id, CREDENTIALS["Evaluator"][1], evaluator_role, round_no), scores)
+
+
+def viewer_session(session_no, trainer_ids, rounds, recorder, timeout, seed):
+    rng = random.Random(seed + 10_000 + session_no)
+    at = new_session(timeout)
+    login(at, recorder, "Viewer")
+    for _ in range(rounds):
+        trainer_id = rng.choice(trainer_ids)
+        by_label(at.text_input, "Filter by Trainer Name or ID").input(trainer_id)
+        recorder.timed_run(at, "viewer:filter")
+        report_box = by_label(at.selectbox, "Select Trainer for Detailed Report")
+        if trainer_id in report_box.options:
+            report_box.set_value(trainer_id)
+            recorder.timed_run(at, "viewer:report")
+        at.button(key="view_all_trainers").click()
+        recorder.timed_run(at, "viewer:view_all")
+
+
+def admin_session(session_no, trainer_ids, rounds, recorder, timeout, seed):
+    at = new_session(timeout)
+    login(at, recorder, "Admin")
+    for _ in range(rounds):
+        by_label(at.button, "Existing Evaluators").click()
+        recorder.timed_run(at, "admin:existing_evaluators")
+        at.button(key="back_to_main_existing").click()
+        recorder.timed_run(at, "admin:main")
+
+
+def run_session(kind, *args):
+    recorder = args[3]
+    try:
+        kind(*args)
+    except Exception as e:
+        recorder.error(f"{kind.__name__}:aborted", f"{type(e).__name__}: {e}")
+
+
+def check_integrity(recorder, seeded_expected):
+    """Every evaluator Save must still be on disk with the values entered, on exactly one row per assessment key,
+    and every seeded history row must survive."""
+    import DemoAssessmentApp as app
+
+    violations = []
+    for path in [app.DEFAULT_DATA_FILE, app.CSV_FILE]:
+        try:
+            pd.read_csv(path, dtype=str)
+        except Exception as e:
+            violations.append(f"{path} is unreadable (torn write?): {e}")
+    if violations:
+        return violations, 0
+    store = pd.read_csv(app.CSV_FILE, dtype=str)
+    keys = app.assessment_row_keys(store)
+    for key in sorted(keys[keys.duplicated()].unique()):
+        violations.append(f"duplicate assessment row {key}")
+    latest = {}
+    for (trainer_id, username, role, round_no), values in recorder.expected.items():
+        if round_no >= latest.get((trainer_id, username, role), (-1, None))[0]:
+            latest[(trainer_id, username, role)] = (round_no, values)
+    for (trainer_id, username, role), (_, values) in sorted(latest.items()):
+        idx = app.find_assessment_row(store, trainer_id, username, role)
+        if idx is None:
+            violations.append(f"lost write: no row for {trainer_id}/{role}")
+            continue
+        for column, expected in values.items():
+            actual = store.at[idx, column]
+            matches = str(actual) == str(expected) if isinstance(expected, str) else pd.to_numeric(actual, errors="coerce") == expected
+            if not matches:
+                violations.append(f"lost write: {trainer_id}/{role} {column} is {actual!r}, expected {expected!r}")
+    seeded = int(store["Evaluator Username"].eq(SEED_EVALUATOR).sum())
+    if seeded != seeded_expected:
+        violations.append(f"seeded history rows lost: {seeded} of {seeded_expected} remain")
+    return violations, seeded
+
+
+def percentile_table(latencies):
+    rows = []
+    for step, values in sorted(latencies.items()):
+        values = np.asarray(values) * 1000
+        rows.append({"step": step, "runs": len(values), "p50 ms": np.percentile(values, 50), "p95 ms": np.percentile(values, 95),
+                     "p99 ms": np.percentile(values, 99), "max ms": values.max()})
+    return pd.DataFrame(rows).round(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the assessment app.")
+    parser.add_argument("--evaluators", type=int, default=30)
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--trainers", type=int, default=300)
+    parser.add_argument("--trainers-per-evaluator", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=1, help="passes each session makes over its workload")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per script run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workdir", help="scratch directory (default: a new temp dir, removed afterwards)")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="omotec_load_")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    trainer_ids = build_dataset(workdir, args.trainers, args.seed)
+    needed = args.evaluators * args.trainers_per_evaluator
+    if needed > len(trainer_ids):
+        parser.error(f"{args.evaluators} evaluators x {args.trainers_per_evaluator} trainers needs --trainers >= {needed}")
+    logger.info(f"Synthetic dataset with {args.trainers} trainers in {workdir}")
+
+    stack = contextlib.ExitStack()
+    recorder = Recorder(serialize_runs=not stack.enter_context(shared_runtime()))
+    jobs = []
+    for n in range(args.evaluators):
+        # Sessions own disjoint trainers, so any value that does not survive is a lost write, not a legitimate overwrite
+        owned = trainer_ids[n * args.trainers_per_evaluator:(n + 1) * args.trainers_per_evaluator]
+        jobs.append((evaluator_session, n, owned))
+    # Viewers look up trainers that already have assessment history, which is what the report lists
+    jobs += [(viewer_session, n, trainer_ids[:args.trainers // 2]) for n in range(args.viewers)]
+    jobs += [(admin_session, n, trainer_ids) for n in range(args.admins)]
+    random.Random(args.seed).shuffle(jobs)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        for kind, n, trainers in jobs:
+            pool.submit(run_session, kind, n, trainers, args.rounds, recorder, args.timeout, args.seed)
+    wall = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    stack.close()
+
+    violations, seeded = check_integrity(recorder, args.trainers // 2)
+    runs = sum(len(values) for values in recorder.latencies.values())
+    errors = sum(len(values) for values in recorder.errors.values())
+
+    print()
+    print(f"Sessions: {args.evaluators} evaluators, {args.viewers} viewers, {args.admins} admins; {args.rounds} round(s)")
+    print(f"Script runs: {runs} in {wall:.1f}s -> {runs / wall:.2f} runs/s")
+    print(f"Peak RSS: {rss_after / 1024:.0f} MB (was {rss_before / 1024:.0f} MB before sessions)")
+    print(percentile_table(recorder.latencies).to_string(index=False))
+    print(f"Errors: {errors}")
+    for step, messages in sorted(recorder.errors.items()):
+        print(f"  {step}: {len(messages)} x {messages[0][:160]}")
+    print(f"Integrity violations: {len(violations)} (seeded history rows remaining: {seeded} of {args.trainers // 2})")
+    for violation in violations[:20]:
+        print(f"  {violation}")
+
+    if not args.workdir:
+        os.chdir(APP_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if errors or violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())